@@ -0,0 +1,88 @@
+"""
+Cold-start benchmark: measures `import main` and the first warmup in fresh
+interpreters, and prints the slowest imports from `python -X importtime`.
+
+Usage (from backend/):
+    python benchmarks/bench_cold_start.py [--runs 5] [--top 15]
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+PROBE = """
+import time, json
+t = time.perf_counter()
+import main
+imported = time.perf_counter() - t
+t = time.perf_counter()
+main.run_warmup()
+print(json.dumps({"import_s": imported, "warmup_s": time.perf_counter() - t}))
+"""
+
+
+def run_once():
+    env = dict(os.environ, SCANNER_WARMUP="off")
+    proc = subprocess.run([sys.executable, "-c", PROBE], cwd=BACKEND_DIR, env=env,
+                          capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def import_profile() -> str:
+    env = dict(os.environ, SCANNER_WARMUP="off")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"], cwd=BACKEND_DIR,
+                          env=env, capture_output=True, text=True, check=True)
+    return proc.stderr
+
+
+def parse_importtime(stderr: str):
+    """
+    Returns [(cumulative_us, module, depth)] parsed from -X importtime output.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, raw_name = line[len("import time:"):].split("|")
+        depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        rows.append((int(cumulative_us), raw_name.strip(), depth))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    samples = [run_once() for _ in range(args.runs)]
+    import_s = statistics.median(s["import_s"] for s in samples)
+    warmup_s = statistics.median(s["warmup_s"] for s in samples)
+
+    rows = parse_importtime(import_profile())
+    top = sorted((r for r in rows if r[2] <= 1), reverse=True)[:args.top]
+
+    print(f"import main (median of {args.runs}): {import_s * 1000:8.1f} ms")
+    print(f"first warmup (median of {args.runs}): {warmup_s * 1000:8.1f} ms")
+    print(f"cold start total:                  {(import_s + warmup_s) * 1000:8.1f} ms")
+    print(f"\nSlowest imports during `import main` (cumulative):")
+    for cumulative_us, name, _ in top:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    with open(os.path.join(RESULTS_DIR, "cold_start.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "import_s": import_s,
+            "warmup_s": warmup_s,
+            "slowest_imports": [{"module": name, "cumulative_ms": us / 1000} for us, name, _ in top],
+        }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
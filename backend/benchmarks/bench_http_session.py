@@ -0,0 +1,95 @@
+"""
+Compares a fresh HTTP session per request against the pooled provider session,
+using a local keep-alive mock server (no network, no TLS).
+
+Usage (from backend/):
+    python benchmarks/bench_http_session.py [--requests 200]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bist_scanner.http_session import create_session
+
+PAYLOAD = json.dumps({"chart": {"result": [{"close": [1.0] * 60}]}}).encode()
+
+
+class MockYahooHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run(label, url, n, make_session, reuse):
+    session = make_session() if reuse else None
+    start = time.perf_counter()
+    for _ in range(n):
+        s = session if reuse else make_session()
+        s.get(url).content
+        if not reuse:
+            s.close()
+    elapsed = time.perf_counter() - start
+    if session is not None:
+        session.close()
+    per_request_ms = elapsed / n * 1000
+    print(f"{label:<40} {per_request_ms:8.3f} ms/request")
+    return per_request_ms
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockYahooHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v8/finance/chart/THYAO.IS"
+
+    import requests
+    results = {
+        "requests_new_session": run("requests: new session per request", url, args.requests, requests.Session, reuse=False),
+        "requests_pooled": run("requests: pooled session", url, args.requests, lambda: _requests_pooled(), reuse=True),
+    }
+    try:
+        import curl_cffi  # noqa: F401
+        results["curl_new_session"] = run("curl_cffi: new session per request", url, args.requests, create_session, reuse=False)
+        results["curl_pooled"] = run("curl_cffi: pooled session", url, args.requests, create_session, reuse=True)
+    except ImportError:
+        print("curl_cffi not installed, skipping")
+
+    server.shutdown()
+
+    print()
+    for backend in ("requests", "curl"):
+        if f"{backend}_pooled" in results:
+            saved = results[f"{backend}_new_session"] - results[f"{backend}_pooled"]
+            print(f"{backend}: {saved:.3f} ms saved per request with the pooled session")
+
+
+def _requests_pooled():
+    # Same adapter setup create_session uses when curl_cffi is missing
+    import requests
+    from requests.adapters import HTTPAdapter
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+    session.mount("http://", adapter)
+    return session
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Response benchmark: serialization time and payload size of a /scan result with
+FastAPI's default JSON encoding versus responses.py (orjson, gzip/brotli, ETag
+body cache and 304), plus the history file format.
+
+Usage (from backend/):
+    python benchmarks/bench_responses.py [--symbols 500] [--repeat 5]
+"""
+import os
+import sys
+import json
+import gzip
+import timeit
+import argparse
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette.requests import Request
+
+from synthetic import SyntheticProvider
+from bist_scanner import StockScanner, config
+from bist_scanner.responses import BodyCache, brotli, conditional_json, dumps, etag, orjson
+
+
+def scan_results(n_symbols: int) -> list:
+    """A swing result list with one row per symbol (scan rows recycled under new codes)."""
+    scanner = StockScanner(track_memory=False)
+    scanner.provider = SyntheticProvider(min(n_symbols, 100))
+    scanner.panel = None
+    rows = scanner.filter_stocks()
+    return [dict(rows[i % len(rows)], code=f"SYN{i:03d}") for i in range(n_symbols)]
+
+
+def request(headers: dict) -> Request:
+    raw = [(k.lower().encode(), v.encode()) for k, v in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/scan", "query_string": b"", "headers": raw})
+
+
+def measure(fn, repeat: int) -> float:
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = scan_results(args.symbols)
+    tag = etag("swing", 1, 0.0, [])
+    gzip_request = request({"Accept-Encoding": "gzip, br"})
+    cache = BodyCache()
+    conditional_json(gzip_request, tag, build=lambda: results, cache=cache)
+
+    default_body = JSONResponse(jsonable_encoder(results)).body
+    fast_body = dumps(results)
+    cases = {
+        "fastapi default (jsonable_encoder + json)": (
+            lambda: JSONResponse(jsonable_encoder(results)).body, default_body),
+        f"dumps ({'orjson' if orjson else 'json'})": (lambda: dumps(results), fast_body),
+        "dumps + gzip": (lambda: gzip.compress(dumps(results), config.GZIP_LEVEL), gzip.compress(fast_body, config.GZIP_LEVEL)),
+        "ETag body cache hit (gzip)": (
+            lambda: conditional_json(gzip_request, tag, build=lambda: results, cache=cache).body,
+            conditional_json(gzip_request, tag, build=lambda: results, cache=cache).body),
+        "If-None-Match -> 304": (
+            lambda: conditional_json(request({"If-None-Match": tag}), tag, build=lambda: results, cache=cache).body,
+            b""),
+        "history file, json indent=4 (before)": (
+            lambda: json.dumps(results, indent=4, ensure_ascii=False).encode("utf-8"),
+            json.dumps(results, indent=4, ensure_ascii=False).encode("utf-8")),
+        "history file, compact dumps (after)": (lambda: dumps(results), fast_body),
+    }
+    if brotli is not None:
+        cases["dumps + brotli"] = (lambda: brotli.compress(dumps(results), quality=config.BROTLI_LEVEL),
+                                   brotli.compress(fast_body, quality=config.BROTLI_LEVEL))
+
+    print(f"{args.symbols} results\n")
+    print(f"{'case':<45} {'time':>10} {'bytes':>10}")
+    report = {}
+    for name, (fn, body) in cases.items():
+        ms = measure(fn, args.repeat)
+        report[name] = {"ms": round(ms, 4), "bytes": len(body)}
+        print(f"{name:<45} {ms:8.3f}ms {len(body):10d}")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    with open(os.path.join(RESULTS_DIR, "responses.json"), "w") as f:
+        json.dump({"symbols": args.symbols, "results": report}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
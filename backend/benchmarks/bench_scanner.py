@@ -0,0 +1,295 @@
+"""
+Benchmark suite for the scanner hot paths, run over SyntheticProvider (no network).
+
+Usage (from backend/):
+    python benchmarks/bench_scanner.py                   # run and compare with baseline.json
+    python benchmarks/bench_scanner.py --save-baseline   # record a new baseline
+    python benchmarks/bench_scanner.py --sizes 30,100 --filter filter_stocks
+
+Results go to benchmarks/results/latest.json. The run exits with status 1 when
+any case's median is slower than the baseline by more than --threshold.
+"""
+import os
+import sys
+import json
+import timeit
+import argparse
+import platform
+import tempfile
+import statistics
+from datetime import datetime
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from synthetic import SyntheticProvider
+from bist_scanner import StockScanner, config
+from bist_scanner.ohlcv_cache import OHLCVCache
+
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_SIZES = [30, 100, 500]
+
+# name -> setup(size) returning the zero-argument callable to time
+BENCHMARKS = {}
+
+
+def benchmark(name, sized=False):
+    def register(setup):
+        BENCHMARKS[name] = (setup, sized)
+        return setup
+    return register
+
+
+def make_scanner(n_symbols: int = 30, ohlcv_cache: bool = False) -> StockScanner:
+    # Without the OHLCV cache every timed scan runs the full fetch and indicator
+    # pipeline, not just the first (warm-up) one; filter_stocks_cached measures it
+    scanner = StockScanner()
+    scanner.provider = SyntheticProvider(n_symbols)
+    scanner.panel = None
+    scanner.ohlcv_cache = OHLCVCache(config.SWING_PERIOD, config.OHLCV_TAIL_PERIOD) if ohlcv_cache else None
+    return scanner
+
+
+def swing_features(scanner: StockScanner):
+    df = scanner.apply_indicators(scanner.provider.fetch_daily_ohlcv("SYN000.IS"))
+    last, prev = scanner.extract_features(df)
+    return last, prev
+
+
+@benchmark("apply_indicators")
+def bench_apply_indicators(size=None):
+    scanner = make_scanner()
+    df = scanner.provider.fetch_daily_ohlcv("SYN000.IS")
+    return lambda: scanner.apply_indicators(df.copy())
+
+
+@benchmark("wilder_indicators", sized=True)
+def bench_wilder_indicators(size):
+    from bist_scanner import kernels
+
+    scanner = make_scanner(size)
+    frames = [scanner.provider.fetch_daily_ohlcv(symbol) for symbol in scanner.provider.get_all_bist_tickers()]
+    high, low, close = (np.column_stack([df[col].to_numpy() for df in frames]) for col in ("High", "Low", "Close"))
+    return lambda: kernels.wilder_indicators(high, low, close)
+
+
+@benchmark("rank_universe", sized=True)
+def bench_rank_universe(size):
+    from bist_scanner.ranking import PriceHistory, rank_universe
+
+    scanner = make_scanner(size)
+    history = PriceHistory()
+    for symbol in scanner.provider.get_all_bist_tickers():
+        df = scanner.provider.fetch_daily_ohlcv(symbol, period="2y")
+        history.add(symbol, df["Close"].to_numpy(), df["Volume"].to_numpy())
+    return lambda: rank_universe(history)
+
+
+@benchmark("size_positions", sized=True)
+def bench_size_positions(size):
+    from bist_scanner.sizing import size_positions
+
+    rng = np.random.default_rng(0)
+    price = rng.uniform(5, 500, size)
+    stocks = [{"code": f"SYN{i:03d}", "price": round(float(p), 2), "priority_score": size - i} for i, p in enumerate(price)]
+    atr = price * rng.uniform(0.01, 0.05, size)
+    return lambda: size_positions(stocks, atr, equity=1_000_000, risk_per_trade=0.01, max_heat=0.06)
+
+
+@benchmark("validate_frames", sized=True)
+def bench_validate_frames(size):
+    from bist_scanner.quality import validate_frames
+
+    scanner = make_scanner(size)
+    frames = {symbol: scanner.provider.fetch_daily_ohlcv(symbol, period="1y")
+              for symbol in scanner.provider.get_all_bist_tickers()}
+    return lambda: validate_frames(frames)
+
+
+@benchmark("evaluate_universe", sized=True)
+def bench_evaluate_universe(size):
+    scanner = make_scanner(size)
+    candidates = {}
+    for symbol in scanner.provider.get_all_bist_tickers():
+        last, prev = scanner.extract_features(scanner.apply_indicators(scanner.provider.fetch_daily_ohlcv(symbol)))
+        candidates[symbol] = (last, prev)
+    return lambda: scanner.evaluate_universe(candidates)
+
+
+@benchmark("check_momentum_breakout")
+def bench_check_momentum_breakout(size=None):
+    scanner = make_scanner()
+    last, prev = swing_features(scanner)
+    return lambda: scanner.check_momentum_breakout(last, prev)
+
+
+@benchmark("check_trend_continuation")
+def bench_check_trend_continuation(size=None):
+    scanner = make_scanner()
+    last, prev = swing_features(scanner)
+    return lambda: scanner.check_trend_continuation(last, prev)
+
+
+@benchmark("check_momentum_volatility")
+def bench_check_momentum_volatility(size=None):
+    scanner = make_scanner()
+    last, _ = swing_features(scanner)
+    return lambda: scanner.check_momentum_volatility(last)
+
+
+@benchmark("check_long_term_momentum")
+def bench_check_long_term_momentum(size=None):
+    import pandas as pd
+    import pandas_ta as ta
+
+    scanner = make_scanner()
+    df = scanner.provider.fetch_daily_ohlcv("SYN000.IS", period="2y")
+    df['EMA_200'] = ta.ema(df['Close'], length=200)
+    df = pd.concat([df, ta.macd(df['Close'], fast=12, slow=26, signal=9)], axis=1)
+    last = df.iloc[-1]
+    return lambda: scanner.check_long_term_momentum(last, df)
+
+
+@benchmark("check_fundamental_strength")
+def bench_check_fundamental_strength(size=None):
+    scanner = make_scanner()
+    fundamentals = scanner.provider.fetch_fundamentals("SYN000.IS")
+    return lambda: scanner.check_fundamental_strength(fundamentals)
+
+
+@benchmark("analyze_stock_result")
+def bench_analyze_stock_result(size=None):
+    scanner = make_scanner()
+    stock = {"code": "SYN000", "price": 101.5, "volumeChange": 25.0, "rsi": 61.2, "score": 18,
+             "strategies": ["Momentum Breakout", "Trend Continuation"]}
+    return lambda: scanner.analyze_stock_result(dict(stock))
+
+
+@benchmark("filter_stocks", sized=True)
+def bench_filter_stocks(size):
+    scanner = make_scanner(size)
+    return scanner.filter_stocks
+
+
+@benchmark("filter_stocks_cached", sized=True)
+def bench_filter_stocks_cached(size):
+    # Repeat scans after the warm-up: tail fetches, unchanged symbols keep their features
+    scanner = make_scanner(size, ohlcv_cache=True)
+    return scanner.filter_stocks
+
+
+@benchmark("scan_long_term", sized=True)
+def bench_scan_long_term(size):
+    scanner = make_scanner(size)
+    return scanner.scan_long_term
+
+
+@benchmark("save_scan_result", sized=True)
+def bench_save_scan_result(size):
+    from bist_scanner.history import save_scan_result
+
+    config.HISTORY_DIR = tempfile.mkdtemp(prefix="bench_history_")
+    stock = {"code": "SYN000", "price": 101.5, "volumeChange": 25.0, "rsi": 61.2, "score": 18,
+             "strategies": ["Momentum Breakout"], "estimated_holding_period_days": 2,
+             "risk_level": "Low", "reason": "Momentum Breakout + strong volume + healthy RSI",
+             "priority_score": 68}
+    data = [dict(stock, code=f"SYN{i:03d}") for i in range(size)]
+    return lambda: save_scan_result(data, "swing_all")
+
+
+def time_case(fn, repeat: int) -> dict:
+    fn()  # warm-up (imports, caches)
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    samples = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.mean(samples),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def run(sizes, name_filter=None, repeat=3) -> dict:
+    results = {}
+    for name, (setup, sized) in BENCHMARKS.items():
+        if name_filter and name_filter not in name:
+            continue
+        for size in (sizes if sized else [None]):
+            case = f"{name}[{size}]" if sized else name
+            results[case] = time_case(setup(size), repeat)
+            print(f"{case:<35} median {results[case]['median'] * 1000:10.3f} ms")
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Prints the ratio to baseline per case and returns the regressed case names.
+    """
+    regressions = []
+    print(f"\n{'case':<35} {'baseline':>12} {'current':>12} {'ratio':>7}")
+    for case, current in results.items():
+        base = baseline.get(case)
+        if base is None:
+            print(f"{case:<35} {'-':>12} {current['median'] * 1000:10.3f}ms {'new':>7}")
+            continue
+        ratio = current["median"] / base["median"]
+        flag = "  REGRESSION" if ratio > 1 + threshold else ""
+        print(f"{case:<35} {base['median'] * 1000:10.3f}ms {current['median'] * 1000:10.3f}ms {ratio:6.2f}x{flag}")
+        if flag:
+            regressions.append(case)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scanner benchmark suite")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="universe sizes for scan benchmarks")
+    parser.add_argument("--filter", default=None, help="only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=0.20, help="allowed slowdown vs baseline (0.20 = 20%%)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    results = run(sizes, args.filter, args.repeat)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    with open(os.path.join(RESULTS_DIR, "latest.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("\nNo baseline found; run with --save-baseline to create one.")
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} case(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
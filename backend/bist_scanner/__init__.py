@@ -0,0 +1,9 @@
+"""
+BIST stock scanner: scanning engine, caches and the API shared by all deployment targets.
+"""
+from .scanner import StockScanner
+from .data_provider import DataProvider
+
+__version__ = "0.1.0"
+
+__all__ = ["StockScanner", "DataProvider", "__version__"]
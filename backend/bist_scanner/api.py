@@ -0,0 +1,463 @@
+import time
+_IMPORT_STARTED = time.perf_counter()
+
+import hmac
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import Optional
+from datetime import datetime
+from fastapi import FastAPI, HTTPException, Header, Request, Response
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse
+from pydantic import BaseModel
+from . import config
+from .history import history_entry, history_page, read_history_bytes
+from .responses import (BodyCache, FastJSONResponse, MIN_COMPRESS_SIZE, conditional_json, content_etag,
+                        dumps, etag)
+from .diversify import select_diversified
+from .sizing import size_positions
+from .service import ScanService
+from .jobs import FINISHED, JobPending, QueueFull
+from .strategies import get_registry
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warmup on startup: "background" (default), "blocking" (serve only once warm) or "off"
+    if config.WARMUP_MODE == "blocking":
+        run_warmup(scan=config.WARMUP_SCAN)
+    elif config.WARMUP_MODE == "background":
+        threading.Thread(target=run_warmup, kwargs={"scan": config.WARMUP_SCAN}, daemon=True).start()
+    # Scheduled swing rescans (SCANNER_SCAN_INTERVAL) keep the cache warm and push webhooks
+    service.start_scheduler()
+    yield
+    service.stop_scheduler()
+    service.webhooks.close()
+    service.history.flush()
+
+app = FastAPI(title="BIST Stock Scanner API", lifespan=lifespan, default_response_class=FastJSONResponse)
+
+# Allow CORS for frontend
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],  # In production, specify the frontend domain
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["ETag", "X-Profile-Id", "X-Snapshot-Created", "X-Total-Count", "Location", "Retry-After"],
+)
+# Scan and history responses compress themselves (see responses.py); this covers the rest
+app.add_middleware(GZipMiddleware, minimum_size=MIN_COMPRESS_SIZE)
+
+@app.exception_handler(QueueFull)
+def queue_full(request: Request, e: QueueFull):
+    """Every endpoint that starts a scan answers 429 when the job queue is full."""
+    return FastJSONResponse({"detail": str(e)}, status_code=429, headers={"Retry-After": str(e.retry_after)})
+
+@app.exception_handler(JobPending)
+def job_pending(request: Request, e: JobPending):
+    """202 with a scan job still running after SCANNER_JOB_WAIT seconds; the client polls its Location."""
+    return FastJSONResponse(e.job.to_dict(results=False), status_code=202, headers={"Location": f"/scans/{e.job.id}"})
+
+# Scanner, scan cache, snapshot store and profiler (see service.py)
+service = ScanService()
+profiler = service.profiler
+# Encoded /scan bodies per ETag (scan version + query)
+scan_bodies = BodyCache()
+
+def profile_requested(profile: bool, x_profile: Optional[str], token: Optional[str]) -> bool:
+    """Returns True if the caller asked for a profile; rejects callers without the admin token."""
+    requested = profile or (x_profile or "").lower() in ("1", "true", "yes")
+    if requested and not profiler.authorized(token):
+        raise HTTPException(status_code=403, detail="Profiling requires a valid X-Profile-Token")
+    return requested
+
+def run_warmup(scan: bool = False) -> dict:
+    """Preloads imports, indicator kernels, the panel and optionally the scan cache."""
+    report = service.warmup(scan=scan)
+    report["main_import_s"] = _IMPORT_SECONDS
+    return report
+
+@app.get("/")
+def read_root():
+    return {"message": "BIST Stock Scanner API is running"}
+
+@app.get("/warmup")
+def warmup_endpoint(scan: bool = False):
+    """
+    Runs the warmup now and returns its timings (imports, indicators, panel, scan).
+    """
+    return run_warmup(scan=scan)
+
+@app.get("/scan")
+def scan_market(request: Request, strategy: str = "all", risk: Optional[str] = None,
+                holding: Optional[int] = None, limit: Optional[int] = None, refresh: bool = False,
+                diversify: bool = False, max_correlation: Optional[float] = None,
+                equity: Optional[float] = None, risk_per_trade: float = 0.01, atr_multiple: float = 2.0,
+                max_heat: Optional[float] = None, profile: bool = False, x_profile: Optional[str] = Header(None),
+                x_profile_token: Optional[str] = Header(None)):
+    """
+    Scans the market and returns stocks based on the selected strategy.
+    Strategies: 'momentum_breakout', 'trend_continuation', 'momentum_volatility', 'all',
+    or the key of a strategy registered through /strategies.
+    Optional filters: risk ('Low', 'Medium', 'High'), holding (days), limit.
+    Filters are answered from the cached scan index; refresh=true forces a rescan.
+    diversify=true drops stocks whose daily-return correlation with a higher-ranked
+    pick exceeds max_correlation (default SCANNER_MAX_CORRELATION), then applies limit;
+    not available in snapshot mode (400).
+    equity adds ATR position sizing: a stop atr_multiple x ATR_14 below the price, shares
+    risking risk_per_trade of equity, and cumulative portfolio heat capped at max_heat
+    (all fractions of equity).
+    profile=true (or an X-Profile header) with X-Profile-Token profiles a fresh scan;
+    the profile id is returned in the X-Profile-Id header.
+    Scans (once the cache expires, or with refresh or profile) run as a job (see POST
+    /scans): 429 when the queue is full, 202 with the job if it takes longer than
+    SCANNER_JOB_WAIT seconds.
+    The ETag changes with the scan version; If-None-Match with it answers 304.
+    """
+    requested = profile_requested(profile, x_profile, x_profile_token)
+    strategy_keys = get_registry().keys
+    if strategy != "all" and strategy not in strategy_keys:
+        raise HTTPException(status_code=400, detail=f"Unknown strategy '{strategy}'. Valid: all, {', '.join(strategy_keys)}")
+    if equity is not None and (equity <= 0 or not 0 < risk_per_trade <= 1 or atr_multiple <= 0
+                               or (max_heat is not None and max_heat <= 0)):
+        raise HTTPException(status_code=400, detail="equity, risk_per_trade (0-1], atr_multiple and max_heat must be positive")
+    if diversify and service.snapshot is not None:
+        raise HTTPException(status_code=400, detail="diversify is not available in snapshot mode: "
+                                                    "snapshots carry no return history for the correlation filter")
+
+    def query():
+        if diversify:
+            results = select_diversified(
+                index.query(strategy=strategy, risk=risk, holding=holding), service.scanner.return_correlation(),
+                max_correlation=config.MAX_CORRELATION if max_correlation is None else max_correlation, limit=limit,
+            )
+        else:
+            results = index.query(strategy=strategy, risk=risk, holding=holding, limit=limit)
+        if equity is not None:
+            features = service.features()
+            atr = [features.get(stock["code"], {}).get("ATR_14") for stock in results]
+            results = size_positions(results, atr, equity, risk_per_trade=risk_per_trade,
+                                     atr_multiple=atr_multiple, max_heat=max_heat)
+        return results
+
+    try:
+        index, job = service.index("swing", refresh=refresh, profile=requested, timeout=config.JOB_WAIT)
+        fresh, profile_id = job is not None, job and job.profile_id
+        headers = {}
+        if profile_id:
+            headers["X-Profile-Id"] = profile_id
+        if service.snapshot is not None:
+            headers["X-Snapshot-Created"] = service.snapshot.meta["created"]
+        # Same scan version and query -> same body; refresh/profile only decide whether to rescan
+        params = sorted((k, v) for k, v in request.query_params.multi_items() if k not in ("refresh", "profile"))
+        tag = etag("swing", service.diffs.version("swing"), index.created, params)
+        final_results = query() if fresh else None
+        response = conditional_json(request, tag, build=(lambda: final_results) if fresh else query,
+                                    last_modified=index.created, cache=scan_bodies, headers=headers)
+    except (QueueFull, JobPending):
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    # A fresh scan's whole index was saved to history by its job, not this request's view of it
+    return response
+
+@app.get("/scan/long-term")
+def scan_long_term_market(request: Request, profile: bool = False, x_profile: Optional[str] = Header(None),
+                          x_profile_token: Optional[str] = Header(None)):
+    """
+    Scans for 3-month to 2-year investment opportunities with fundamental analysis.
+    The scan runs as a job (see POST /scans), so it waits for a free worker and
+    answers 429 when the queue is full, or 202 with the job (poll its Location) if it
+    takes longer than SCANNER_JOB_WAIT seconds.
+    The ETag is a hash of the results; If-None-Match with it answers 304.
+    """
+    requested = profile_requested(profile, x_profile, x_profile_token)
+    headers = {}
+    try:
+        # Saved to history by the job
+        results, profile_id = service.long_term(profile=requested, timeout=config.JOB_WAIT)
+    except (QueueFull, JobPending):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if service.snapshot is not None:
+        headers["X-Snapshot-Created"] = service.snapshot.meta["created"]
+    if profile_id:
+        headers["X-Profile-Id"] = profile_id
+    body = dumps(results)
+    return conditional_json(request, content_etag(body), body=body, headers=headers)
+
+@app.get("/scan/top")
+def scan_top_market(limit: int = 5):
+    """
+    Returns the top N stocks ranked by score.
+    """
+    try:
+        index, _ = service.index("swing", timeout=config.JOB_WAIT)
+        return index.query(limit=limit)
+    except (QueueFull, JobPending):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/scan/snapshot")
+def scan_snapshot_info():
+    """
+    Returns creation time and result counts of the served snapshot (snapshot mode only).
+    """
+    if service.snapshot is None:
+        raise HTTPException(status_code=404, detail="Snapshot mode is not enabled")
+    try:
+        service.snapshot.index("swing")
+        return service.snapshot.meta
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/scan/stats")
+def scan_stats():
+    """
+    Returns duration and peak memory of the most recent scan.
+    """
+    return service.scanner.last_scan_stats
+
+@app.get("/scan/quality")
+def scan_quality():
+    """
+    Returns the data-quality report of the most recent swing scan: repaired and
+    flagged symbol counts per issue and the issues found for each symbol.
+    """
+    return service.scanner.last_quality
+
+@app.get("/scan/diff")
+def scan_diff(type: str = "swing", since: Optional[int] = None):
+    """
+    Returns what changed between scan versions: new entries (full rows), dropped
+    codes and entries whose strategies or score changed. Pass the `version` of
+    the last response as `since`; without it the diff is against the previous scan.
+    """
+    if type not in ("swing", "longterm"):
+        raise HTTPException(status_code=400, detail="type must be 'swing' or 'longterm'")
+    if type == "swing":
+        # Serves (and rescans, once expired) the same cached index as /scan
+        service.index("swing", timeout=config.JOB_WAIT)
+    try:
+        return service.diffs.diff(type, since)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"No {type} scan has run yet")
+
+def submit_scan_job(scan_type: str, profile: bool = False):
+    """Queues a scan job; a full queue answers 429 with Retry-After (see queue_full)."""
+    try:
+        return service.jobs.submit(scan_type, profile=profile)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+class ScanJobRequest(BaseModel):
+    type: str = "swing"
+
+@app.post("/scans", status_code=202)
+def create_scan_job(definition: ScanJobRequest, response: Response, profile: bool = False,
+                    x_profile: Optional[str] = Header(None), x_profile_token: Optional[str] = Header(None)):
+    """
+    Queues a swing or long-term scan ({"type": "swing" | "longterm"}) and returns the
+    job at once; poll GET /scans/{id}. A type that is already queued returns that job.
+    Answers 429 with Retry-After when SCANNER_JOB_QUEUE_SIZE jobs are waiting.
+    """
+    requested = profile_requested(profile, x_profile, x_profile_token)
+    job = submit_scan_job(definition.type, requested)
+    response.headers["Location"] = f"/scans/{job.id}"
+    return job.to_dict(results=False)
+
+@app.get("/scans")
+def list_scan_jobs():
+    """Lists queued, running and recently finished scan jobs (without results)."""
+    return [job.to_dict(results=False) for job in service.jobs.list()]
+
+@app.get("/scans/{job_id}")
+def get_scan_job(job_id: str, limit: Optional[int] = None):
+    """
+    Returns a job's status, progress (phase, symbols done/total) and results. While
+    it runs, `results` holds provisional matches (`partial: true`, before relative strength).
+    """
+    job = service.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Scan job not found")
+    return job.to_dict(limit=limit)
+
+@app.delete("/scans/{job_id}")
+def cancel_scan_job(job_id: str):
+    """
+    Cancels a job: a queued one at once, a running one at its next symbol
+    (status `cancelling`, then `cancelled`). Finished jobs answer 409.
+    """
+    job = service.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Scan job not found")
+    if job.status in FINISHED:
+        raise HTTPException(status_code=409, detail=f"Scan job already {job.status}")
+    return service.jobs.cancel(job_id).to_dict(results=False)
+
+@app.get("/profiles")
+def list_profiles(token: Optional[str] = None, x_profile_token: Optional[str] = Header(None)):
+    """
+    Lists kept profiles: the slowest N scans and the most recent requested ones.
+    """
+    if not profiler.authorized(x_profile_token or token):
+        raise HTTPException(status_code=403, detail="Invalid profile token")
+    return profiler.list()
+
+@app.get("/profiles/{profile_id}")
+def get_profile(profile_id: str, token: Optional[str] = None, x_profile_token: Optional[str] = Header(None)):
+    """
+    Returns a stored profile (pyinstrument HTML, speedscope JSON or cProfile text).
+    """
+    if not profiler.authorized(x_profile_token or token):
+        raise HTTPException(status_code=403, detail="Invalid profile token")
+    record = profiler.get(profile_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    media_types = {"html": "text/html", "speedscope": "application/json", "pstats": "text/plain"}
+    return FileResponse(record["path"], media_type=media_types[record["format"]])
+
+class StrategyDefinition(BaseModel):
+    key: str
+    name: str
+    expression: str
+    score: float = 5
+
+def token_matches(expected: Optional[str], token: Optional[str]) -> bool:
+    """Endpoints guarded by a token are disabled while it is not configured."""
+    return bool(expected) and token is not None and hmac.compare_digest(expected, token)
+
+def strategy_authorized(token: Optional[str]):
+    if not config.STRATEGY_TOKEN:
+        raise HTTPException(status_code=403, detail="Changing strategies is disabled; set SCANNER_STRATEGY_TOKEN")
+    if not token_matches(config.STRATEGY_TOKEN, token):
+        raise HTTPException(status_code=403, detail="Changing strategies requires a valid X-Strategy-Token")
+
+@app.get("/strategies")
+def list_strategies():
+    """
+    Lists the built-in and registered strategies with their expressions and scores.
+    """
+    return [strategy.to_dict() for strategy in get_registry()]
+
+@app.post("/strategies")
+def register_strategy(definition: StrategyDefinition, x_strategy_token: Optional[str] = Header(None)):
+    """
+    Registers (or replaces) a user strategy, e.g.
+    {"key": "oversold_bounce", "name": "Oversold Bounce", "expression": "RSI_14 < 30 and Close > prev.High", "score": 6}.
+    The expression is compiled on registration; the next /scan rescans with it.
+    """
+    strategy_authorized(x_strategy_token)
+    try:
+        strategy = get_registry().register(definition.key, definition.name, definition.expression, definition.score)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    service.cache.invalidate("swing")
+    return strategy.to_dict()
+
+@app.delete("/strategies/{key}")
+def delete_strategy(key: str, x_strategy_token: Optional[str] = Header(None)):
+    """Removes a user strategy; built-in strategies cannot be removed."""
+    strategy_authorized(x_strategy_token)
+    try:
+        removed = get_registry().remove(key)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not removed:
+        raise HTTPException(status_code=404, detail="Strategy not found")
+    service.cache.invalidate("swing")
+    return {"deleted": key}
+
+class WebhookDefinition(BaseModel):
+    url: str
+    strategy: Optional[str] = None
+    risk: Optional[str] = None
+    min_score: Optional[float] = None
+    secret: Optional[str] = None
+
+def webhook_authorized(token: Optional[str]):
+    if not config.WEBHOOK_TOKEN:
+        raise HTTPException(status_code=403, detail="Webhooks are disabled; set SCANNER_WEBHOOK_TOKEN")
+    if not token_matches(config.WEBHOOK_TOKEN, token):
+        raise HTTPException(status_code=403, detail="Webhooks require a valid X-Webhook-Token")
+
+@app.get("/webhooks")
+def list_webhooks(x_webhook_token: Optional[str] = Header(None)):
+    """
+    Lists webhook subscriptions and delivery counters.
+    """
+    webhook_authorized(x_webhook_token)
+    return {"subscriptions": [s.to_dict() for s in service.webhooks.registry], "stats": service.webhooks.stats}
+
+@app.post("/webhooks")
+def register_webhook(definition: WebhookDefinition, x_webhook_token: Optional[str] = Header(None)):
+    """
+    Subscribes a URL to new and changed swing signals, e.g.
+    {"url": "https://bot.example/hook", "strategy": "momentum_breakout", "risk": "Low", "min_score": 8}.
+    With a secret, each POST carries X-Scanner-Signature: sha256=<HMAC of the body>.
+    URLs whose host resolves to a loopback, private or link-local address are refused.
+    """
+    webhook_authorized(x_webhook_token)
+    try:
+        subscription = service.webhooks.registry.register(definition.url, definition.strategy, definition.risk,
+                                                          definition.min_score, definition.secret)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return subscription.to_dict()
+
+@app.delete("/webhooks/{subscription_id}")
+def delete_webhook(subscription_id: str, x_webhook_token: Optional[str] = Header(None)):
+    """Removes a webhook subscription."""
+    webhook_authorized(x_webhook_token)
+    if not service.webhooks.registry.remove(subscription_id):
+        raise HTTPException(status_code=404, detail="Webhook not found")
+    return {"deleted": subscription_id}
+
+@app.get("/history")
+def get_history_list(response: Response, limit: Optional[int] = None, offset: int = 0, type: Optional[str] = None):
+    """
+    Returns one page of saved history files, newest first (default SCANNER_HISTORY_PAGE_SIZE),
+    optionally of one scan type. The total count is sent in X-Total-Count.
+    """
+    if (limit is not None and limit < 0) or offset < 0:
+        raise HTTPException(status_code=400, detail="limit and offset must not be negative")
+    try:
+        items, total = history_page(config.HISTORY_PAGE_SIZE if limit is None else limit, offset, type)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    response.headers["X-Total-Count"] = str(total)
+    return items
+
+@app.get("/history/retention")
+def history_retention(keep_days: Optional[float] = None, daily_days: Optional[float] = None):
+    """
+    Dry run of the history retention policy: scans that would be deleted or archived
+    and the bytes that would be reclaimed. Nothing is changed; it waits for a running
+    retention pass to finish.
+    """
+    from .retention import apply_retention
+    return apply_retention(dry_run=True, keep_days=keep_days, daily_days=daily_days)
+
+@app.get("/history/{filename}")
+def get_history_item(request: Request, filename: str):
+    """
+    Returns the content of a specific history file (also from the archives), as
+    stored. History files never change, so repeated reads are answered with 304.
+    """
+    entry = history_entry(filename)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="History file not found")
+    created = datetime.fromisoformat(entry["timestamp"]).timestamp()
+    return conditional_json(request, etag(entry["filename"], entry["size"]), body=lambda: read_history_bytes(entry),
+                            last_modified=created, body_encoding="gzip" if entry["filename"].endswith(".gz") else None)
+
+
+_IMPORT_SECONDS = round(time.perf_counter() - _IMPORT_STARTED, 3)
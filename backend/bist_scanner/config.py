@@ -0,0 +1,110 @@
+"""
+Central configuration for every deployment target, read from the environment.
+
+Entry points set SCANNER_HOME to their own directory (backend/ for uvicorn and
+Vercel) before importing the package; history, panel, snapshot and profile
+files live below it. Modules read these values at call time (config.X), so
+they can be overridden after import.
+"""
+import os
+
+
+def _bool(name: str, default: bool) -> bool:
+    return os.environ.get(name, str(default)).lower() in ("1", "true", "yes")
+
+
+def _path(value: str) -> str:
+    # Relative paths are resolved against SCANNER_HOME
+    return value if os.path.isabs(value) else os.path.join(HOME, value)
+
+
+HOME = os.path.abspath(os.environ.get("SCANNER_HOME", os.getcwd()))
+
+# --- Data provider / HTTP ---
+YF_POOL_SIZE = int(os.environ.get("YF_POOL_SIZE", "10"))
+# Unset keeps curl_cffi's own choice (HTTP/2 with the Chrome impersonation); true/false force 2 or 1.1
+YF_HTTP2 = _bool("YF_HTTP2", False) if "YF_HTTP2" in os.environ else None
+
+# --- Scanner ---
+COMPACT = _bool("SCANNER_COMPACT", False)
+# tracemalloc peak per scan (peak_memory_mb in /scan/stats); slows scans about 3x
+TRACK_MEMORY = _bool("SCANNER_TRACK_MEMORY", False)
+PANEL_PATH = _path(os.environ.get("SCANNER_PANEL_PATH", os.path.join("panel", "swing_panel.bin")))
+PANEL_ENABLED = "SCANNER_PANEL_PATH" in os.environ
+PANEL_MAX_AGE = float(os.environ.get("SCANNER_PANEL_MAX_AGE", "86400"))
+NUMBA = _bool("SCANNER_NUMBA", True)
+# Daily history fetched per symbol by the swing scan; weekly/monthly features are derived from it.
+# Longer periods (e.g. 1y) fill more W_/M_ columns at the cost of a larger download per symbol
+SWING_PERIOD = os.environ.get("SCANNER_SWING_PERIOD", "3mo")
+# Keep each symbol's OHLCV between swing scans and refresh it with a short tail fetch
+OHLCV_CACHE = _bool("SCANNER_OHLCV_CACHE", True)
+OHLCV_TAIL_PERIOD = os.environ.get("SCANNER_OHLCV_TAIL_PERIOD", "5d")
+# Data-quality validation of fetched bars, and extra market closures (comma-separated YYYY-MM-DD)
+VALIDATE = _bool("SCANNER_VALIDATE", True)
+EXTRA_HOLIDAYS = [d.strip() for d in os.environ.get("SCANNER_HOLIDAYS", "").split(",") if d.strip()]
+# Priority points per percentile of relative strength above/below the universe median
+RS_WEIGHT = float(os.environ.get("SCANNER_RS_WEIGHT", "0.4"))
+# Diversified /scan results: return-correlation window (days) and default cap
+CORRELATION_WINDOW = int(os.environ.get("SCANNER_CORRELATION_WINDOW", "60"))
+MAX_CORRELATION = float(os.environ.get("SCANNER_MAX_CORRELATION", "0.7"))
+# Long-term scan: require beating XU100 / the sector index before fetching fundamentals
+RELATIVE_FILTER = _bool("SCANNER_RELATIVE_FILTER", True)
+MIN_EXCESS_RETURN = float(os.environ.get("SCANNER_MIN_EXCESS_RETURN", "0"))
+# User-defined strategies registered through /strategies (JSON, or YAML with PyYAML)
+STRATEGIES_PATH = _path(os.environ.get("SCANNER_STRATEGIES", "strategies.json"))
+
+# --- API / cache ---
+HISTORY_DIR = _path(os.environ.get("SCANNER_HISTORY_DIR", "history"))
+# History is written by a background thread (disable where threads are frozen after the response)
+HISTORY_ASYNC = _bool("SCANNER_HISTORY_ASYNC", True)
+HISTORY_COMPRESS = _bool("SCANNER_HISTORY_COMPRESS", True)
+# Seconds the writer waits for more results before writing a batch
+HISTORY_FLUSH_INTERVAL = float(os.environ.get("SCANNER_HISTORY_FLUSH_INTERVAL", "0.5"))
+# Retention: every scan for KEEP_DAYS, one per day up to DAILY_DAYS, one per week after (see retention.py).
+# Opt-in, since it deletes and archives existing history
+HISTORY_RETENTION = _bool("SCANNER_HISTORY_RETENTION", False)
+HISTORY_KEEP_DAYS = float(os.environ.get("SCANNER_HISTORY_KEEP_DAYS", "30"))
+HISTORY_DAILY_DAYS = float(os.environ.get("SCANNER_HISTORY_DAILY_DAYS", "180"))
+HISTORY_RETENTION_INTERVAL = float(os.environ.get("SCANNER_HISTORY_RETENTION_INTERVAL", "86400"))
+HISTORY_PAGE_SIZE = int(os.environ.get("SCANNER_HISTORY_PAGE_SIZE", "100"))
+SCAN_CACHE_TTL = float(os.environ.get("SCAN_CACHE_TTL", "300"))
+SNAPSHOT_PATH = _path(os.environ.get("SCANNER_SNAPSHOT", os.path.join("snapshot", "scan_snapshot.json.gz")))
+SNAPSHOT_ENABLED = "SCANNER_SNAPSHOT" in os.environ
+WARMUP_MODE = os.environ.get("SCANNER_WARMUP", "background").lower()
+WARMUP_SCAN = _bool("SCANNER_WARMUP_SCAN", False)
+# Response compression levels and the number of encoded scan bodies kept per ETag
+GZIP_LEVEL = int(os.environ.get("SCANNER_GZIP_LEVEL", "6"))
+BROTLI_LEVEL = int(os.environ.get("SCANNER_BROTLI_LEVEL", "5"))
+RESPONSE_CACHE_SIZE = int(os.environ.get("SCANNER_RESPONSE_CACHE_SIZE", "64"))
+# Required in X-Strategy-Token to add or remove strategies; unset disables changes
+STRATEGY_TOKEN = os.environ.get("SCANNER_STRATEGY_TOKEN")
+# Background swing rescans every N seconds (0 = only on request); each new scan pushes webhooks
+SCAN_INTERVAL = float(os.environ.get("SCANNER_SCAN_INTERVAL", "0"))
+# Scan jobs (POST /scans): concurrent scans, waiting jobs before 429, finished jobs kept
+JOB_WORKERS = int(os.environ.get("SCANNER_JOB_WORKERS", "1"))
+JOB_QUEUE_SIZE = int(os.environ.get("SCANNER_JOB_QUEUE_SIZE", "4"))
+JOBS_KEEP = int(os.environ.get("SCANNER_JOBS_KEEP", "50"))
+# Seconds /scan?refresh=true and /scan/long-term wait for their job before answering 202
+JOB_WAIT = float(os.environ.get("SCANNER_JOB_WAIT", "120"))
+
+# --- Webhooks ---
+WEBHOOKS_PATH = _path(os.environ.get("SCANNER_WEBHOOKS", "webhooks.json"))
+# Required in X-Webhook-Token for the /webhooks endpoints; unset disables them
+WEBHOOK_TOKEN = os.environ.get("SCANNER_WEBHOOK_TOKEN")
+# Fernet key sealing subscription secrets in the webhooks file (needs `cryptography`);
+# unset means signed subscriptions cannot be stored
+WEBHOOK_KEY = os.environ.get("SCANNER_WEBHOOK_KEY")
+# Allows webhook URLs on loopback, private and link-local addresses (local testing only)
+WEBHOOK_ALLOW_PRIVATE = _bool("SCANNER_WEBHOOK_ALLOW_PRIVATE", False)
+WEBHOOK_CONCURRENCY = int(os.environ.get("SCANNER_WEBHOOK_CONCURRENCY", "8"))
+WEBHOOK_BATCH_SIZE = int(os.environ.get("SCANNER_WEBHOOK_BATCH_SIZE", "50"))
+WEBHOOK_RETRIES = int(os.environ.get("SCANNER_WEBHOOK_RETRIES", "3"))
+WEBHOOK_BACKOFF = float(os.environ.get("SCANNER_WEBHOOK_BACKOFF", "1"))
+WEBHOOK_TIMEOUT = float(os.environ.get("SCANNER_WEBHOOK_TIMEOUT", "5"))
+
+# --- Profiling ---
+PROFILE_TOKEN = os.environ.get("PROFILE_TOKEN")
+PROFILE_DIR = _path(os.environ.get("PROFILE_DIR", "profiles"))
+PROFILE_KEEP_SLOWEST = int(os.environ.get("PROFILE_KEEP_SLOWEST", "10"))
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_FORMAT = os.environ.get("PROFILE_FORMAT", "html")
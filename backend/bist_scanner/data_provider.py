@@ -1,15 +1,25 @@
-import pandas as pd
-import yfinance as yf
+from __future__ import annotations
+
 import logging
+from .lazy_imports import lazy_import
+from .http_session import create_session
 
 logger = logging.getLogger(__name__)
 
+# Imported on first use to keep cold starts fast
+pd = lazy_import("pandas")
+yf = lazy_import("yfinance")
+
 class DataProvider:
     """
     Fetches real stock data from Yahoo Finance.
+    All requests go through one pooled keep-alive session.
     """
     
-    def __init__(self):
+    def __init__(self, session=None, pool_size: int = None, http2: bool = None):
+        # Shared HTTP session (connection pool + TLS reuse) for every endpoint
+        self.session = session if session is not None else create_session(pool_size=pool_size, http2=http2)
+
         # List of BIST 100 / Popular stocks
         # Yahoo Finance requires .IS suffix for Borsa Istanbul
         self.symbols = [
@@ -20,13 +30,20 @@ class DataProvider:
             "MGROS.IS", "ODAS.IS", "PGSUS.IS", "SASA.IS", "TOASO.IS", "TAVHL.IS"
         ]
 
-    def fetch_daily_ohlcv(self, symbol: str, period="3mo") -> pd.DataFrame:
+    def get_ticker(self, symbol: str) -> yf.Ticker:
+        """
+        Returns a yfinance Ticker bound to the shared session.
+        """
+        return yf.Ticker(symbol, session=self.session)
+
+    def fetch_daily_ohlcv(self, symbol: str, period="3mo", actions: bool = False) -> pd.DataFrame:
         """
         Fetches daily OHLCV data for a given symbol from Yahoo Finance.
+        actions=True keeps the Dividends and Stock Splits columns.
         """
         try:
             # Fetch data
-            ticker = yf.Ticker(symbol)
+            ticker = self.get_ticker(symbol)
             df = ticker.history(period=period)
             
             if df.empty:
@@ -35,8 +52,11 @@ class DataProvider:
 
             # Ensure columns are properly formatted
             # yfinance returns: Open, High, Low, Close, Volume, Dividends, Stock Splits
-            # We only need OHLCV
-            df = df[['Open', 'High', 'Low', 'Close', 'Volume']]
+            # We only need OHLCV, plus the corporate actions for incremental cache updates
+            columns = ['Open', 'High', 'Low', 'Close', 'Volume']
+            if actions:
+                columns += [col for col in ('Dividends', 'Stock Splits') if col in df.columns]
+            df = df[columns]
             
             # Reset index to make Date a column if needed, or keep it as index.
             # Our scanner logic might expect Date as a column or just iterating rows.
@@ -56,7 +76,7 @@ class DataProvider:
         Fetches fundamental data (P/E, EPS, Debt/Equity, etc.)
         """
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = self.get_ticker(symbol)
             info = ticker.info
             
             # Extract key metrics safely
@@ -0,0 +1,119 @@
+"""
+Correlation-capped diversification of the ranked signal list.
+
+ReturnCorrelation keeps the Gram matrix (R^T R) and column sums of the last
+`window` daily returns of the scanned universe. The first scan builds them with
+one matrix product; later scans only subtract the rows that dropped out of the
+window (or were revised, like today's live bar) and add the new ones, so a
+rescan on the same or the next day costs a few rank-1 updates instead of a full
+recompute. select_diversified then walks the ranking and skips stocks too
+correlated with the ones already picked.
+"""
+import threading
+import numpy as np
+
+
+class ReturnCorrelation:
+    """
+    Incrementally maintained correlation matrix of daily returns per symbol.
+    """
+    def __init__(self, window: int = 60):
+        self.window = window
+        self.symbols = []
+        self.index = {}
+        self.matrix = np.empty((0, 0))
+        self.full_updates = 0
+        self.incremental_updates = 0
+        self._returns = None
+        self._gram = None
+        self._sums = None
+        self._since_full = 0
+        self._lock = threading.Lock()
+
+    def _window_returns(self, close: np.ndarray) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = close[1:] / close[:-1] - 1
+        # Missing days count as flat so every column spans the same window
+        returns = np.nan_to_num(returns[-self.window:], nan=0.0, posinf=0.0, neginf=0.0)
+        return np.ascontiguousarray(returns)
+
+    def _shift(self, old: np.ndarray, new: np.ndarray) -> int:
+        """Number of rows the window moved by since the cached one."""
+        rows = len(new)
+        for k in range(rows):
+            # The last overlapping row may be a revised live bar, so it is not compared
+            if np.array_equal(old[k:rows - 1], new[:rows - 1 - k]):
+                return k
+        return rows
+
+    def update(self, symbols: list, close: np.ndarray):
+        """
+        Refreshes the matrix from (time, symbol) closes; returns self.
+        """
+        with self._lock:
+            returns = self._window_returns(close)
+            incremental = (
+                symbols == self.symbols and self._returns is not None and self._returns.shape == returns.shape
+                # Rebuild now and then so rounding from the updates cannot accumulate
+                and self._since_full < self.window
+            )
+
+            if incremental:
+                rows = len(returns)
+                k = self._shift(self._returns, returns)
+                revised = np.flatnonzero(np.any(self._returns[k:] != returns[:rows - k], axis=1))
+                removed = self._returns[np.r_[np.arange(k), revised + k]]
+                added = returns[np.r_[np.arange(rows - k, rows), revised]]
+                self._gram += added.T @ added - removed.T @ removed
+                self._sums += added.sum(axis=0) - removed.sum(axis=0)
+                self._since_full += 1
+                self.incremental_updates += 1
+            else:
+                self._gram = returns.T @ returns
+                self._sums = returns.sum(axis=0)
+                self._since_full = 0
+                self.full_updates += 1
+
+            self._returns = returns
+            if symbols != self.symbols:
+                self.symbols = list(symbols)
+                self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+            self.matrix = self._correlation(len(returns))
+        return self
+
+    def _correlation(self, n: int) -> np.ndarray:
+        if n < 2:
+            return np.full_like(self._gram, np.nan)
+        mean = self._sums / n
+        cov = (self._gram - n * np.outer(mean, mean)) / (n - 1)
+        std = np.sqrt(np.maximum(np.diag(cov), 0.0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return cov / np.outer(std, std)
+
+    def get(self, a: str, b: str) -> float:
+        i, j = self.index.get(a), self.index.get(b)
+        if i is None or j is None:
+            return float("nan")
+        return float(self.matrix[i, j])
+
+
+def select_diversified(stocks: list, correlation: ReturnCorrelation, max_correlation: float = 0.7,
+                       limit: int = None) -> list:
+    """
+    Greedily keeps ranked stocks whose return correlation with every stock already
+    kept is at most max_correlation. Stocks without return history are always kept.
+    """
+    picked = []
+    picked_rows = []
+    for stock in stocks:
+        if limit is not None and len(picked) >= limit:
+            break
+        row = correlation.index.get(stock["code"])
+        if row is not None and picked_rows:
+            peers = correlation.matrix[row, picked_rows]
+            if np.nan_to_num(peers, nan=-1.0).max() > max_correlation:
+                continue
+        picked.append(stock)
+        if row is not None:
+            picked_rows.append(row)
+    return picked
@@ -0,0 +1,341 @@
+"""
+Scan history stored as one JSON file per scan below config.HISTORY_DIR.
+
+Handlers hand results to a HistoryWriter, which serializes, compresses and
+writes them on a background thread after the response is sent. Queued scans
+are written in batches, and a result identical to the previous one of the same
+type (by content hash) is not written again. Files are gzip-compressed
+(`.json.gz`) unless SCANNER_HISTORY_COMPRESS=false; older `.json` files stay readable.
+
+Every file is recorded in a HistoryIndex (index.jsonl in the same directory),
+which keeps entries in timestamp order in memory so a page of /history costs
+O(page size) instead of a directory listing. Old scans compacted into monthly
+zip archives by retention.py stay in the index under their original name.
+"""
+import os
+import gzip
+import zipfile
+import json
+import time
+import queue
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from . import config
+from .responses import dumps
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONS = (".json.gz", ".json")
+INDEX_FILE = "index.jsonl"
+
+
+def history_dir() -> str:
+    os.makedirs(config.HISTORY_DIR, exist_ok=True)
+    return config.HISTORY_DIR
+
+
+def _encode(data: list, scan_type: str, timestamp: datetime, data_bytes: bytes = None) -> bytes:
+    # The result list is serialized once and spliced in, so its bytes can also be hashed
+    data_bytes = dumps(data) if data_bytes is None else data_bytes
+    header = dumps({"timestamp": timestamp.isoformat(), "type": scan_type, "count": len(data)})
+    return header[:-1] + b',"data":' + data_bytes + b"}"
+
+
+def save_scan_result(data: list, scan_type: str, timestamp: datetime = None, data_bytes: bytes = None,
+                     compress: bool = None) -> str:
+    """Saves scan results to a (gzip-compressed) JSON file with a timestamp and returns its name."""
+    timestamp = timestamp or datetime.now()
+    compress = config.HISTORY_COMPRESS if compress is None else compress
+    filename = f"scan_{timestamp.strftime('%Y%m%d_%H%M%S')}_{scan_type}.json"
+    body = _encode(data, scan_type, timestamp, data_bytes)
+    if compress:
+        filename += ".gz"
+        body = gzip.compress(body, compresslevel=config.GZIP_LEVEL, mtime=0)
+
+    filepath = os.path.join(history_dir(), filename)
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(body)
+    os.replace(tmp_path, filepath)
+    get_index().add(_entry(filename, len(body)))
+    return filename
+
+
+class HistoryWriter:
+    """
+    Background queue persisting scan results. Identical consecutive results of a
+    scan type are skipped; everything queued while a batch is written goes into the next batch.
+    """
+    def __init__(self, asynchronous: bool = None, flush_interval: float = None):
+        self.asynchronous = config.HISTORY_ASYNC if asynchronous is None else asynchronous
+        self.flush_interval = config.HISTORY_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self._queue = queue.Queue()
+        self._last_hash = {}
+        self._thread = None
+        self._lock = threading.Lock()
+        self._next_retention = 0.0
+        self.stats = {"queued": 0, "written": 0, "deduplicated": 0, "batches": 0, "errors": 0}
+        self.last_retention = None
+
+    def submit(self, data: list, scan_type: str):
+        """Queues a scan result for writing (or writes it now when not asynchronous)."""
+        item = (list(data), scan_type, datetime.now())
+        self.stats["queued"] += 1
+        if not self.asynchronous:
+            self._write_batch([item])
+            return
+        self._ensure_thread()
+        self._queue.put(item)
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            # Collect what arrives shortly after, so bursts are written together
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=max(remaining, 0)) if remaining > 0
+                                 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(batch)
+                self._apply_retention()
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _apply_retention(self):
+        # At most every SCANNER_HISTORY_RETENTION_INTERVAL, on the writer thread so it never races a write
+        if not config.HISTORY_RETENTION or time.monotonic() < self._next_retention:
+            return
+        self._next_retention = time.monotonic() + config.HISTORY_RETENTION_INTERVAL
+        from .retention import apply_retention
+        try:
+            self.last_retention = apply_retention()
+        except Exception as e:
+            logger.error(f"History retention failed: {e}")
+
+    def _write_batch(self, batch: list):
+        self.stats["batches"] += 1
+        for data, scan_type, timestamp in batch:
+            try:
+                data_bytes = dumps(data)
+                digest = hashlib.blake2b(data_bytes, digest_size=16).digest()
+                if self._last_hash.get(scan_type) == digest:
+                    self.stats["deduplicated"] += 1
+                    continue
+                save_scan_result(data, scan_type, timestamp, data_bytes)
+                self._last_hash[scan_type] = digest
+                self.stats["written"] += 1
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"Could not save {scan_type} history: {e}")
+
+    def flush(self):
+        """Blocks until everything queued so far is written."""
+        self._queue.join()
+
+
+def _parse_filename(filename: str):
+    """(timestamp, type) of scan_YYYYMMDD_HHMMSS_TYPE.json[.gz]; TYPE may contain underscores."""
+    for extension in EXTENSIONS:
+        if filename.endswith(extension):
+            parts = filename[:-len(extension)].split("_")
+            return datetime.strptime(f"{parts[1]}_{parts[2]}", "%Y%m%d_%H%M%S"), "_".join(parts[3:])
+    raise ValueError(f"Not a history file: {filename}")
+
+
+def _entry(filename: str, size: int, archive: str = None) -> dict:
+    dt, scan_type = _parse_filename(filename)
+    return {"filename": filename, "timestamp": dt.isoformat(), "type": scan_type, "size": size, "archive": archive}
+
+
+def _sort_key(entry: dict):
+    return entry["timestamp"], entry["filename"]
+
+
+class HistoryIndex:
+    """
+    Timestamp-ordered entries of the history files in `directory`, persisted as
+    JSON lines. A missing index is rebuilt from the directory; an index file
+    changed by another process (the retention CLI) is reloaded on next use.
+    """
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.path = os.path.join(directory, INDEX_FILE)
+        self._lock = threading.RLock()
+        self._entries = []
+        self._by_type = {}
+        self._by_name = {}
+        self._mtime = None
+        if os.path.exists(self.path):
+            self._load()
+        else:
+            self.rebuild()
+
+    def _set(self, entries: list):
+        self._entries = sorted(entries, key=_sort_key)
+        self._by_name = {e["filename"]: e for e in self._entries}
+        self._by_type = {}
+        for entry in self._entries:
+            self._by_type.setdefault(entry["type"], []).append(entry)
+
+    def _load(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        # Later lines win (an entry is re-appended when it changes)
+        self._set(list({e["filename"]: e for e in entries}.values()))
+        self._mtime = os.stat(self.path).st_mtime_ns
+
+    def _refresh(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime != self._mtime:
+            self._load()
+
+    def _write(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            for entry in self._entries:
+                f.write(dumps(entry) + b"\n")
+        os.replace(tmp_path, self.path)
+        self._mtime = os.stat(self.path).st_mtime_ns
+
+    def rebuild(self):
+        """Re-reads the directory: loose files and the members of the archives."""
+        entries = []
+        os.makedirs(self.directory, exist_ok=True)
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.startswith("archive_") and name.endswith(".zip"):
+                with zipfile.ZipFile(path) as archive:
+                    for info in archive.infolist():
+                        try:
+                            entries.append(_entry(info.filename, info.compress_size, archive=name))
+                        except (IndexError, ValueError):
+                            continue
+                continue
+            try:
+                entries.append(_entry(name, os.path.getsize(path)))
+            except (IndexError, ValueError):
+                continue  # Skip malformed filenames
+        with self._lock:
+            self._set(entries)
+            self._write()
+
+    def add(self, entry: dict):
+        with self._lock:
+            self._refresh()
+            previous = self._by_name.get(entry["filename"])
+            if previous is not None:
+                self._set([e for e in self._entries if e is not previous] + [entry])
+            elif self._entries and _sort_key(entry) < _sort_key(self._entries[-1]):
+                self._set(self._entries + [entry])
+            else:
+                self._entries.append(entry)
+                self._by_type.setdefault(entry["type"], []).append(entry)
+                self._by_name[entry["filename"]] = entry
+            with open(self.path, "ab") as f:
+                f.write(dumps(entry) + b"\n")
+            self._mtime = os.stat(self.path).st_mtime_ns
+
+    @property
+    def lock(self):
+        """Held by retention for a whole run, so no entry is read while its file moves."""
+        return self._lock
+
+    def replace(self, entries: list):
+        """Swaps in a new entry list (after retention) and rewrites the index file."""
+        with self._lock:
+            self._set(entries)
+            self._write()
+
+    def entries(self) -> list:
+        with self._lock:
+            self._refresh()
+            return list(self._entries)
+
+    def get(self, filename: str):
+        with self._lock:
+            self._refresh()
+            return self._by_name.get(filename)
+
+    def page(self, limit: int = None, offset: int = 0, scan_type: str = None):
+        """Returns (entries newest first, total) for one page, optionally of one scan type."""
+        with self._lock:
+            self._refresh()
+            entries = self._entries if scan_type is None else self._by_type.get(scan_type, [])
+            total = len(entries)
+            end = total - offset
+            start = 0 if limit is None else max(end - limit, 0)
+            return entries[start:max(end, 0)][::-1], total
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index() -> HistoryIndex:
+    """The index of config.HISTORY_DIR."""
+    directory = history_dir()
+    index = _indexes.get(directory)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(directory)
+            if index is None:
+                index = _indexes[directory] = HistoryIndex(directory)
+    return index
+
+
+def _public(entry: dict) -> dict:
+    return {"filename": entry["filename"], "timestamp": entry["timestamp"], "type": entry["type"],
+            "size": entry["size"], "archived": entry["archive"] is not None}
+
+
+def history_page(limit: int = None, offset: int = 0, scan_type: str = None):
+    """Returns (metadata of one page of history files newest first, total count)."""
+    entries, total = get_index().page(limit, offset, scan_type)
+    return [_public(e) for e in entries], total
+
+
+def list_history() -> list:
+    """Returns metadata of saved history files, newest first."""
+    return history_page()[0]
+
+
+def history_entry(filename: str):
+    """The index entry of a history file, or None if it does not exist."""
+    return get_index().get(os.path.basename(filename))
+
+
+def read_history_bytes(entry: dict) -> bytes:
+    """The stored bytes of a history file (gzip-compressed if its name ends in .gz)."""
+    directory = history_dir()
+    if entry["archive"] is None:
+        with open(os.path.join(directory, entry["filename"]), "rb") as f:
+            return f.read()
+    with zipfile.ZipFile(os.path.join(directory, entry["archive"])) as archive:
+        return archive.read(entry["filename"])
+
+
+def load_history(filename: str):
+    """Returns the content of a history file, or None if it does not exist."""
+    entry = history_entry(filename)
+    if entry is None:
+        return None
+    body = read_history_bytes(entry)
+    if entry["filename"].endswith(".gz"):
+        body = gzip.decompress(body)
+    return json.loads(body)
@@ -0,0 +1,56 @@
+import logging
+from . import config
+
+logger = logging.getLogger(__name__)
+
+FALLBACK_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+)
+
+
+def create_session(pool_size: int = None, http2: bool = None):
+    """
+    Builds a pooled keep-alive HTTP session shared by every Yahoo request.
+
+    Prefers curl_cffi (what yfinance itself uses, and the only backend that
+    can speak HTTP/2). Falls back to requests with an HTTPAdapter pool when
+    curl_cffi is not installed; HTTP/2 is then unavailable.
+    Defaults come from YF_POOL_SIZE / YF_HTTP2. With http2 left unset the HTTP
+    version is not pinned, so curl_cffi negotiates it like the browser it
+    impersonates (yfinance's default); True or False forces HTTP/2 or HTTP/1.1.
+    """
+    pool_size = config.YF_POOL_SIZE if pool_size is None else pool_size
+    http2 = config.YF_HTTP2 if http2 is None else http2
+
+    try:
+        from curl_cffi import requests as curl_requests
+        from curl_cffi import CurlHttpVersion, CurlOpt
+    except ImportError:
+        curl_requests = None
+
+    if curl_requests is not None:
+        options = {}
+        if http2 is not None:
+            options["http_version"] = CurlHttpVersion.V2TLS if http2 else CurlHttpVersion.V1_1
+        return curl_requests.Session(
+            impersonate="chrome",
+            curl_options={CurlOpt.MAXCONNECTS: pool_size},
+            **options,
+        )
+
+    if http2:
+        logger.warning("HTTP/2 requested but curl_cffi is not installed, using HTTP/1.1")
+
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "User-Agent": FALLBACK_USER_AGENT,
+        "Connection": "keep-alive",
+    })
+    return session
@@ -0,0 +1,204 @@
+"""
+Scan jobs: scans run on a fixed number of worker threads fed by a bounded queue.
+
+Every scan the service runs goes through one JobManager: POST /scans, rescans
+of an expired or refreshed /scan cache, /scan/long-term, scheduled rescans and
+the warmup scan. So no more than `workers` scans run at once in the API process
+(the offline snapshot builder and benchmarks call the scanner directly).
+
+POST /scans submits a job and returns at once; GET /scans/{id} reports its
+status, progress (phase, symbols done/total) and provisional results while it
+runs. Jobs can be cancelled while queued or running. When the queue is full
+submit() raises QueueFull (HTTP 429). A job of a scan type that is already
+queued is not queued twice; the existing job is returned instead, and with
+join=True a running one is joined as well.
+"""
+import time
+import uuid
+import queue
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from . import config
+from .progress import ScanCancelled, ScanProgress
+
+logger = logging.getLogger(__name__)
+
+SCAN_TYPES = ("swing", "longterm")
+SCORE_KEYS = {"swing": "priority_score", "longterm": "score"}
+FINISHED = ("done", "failed", "cancelled")
+
+
+class QueueFull(Exception):
+    """Raised by submit() when the job queue is at capacity."""
+    def __init__(self, retry_after: int):
+        super().__init__("The scan queue is full")
+        self.retry_after = retry_after
+
+
+class JobPending(Exception):
+    """Raised when a scan job did not finish within the time a caller waits for it."""
+    def __init__(self, job):
+        super().__init__(f"Scan job {job.id} is still {job.status}")
+        self.job = job
+
+
+class ScanJob:
+    def __init__(self, scan_type: str, profile: bool = False):
+        self.id = uuid.uuid4().hex[:12]
+        self.scan_type = scan_type
+        self.profile = profile
+        self.status = "queued"
+        self.created = datetime.now().isoformat()
+        self.started = None
+        self.finished = None
+        self.duration_s = None
+        self.progress = ScanProgress(partial=True)
+        self.results = None
+        self.profile_id = None
+        self.error = None
+        self._done = threading.Event()
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._done.wait(timeout)
+
+    def result(self, timeout: float = None):
+        """
+        Waits for the job and returns its results. Raises JobPending after `timeout`
+        seconds (None waits indefinitely) and RuntimeError if it failed or was cancelled.
+        """
+        if not self.wait(timeout):
+            raise JobPending(self)
+        if self.status != "done":
+            raise RuntimeError(self.error or f"Scan {self.status}")
+        return self.results
+
+    def to_dict(self, results: bool = True, limit: int = None) -> dict:
+        data = {
+            "id": self.id, "type": self.scan_type, "status": self.status, "created": self.created,
+            "started": self.started, "finished": self.finished, "duration_s": self.duration_s,
+            "progress": self.progress.to_dict(), "error": self.error,
+        }
+        if results:
+            if self.results is not None:
+                data["partial"], rows = False, self.results
+            else:
+                # Provisional: relative strength is applied once the whole universe is scanned
+                data["partial"] = True
+                rows = sorted(self.progress.results, key=lambda s: s.get(SCORE_KEYS[self.scan_type], 0), reverse=True)
+            data["count"] = len(rows)
+            data["results"] = rows if limit is None else rows[:limit]
+        return data
+
+
+class JobManager:
+    """
+    Runs ScanJobs with run(job) -> results on `workers` threads; at most
+    `queue_size` jobs wait. The last `keep` finished jobs stay queryable.
+    """
+    def __init__(self, run, workers: int = None, queue_size: int = None, keep: int = None):
+        self.run = run
+        self.workers = config.JOB_WORKERS if workers is None else workers
+        self.keep = config.JOBS_KEEP if keep is None else keep
+        self.queue_size = config.JOB_QUEUE_SIZE if queue_size is None else queue_size
+        # Admission counts queued jobs, so cancelled ones free their slot at once
+        self._queue = queue.Queue()
+        self._jobs = OrderedDict()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._durations = []
+
+    def _ensure_workers(self):
+        self._threads = [t for t in self._threads if t.is_alive()]
+        for i in range(len(self._threads), self.workers):
+            thread = threading.Thread(target=self._work, name=f"scan-job-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def queued(self) -> int:
+        return sum(job.status == "queued" for job in self._jobs.values())
+
+    def retry_after(self) -> int:
+        """Seconds until a queue slot is likely free, from recent job durations."""
+        average = sum(self._durations) / len(self._durations) if self._durations else 10.0
+        return max(int(average * max(self.queued(), 1) / max(self.workers, 1)), 1)
+
+    def submit(self, scan_type: str, profile: bool = False, join: bool = False) -> ScanJob:
+        """
+        Queues a scan. With join=True a running job of the type is returned instead,
+        for callers that only need a scan newer than the cached one.
+        Raises ValueError for an unknown type and QueueFull at capacity.
+        """
+        if scan_type not in SCAN_TYPES:
+            raise ValueError(f"Unknown scan type '{scan_type}'. Valid: {', '.join(SCAN_TYPES)}")
+        reusable = ("queued", "running") if join else ("queued",)
+        with self._lock:
+            for job in self._jobs.values():
+                if job.scan_type == scan_type and job.status in reusable and not job.profile and not profile:
+                    return job
+            if self.queued() >= self.queue_size:
+                raise QueueFull(self.retry_after())
+            job = ScanJob(scan_type, profile)
+            self._jobs[job.id] = job
+            self._queue.put(job)
+            self._evict()
+            self._ensure_workers()
+        return job
+
+    def _evict(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in FINISHED]
+        for job_id in finished[:max(len(finished) - self.keep, 0)]:
+            del self._jobs[job_id]
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job.status == "queued":
+                    self._execute(job)
+            finally:
+                self._queue.task_done()
+
+    def _execute(self, job: ScanJob):
+        job.status = "running"
+        job.started = datetime.now().isoformat()
+        started = time.perf_counter()
+        try:
+            job.results = self.run(job)
+            job.status = "done"
+        except ScanCancelled:
+            job.status = "cancelled"
+        except Exception as e:
+            logger.error(f"Scan job {job.id} ({job.scan_type}) failed: {e}")
+            job.status, job.error = "failed", str(e)
+        finally:
+            job.duration_s = round(time.perf_counter() - started, 3)
+            job.finished = datetime.now().isoformat()
+            if job.status == "done":
+                self._durations = (self._durations + [job.duration_s])[-20:]
+            job._done.set()
+
+    def get(self, job_id: str) -> ScanJob:
+        return self._jobs.get(job_id)
+
+    def list(self) -> list:
+        return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> ScanJob:
+        """
+        Cancels a queued job at once and a running one at its next symbol.
+        Returns the job (None if unknown); finished jobs are left as they are.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED:
+                return job
+            job.progress.cancel()
+            if job.status == "queued":
+                job.status = "cancelled"
+                job.finished = datetime.now().isoformat()
+                job._done.set()
+            else:
+                job.status = "cancelling"
+        return job
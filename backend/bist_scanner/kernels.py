@@ -0,0 +1,191 @@
+"""
+Kernels for the Wilder-smoothed indicators (RSI, ATR, ADX).
+
+Inputs are 2-D float arrays shaped (time, symbol); 1-D arrays are treated as a
+single symbol. Columns may start with NaN padding (as in the shared price panel);
+each column then behaves like the unpadded series passed to pandas_ta.
+
+The recursive smoothing (pandas ewm(alpha=1/length, adjust=False), which is what
+pandas_ta's rma does) runs as a Numba JIT loop when numba is installed and
+SCANNER_NUMBA is on, otherwise as a NumPy loop over time vectorized across symbols.
+Results match pandas_ta 0.4.x (non-talib) to float rounding; see tests/test_kernels.py.
+"""
+import importlib.util
+import numpy as np
+from . import config
+
+_EPSILON = np.finfo(float).eps
+
+
+class Kernel:
+    """
+    A loop JIT-compiled with Numba on first call, or its NumPy fallback when numba
+    is missing or SCANNER_NUMBA is off. Both take the same arguments.
+    """
+    registry = []
+
+    def __init__(self, loop, fallback):
+        self.loop = loop
+        self.fallback = fallback
+        self.impl = None
+        Kernel.registry.append(self)
+
+    def __call__(self, *args):
+        if self.impl is None:
+            if config.NUMBA and importlib.util.find_spec("numba") is not None:
+                import numba
+                self.impl = numba.njit(cache=True, nogil=True)(self.loop)
+            else:
+                self.impl = self.fallback
+        return self.impl(*args)
+
+    @property
+    def backend(self) -> str:
+        return "numpy" if self.impl is self.fallback else "numba"
+
+
+def reset():
+    """Forgets the chosen implementations, e.g. after changing config.NUMBA."""
+    for kernel in Kernel.registry:
+        kernel.impl = None
+
+
+def _ewm_loop(x, alpha, out):
+    # Scalar version for Numba; mirrors pandas' ewm (adjust=False, ignore_na=False)
+    n_rows, n_cols = x.shape
+    for j in range(n_cols):
+        weighted = np.nan
+        old_wt = 1.0
+        for i in range(n_rows):
+            cur = x[i, j]
+            if weighted == weighted:
+                old_wt *= 1.0 - alpha
+                if cur == cur:
+                    weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+                    old_wt = 1.0
+            elif cur == cur:
+                weighted = cur
+            out[i, j] = weighted
+    return out
+
+
+def _ewm_numpy(x, alpha, out):
+    weighted = np.full(x.shape[1], np.nan)
+    old_wt = np.ones(x.shape[1])
+    for i in range(x.shape[0]):
+        cur = x[i]
+        observed = cur == cur
+        started = weighted == weighted
+        old_wt = np.where(started, old_wt * (1.0 - alpha), old_wt)
+        update = started & observed
+        blended = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+        weighted = np.where(update, blended, np.where(~started & observed, cur, weighted))
+        old_wt = np.where(update, 1.0, old_wt)
+        out[i] = weighted
+    return out
+
+
+_ewm = Kernel(_ewm_loop, _ewm_numpy)
+
+
+def backend() -> str:
+    _ewm(np.zeros((1, 1)), 1.0, np.empty((1, 1)))
+    return _ewm.backend
+
+
+def _as_2d(x) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    return x.reshape(-1, 1) if x.ndim == 1 else x
+
+
+def _shift(x: np.ndarray, periods: int = 1) -> np.ndarray:
+    out = np.full_like(x, np.nan)
+    out[periods:] = x[:-periods]
+    return out
+
+
+def rma(x, length: int) -> np.ndarray:
+    """Wilder's moving average down each column."""
+    x = _as_2d(x)
+    return _ewm(np.ascontiguousarray(x), 1.0 / length, np.empty_like(x))
+
+
+def rsi(close, length: int = 14) -> np.ndarray:
+    close = _as_2d(close)
+    change = close - _shift(close)
+    positive = np.where(change < 0, 0.0, change)
+    negative = np.where(change > 0, 0.0, change)
+    positive_avg = rma(positive, length)
+    negative_avg = rma(negative, length)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 * positive_avg / (positive_avg + np.abs(negative_avg))
+
+
+def true_range(high, low, close, prenan: bool = False) -> np.ndarray:
+    high, low, close = _as_2d(high), _as_2d(low), _as_2d(close)
+    prev_close = _shift(close)
+    tr = np.fmax(np.fmax(np.abs(high - low), np.abs(high - prev_close)), np.abs(prev_close - low))
+    if prenan:
+        tr[np.isnan(prev_close)] = np.nan
+    return tr
+
+
+def atr(high, low, close, length: int = 14, prenan: bool = False) -> np.ndarray:
+    """
+    True range seeded with its SMA over each column's first `length` rows, then Wilder-smoothed.
+    """
+    close = _as_2d(close)
+    tr = true_range(high, low, close, prenan=prenan)
+    n_rows, n_cols = tr.shape
+
+    # Row offset of every row relative to the column's first valid close
+    start = np.argmax(close == close, axis=0)
+    offset = np.arange(n_rows)[:, None] - start
+    window = (offset >= 0) & (offset < length)
+    counts = np.sum(window & (tr == tr), axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        seed = np.where(window & (tr == tr), tr, 0.0).sum(axis=0) / counts
+
+    tr = np.where(offset < length - 1, np.nan, tr)
+    seed_row = start + length - 1
+    cols = np.flatnonzero(seed_row < n_rows)
+    tr[seed_row[cols], cols] = seed[cols]
+    return rma(tr, length)
+
+
+def adx(high, low, close, length: int = 14, adxr_length: int = 2) -> dict:
+    """
+    Returns ADX, ADXR, DMP and DMN arrays keyed by their pandas_ta column names.
+    """
+    high, low = _as_2d(high), _as_2d(low)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = 100 / atr(high, low, close, length=length, prenan=True)
+        up = high - _shift(high)
+        dn = _shift(low) - low
+        pos = np.where(np.isnan(up), np.nan, np.where((up > dn) & (up > 0), up, 0.0))
+        neg = np.where(np.isnan(dn), np.nan, np.where((dn > up) & (dn > 0), dn, 0.0))
+        pos[np.abs(pos) < _EPSILON] = 0.0
+        neg[np.abs(neg) < _EPSILON] = 0.0
+
+        dmp = k * rma(pos, length)
+        dmn = k * rma(neg, length)
+        dx = 100 * np.abs(dmp - dmn) / (dmp + dmn)
+    adx_ = rma(dx, length)
+    return {
+        f"ADX_{length}": adx_,
+        f"ADXR_{length}_{adxr_length}": 0.5 * (adx_ + _shift(adx_, adxr_length)),
+        f"DMP_{length}": dmp,
+        f"DMN_{length}": dmn,
+    }
+
+
+def wilder_indicators(high, low, close, length: int = 14) -> dict:
+    """
+    RSI, ATR and ADX/DMP/DMN for every column in one pass, keyed by scanner column name.
+    """
+    result = {
+        f"RSI_{length}": rsi(close, length),
+        f"ATR_{length}": atr(high, low, close, length),
+    }
+    result.update(adx(high, low, close, length))
+    return result
@@ -0,0 +1,28 @@
+import sys
+import importlib.util
+
+
+def lazy_import(name: str):
+    """
+    Returns a module whose actual import is deferred until first attribute access.
+    Keeps heavy dependencies (pandas, pandas_ta, yfinance) off the cold-start path.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named '{name}'")
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def is_loaded(module) -> bool:
+    """
+    True once a lazy module has actually been executed.
+    """
+    return not isinstance(module, importlib.util._LazyModule)
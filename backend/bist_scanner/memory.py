@@ -0,0 +1,80 @@
+import threading
+import tracemalloc
+from contextlib import contextmanager
+import numpy as np
+
+
+class BufferPool:
+    """
+    Preallocated float32 buffers reused across symbols.
+    A scan processes one frame at a time, so a single buffer usually serves
+    the whole universe instead of allocating a new array per symbol.
+    """
+
+    def __init__(self, rows: int = 512, cols: int = 5, dtype=np.float32):
+        self.rows = rows
+        self.cols = cols
+        self.dtype = dtype
+        self._free = [np.empty((rows, cols), dtype=dtype)]
+        self._lock = threading.Lock()
+
+    def acquire(self, n_rows: int) -> np.ndarray:
+        """
+        Returns a (n_rows, cols) view of a pooled buffer. Grows the pool if
+        every buffer is in use or the request is larger than the buffers.
+        """
+        with self._lock:
+            if n_rows > self.rows:
+                # Grow all future buffers so this size is served from the pool next time
+                self.rows = n_rows
+                self._free = []
+            buf = self._free.pop() if self._free else np.empty((self.rows, self.cols), dtype=self.dtype)
+        return buf[:n_rows]
+
+    def release(self, view: np.ndarray):
+        """
+        Returns a buffer obtained from acquire() to the pool.
+        """
+        base = view.base if view.base is not None else view
+        with self._lock:
+            if base.shape[0] == self.rows:
+                self._free.append(base)
+
+
+# Scans that may overlap (swing and long-term) share one tracemalloc session
+_tracking = 0
+_tracking_started = False
+_tracking_lock = threading.Lock()
+
+
+@contextmanager
+def track_peak_memory():
+    """
+    Measures peak Python/NumPy heap allocation inside the block.
+    Yields a dict that gets 'peak_memory_mb' filled in on exit.
+    tracemalloc slows allocation-heavy code severalfold, so scans only use this
+    with SCANNER_TRACK_MEMORY. Blocks that overlap share one tracing session and
+    the peak is not reset while another is open, so each then reports the peak
+    of the overlapping blocks together (an upper bound).
+    """
+    global _tracking, _tracking_started
+    stats = {}
+    with _tracking_lock:
+        if _tracking == 0:
+            _tracking_started = not tracemalloc.is_tracing()
+            if _tracking_started:
+                tracemalloc.start()
+            else:
+                tracemalloc.reset_peak()
+        _tracking += 1
+        baseline, _ = tracemalloc.get_traced_memory()
+    try:
+        yield stats
+    finally:
+        with _tracking_lock:
+            _, peak = tracemalloc.get_traced_memory()
+            stats["peak_memory_mb"] = round(max(peak - baseline, 0) / (1024 * 1024), 2)
+            _tracking -= 1
+            if _tracking == 0 and _tracking_started:
+                tracemalloc.stop()
+                _tracking_started = False
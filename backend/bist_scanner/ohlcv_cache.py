@@ -0,0 +1,135 @@
+"""
+Per-symbol daily OHLCV kept between swing scans and refreshed incrementally.
+
+The first scan fetches `period` of history per symbol. Later scans only fetch a
+short tail (with the Dividends / Stock Splits columns) and splice it onto the
+cached frame. Yahoo adjusts all earlier prices when a split, bonus issue or
+dividend goes ex, so splicing across one would mix adjusted and unadjusted
+bars. A symbol is therefore refetched in full when the tail reports an action
+after its last settled cached bar, or when the overlapping settled bars no
+longer match the cache; every other symbol stays warm. Whatever was derived
+from a symbol's frame (its indicator features) is dropped with it.
+"""
+import logging
+import threading
+import numpy as np
+from .lazy_imports import lazy_import
+
+pd = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+ACTION_COLUMNS = ['Dividends', 'Stock Splits']
+# Why a symbol's history is refetched in full instead of spliced
+REBUILD_REASONS = {
+    "action": "split/dividend in the new bars",
+    "adjusted": "earlier bars were re-adjusted",
+    "gap": "no settled bar overlaps the cache",
+}
+
+
+class OHLCVCache:
+    """
+    Cached OHLCV frames and derived features by symbol, refreshed with tail fetches.
+    """
+    def __init__(self, period: str = "1y", tail_period: str = "5d", rtol: float = 1e-4):
+        self.period = period
+        self.tail_period = tail_period
+        # Relative tolerance when comparing overlapping closes (Yahoo rounds adjusted prices)
+        self.rtol = rtol
+        self._frames = {}
+        self._features = {}
+        self._lock = threading.Lock()
+        self.stats = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {"full_fetches": 0, "tail_fetches": 0, "unchanged": 0, "corporate_actions": 0}
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._frames
+
+    def get(self, provider, symbol: str):
+        """
+        Returns (frame, changed): the symbol's OHLCV and whether it differs from
+        the previous call. Failed tail fetches serve the cached frame.
+        """
+        cached = self._frames.get(symbol)
+        if cached is None or cached.empty or len(cached) < 2:
+            return self._full(provider, symbol), True
+
+        tail = provider.fetch_daily_ohlcv(symbol, period=self.tail_period, actions=True)
+        self.stats["tail_fetches"] += 1
+        if tail.empty:
+            return cached, False
+
+        reason = self._needs_rebuild(cached, tail)
+        if reason:
+            logger.info(f"{symbol}: {REBUILD_REASONS[reason]}, refetching its full history")
+            if reason != "gap":
+                self.stats["corporate_actions"] += 1
+            return self._full(provider, symbol), True
+
+        tail = tail[OHLCV_COLUMNS]
+        kept = cached[cached.index < tail.index[0]]
+        if len(tail) == len(cached) - len(kept) and np.array_equal(
+                tail.to_numpy(), cached.iloc[len(kept):].to_numpy(), equal_nan=True):
+            self.stats["unchanged"] += 1
+            return cached, False
+
+        frame = pd.concat([kept, tail]).iloc[-max(len(cached), len(tail)):]
+        self._store(symbol, frame)
+        return frame, True
+
+    def _needs_rebuild(self, cached, tail):
+        """The REBUILD_REASONS key why the tail cannot be spliced onto the cached frame, or None."""
+        # The last cached bar may have been a live, still-changing bar; earlier ones are settled
+        settled_end = cached.index[-2]
+        new_bars = tail.index > settled_end
+        present = [c for c in ACTION_COLUMNS if c in tail.columns]
+        if present:
+            actions = np.nan_to_num(tail[present].to_numpy(dtype=np.float64)[new_bars])
+            if actions.any():
+                return "action"
+
+        positions = cached.index.get_indexer(tail.index[~new_bars])
+        found = positions >= 0
+        if not found.any():
+            return "gap"
+        old = cached['Close'].to_numpy(dtype=np.float64)[positions[found]]
+        new = tail['Close'].to_numpy(dtype=np.float64)[~new_bars][found]
+        if not np.allclose(old, new, rtol=self.rtol, atol=0, equal_nan=True):
+            return "adjusted"
+        return None
+
+    def _full(self, provider, symbol: str):
+        frame = provider.fetch_daily_ohlcv(symbol, period=self.period)
+        self.stats["full_fetches"] += 1
+        if not frame.empty:
+            frame = frame[OHLCV_COLUMNS]
+        self._store(symbol, frame)
+        return frame
+
+    def _store(self, symbol: str, frame):
+        with self._lock:
+            self._frames[symbol] = frame
+            self._features.pop(symbol, None)
+
+    def features(self, symbol: str):
+        """Features derived from the symbol's current frame, or None."""
+        return self._features.get(symbol)
+
+    def set_features(self, symbol: str, features):
+        self._features[symbol] = features
+
+    def invalidate(self, symbol: str = None):
+        """Forgets one symbol (or all), so the next get fetches the full history."""
+        with self._lock:
+            if symbol is None:
+                self._frames.clear()
+                self._features.clear()
+            else:
+                self._frames.pop(symbol, None)
+                self._features.pop(symbol, None)
+
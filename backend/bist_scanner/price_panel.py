@@ -0,0 +1,213 @@
+"""
+Memory-mapped price/indicator panel shared by every uvicorn worker.
+
+A loader process fetches the universe once, runs apply_indicators and writes
+the panel; each worker's scanner maps the same file read-only and picks up a
+new version (checked via the file header) without a reload.
+
+File layout:
+    MAGIC (8 bytes) | header length (uint32) | JSON header | padding to DATA_ALIGN
+    float32 array of shape (symbols, rows, columns), rows right-aligned with NaN padding
+
+Build from backend/:
+    python -m bist_scanner.price_panel build [--path panel/swing_panel.bin]
+"""
+import os
+import json
+import time
+import struct
+import logging
+import argparse
+from datetime import datetime
+import numpy as np
+from . import config
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"BISTPNL1"
+DATA_ALIGN = 4096
+
+
+def write_panel(path: str, frames: dict, period: str = "3mo") -> dict:
+    """
+    Writes {symbol: indicator DataFrame} to path atomically and returns the header.
+    Readers that still map the previous file keep a valid view of the old data.
+    """
+    frames = {symbol: df for symbol, df in frames.items() if df is not None and not df.empty}
+    symbols = list(frames)
+    columns = []
+    for df in frames.values():
+        columns.extend(col for col in df.columns if col not in columns)
+    rows = max((len(df) for df in frames.values()), default=0)
+
+    data = np.full((len(symbols), rows, len(columns)), np.nan, dtype=np.float32)
+    lengths = []
+    as_of = None
+    for i, symbol in enumerate(symbols):
+        df = frames[symbol]
+        n = len(df)
+        data[i, rows - n:, :] = df.reindex(columns=columns).to_numpy(dtype=np.float32)
+        lengths.append(n)
+        last_date = df.index[-1].date().isoformat() if hasattr(df.index[-1], "date") else str(df.index[-1])
+        as_of = max(as_of, last_date) if as_of else last_date
+
+    header = {
+        "version": time.time_ns(),
+        "created": datetime.now().isoformat(),
+        "as_of": as_of,
+        "period": period,
+        "symbols": symbols,
+        "columns": columns,
+        "lengths": lengths,
+        "shape": list(data.shape),
+    }
+    header_bytes = json.dumps(header).encode("utf-8")
+    offset = _data_offset(len(header_bytes))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b"\0" * (offset - f.tell()))
+        f.write(data.tobytes(order="C"))
+    os.replace(tmp_path, path)
+    return header
+
+
+def _data_offset(header_len: int) -> int:
+    used = len(MAGIC) + 4 + header_len
+    return -(-used // DATA_ALIGN) * DATA_ALIGN
+
+
+class PricePanel:
+    """
+    Read-only, zero-copy view of a panel file. Call refresh() before a scan
+    to remap when the loader has published a new version.
+    """
+
+    def __init__(self, path: str = None, max_age: float = None):
+        self.path = path or config.PANEL_PATH
+        self.max_age = config.PANEL_MAX_AGE if max_age is None else max_age
+        self.header = {}
+        self._data = None
+        self._index = {}
+        self._columns = []
+        self._stat_key = None
+
+    @property
+    def version(self):
+        return self.header.get("version")
+
+    def refresh(self) -> bool:
+        """
+        Maps the file if it is new or changed. Returns True when usable data is loaded.
+        Only an os.stat() is paid when nothing changed.
+        """
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+
+        stat_key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if stat_key != self._stat_key:
+            try:
+                self._load()
+                self._stat_key = stat_key
+            except Exception as e:
+                logger.error(f"Error loading price panel {self.path}: {e}")
+                return False
+
+        return self._data is not None and not self.is_stale()
+
+    def is_stale(self) -> bool:
+        # The version is the writer's time.time_ns()
+        created = self.header.get("version", 0) / 1e9
+        return (time.time() - created) > self.max_age
+
+    def _load(self):
+        with open(self.path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError("not a price panel file")
+            (header_len,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(header_len).decode("utf-8"))
+
+        shape = tuple(header["shape"])
+        if 0 in shape:
+            data = np.empty(shape, dtype=np.float32)
+        else:
+            data = np.memmap(self.path, dtype=np.float32, mode="r", offset=_data_offset(header_len), shape=shape)
+
+        self.header = header
+        self._data = data
+        self._index = {symbol: i for i, symbol in enumerate(header["symbols"])}
+        self._columns = header["columns"]
+        logger.info(f"Loaded price panel v{header['version']} ({len(self._index)} symbols, as of {header['as_of']})")
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def length(self, symbol: str) -> int:
+        return self.header["lengths"][self._index[symbol]]
+
+    def frame(self, symbol: str):
+        """
+        Returns the symbol's rows as a 2-D array view (rows x columns), no copy.
+        """
+        i = self._index[symbol]
+        return self._data[i, self._data.shape[1] - self.length(symbol):, :]
+
+    def column(self, symbol: str, name: str):
+        """
+        Returns one column of the symbol's rows as a 1-D array view.
+        """
+        return self.frame(symbol)[:, self._columns.index(name)]
+
+    def last_rows(self, symbol: str, n: int = 2):
+        """
+        Returns the last n rows of a symbol as float dicts (oldest first), or None if unknown.
+        """
+        if symbol not in self._index or self.length(symbol) < n:
+            return None
+        block = self._data[self._index[symbol], -n:, :]
+        return [dict(zip(self._columns, map(float, row))) for row in block]
+
+
+def build_panel(path: str = None, period: str = None) -> dict:
+    """
+    Fetches every ticker once, applies the swing indicators and publishes the panel.
+    """
+    from .scanner import StockScanner
+    from .quality import validate_frames
+
+    path = path or config.PANEL_PATH
+    period = period or config.SWING_PERIOD
+    scanner = StockScanner(panel_path="")
+    raw = {symbol: scanner.provider.fetch_daily_ohlcv(symbol, period=period)
+           for symbol in scanner.provider.get_all_bist_tickers()}
+    if config.VALIDATE:
+        raw, report = validate_frames(raw)
+        logger.info(f"Data quality: repaired {report['repaired']}, flagged {report['flagged']}")
+    frames = {}
+    for symbol, df in raw.items():
+        df = scanner.apply_indicators(df)
+        if not df.empty:
+            frames[symbol] = df
+    header = write_panel(path, frames, period=period)
+    logger.info(f"Wrote price panel v{header['version']} to {path}: {len(header['symbols'])} symbols")
+    return header
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Build the shared price panel")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--path", default=config.PANEL_PATH)
+    parser.add_argument("--period", default=None)
+    args = parser.parse_args()
+    build_panel(args.path, args.period)
+
+
+if __name__ == "__main__":
+    main()
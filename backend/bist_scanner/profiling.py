@@ -0,0 +1,165 @@
+import os
+import io
+import time
+import uuid
+import heapq
+import random
+import hmac
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from . import config
+
+logger = logging.getLogger(__name__)
+
+
+class ScanProfiler:
+    """
+    Opt-in profiling of scan calls.
+
+    Uses pyinstrument (sampling, HTML flamegraph or speedscope JSON) when it is
+    installed and falls back to cProfile text stats otherwise. Explicitly
+    requested profiles are kept in a short recent list; every profiled scan
+    also competes for a slot among the slowest N, which is how sampled
+    background profiles (sample_rate) are retained for later inspection.
+    """
+
+    def __init__(self, token: str = None, keep_slowest: int = 10, sample_rate: float = 0.0,
+                 profile_dir: str = None, output_format: str = "html"):
+        self.token = token
+        self.keep_slowest = keep_slowest
+        self.sample_rate = sample_rate
+        self.profile_dir = profile_dir or config.PROFILE_DIR
+        self.output_format = output_format
+        self.records = {}
+        self._slowest = []  # min-heap of (duration, id)
+        self._recent = deque(maxlen=keep_slowest)
+        self._lock = threading.Lock()
+        # Only one profiler can hook the interpreter at a time
+        self._active = threading.Lock()
+
+    @classmethod
+    def from_config(cls):
+        return cls(
+            token=config.PROFILE_TOKEN,
+            keep_slowest=config.PROFILE_KEEP_SLOWEST,
+            sample_rate=config.PROFILE_SAMPLE_RATE,
+            profile_dir=config.PROFILE_DIR,
+            output_format=config.PROFILE_FORMAT,
+        )
+
+    def authorized(self, token: str) -> bool:
+        """
+        Profiling is disabled unless PROFILE_TOKEN is set and the caller presents it.
+        """
+        return bool(self.token) and token is not None and hmac.compare_digest(self.token, token)
+
+    def run(self, name: str, fn, requested: bool = False):
+        """
+        Calls fn(), profiling it when requested or picked by sampling.
+        Returns (result, profile_id) where profile_id is None if nothing was kept.
+        """
+        sampled = not requested and self.sample_rate > 0 and random.random() < self.sample_rate
+        if not (requested or sampled) or not self._active.acquire(blocking=False):
+            return fn(), None
+
+        try:
+            profiler = _start_profiler()
+            started = time.perf_counter()
+            try:
+                result = fn()
+            finally:
+                duration = time.perf_counter() - started
+                content, fmt = _stop_profiler(profiler, self.output_format)
+        finally:
+            self._active.release()
+
+        profile_id = self._store(name, duration, content, fmt, requested)
+        return result, profile_id
+
+    def _store(self, name, duration, content, fmt, requested):
+        profile_id = uuid.uuid4().hex[:12]
+        extension = {"html": "html", "speedscope": "speedscope.json", "pstats": "txt"}[fmt]
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = os.path.join(self.profile_dir, f"{profile_id}.{extension}")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+        record = {
+            "id": profile_id,
+            "name": name,
+            "duration_s": round(duration, 3),
+            "timestamp": datetime.now().isoformat(),
+            "format": fmt,
+            "requested": requested,
+            "path": path,
+        }
+
+        with self._lock:
+            self.records[profile_id] = record
+            if requested:
+                evicted = self._recent[0] if len(self._recent) == self._recent.maxlen else None
+                self._recent.append(profile_id)
+                self._discard(evicted)
+
+            heapq.heappush(self._slowest, (duration, profile_id))
+            if len(self._slowest) > self.keep_slowest:
+                _, evicted = heapq.heappop(self._slowest)
+                self._discard(evicted)
+
+        logger.info(f"Profiled {name} in {duration:.2f}s -> {profile_id}")
+        return profile_id if profile_id in self.records else None
+
+    def _discard(self, profile_id):
+        """
+        Drops a profile once it is in neither the recent nor the slowest list.
+        """
+        if profile_id is None or profile_id in self._recent:
+            return
+        if any(pid == profile_id for _, pid in self._slowest):
+            return
+        record = self.records.pop(profile_id, None)
+        if record and os.path.exists(record["path"]):
+            os.remove(record["path"])
+
+    def list(self) -> dict:
+        with self._lock:
+            slowest = [self.records[pid] for _, pid in sorted(self._slowest, reverse=True)]
+            recent = [self.records[pid] for pid in reversed(self._recent)]
+        strip = lambda r: {k: v for k, v in r.items() if k != "path"}
+        return {"slowest": [strip(r) for r in slowest], "recent": [strip(r) for r in recent]}
+
+    def get(self, profile_id: str):
+        return self.records.get(profile_id)
+
+
+def _start_profiler():
+    try:
+        from pyinstrument import Profiler
+        profiler = Profiler(interval=0.001)
+    except ImportError:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+    profiler.start()
+    return profiler
+
+
+def _stop_profiler(profiler, output_format: str):
+    """
+    Stops the profiler and renders it. Returns (content, format).
+    """
+    if hasattr(profiler, "disable"):
+        import pstats
+        profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(50)
+        return out.getvalue(), "pstats"
+
+    profiler.stop()
+    if output_format == "speedscope":
+        from pyinstrument.renderers import SpeedscopeRenderer
+        return profiler.output(SpeedscopeRenderer()), "speedscope"
+    return profiler.output_html(), "html"
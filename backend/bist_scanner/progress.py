@@ -0,0 +1,59 @@
+"""
+Progress reporting and cancellation of a running scan.
+
+The scanner calls start(phase, total) before each per-symbol loop and
+advance() after every symbol; advance() raises ScanCancelled once cancel() was
+called, so a cancelled scan stops at the next symbol. With partial=True the
+scanner also publishes provisional results (before relative strength, which
+needs the whole universe) about every tenth of a phase.
+"""
+import threading
+
+# Provisional results are published this many times per phase
+PARTIAL_STEPS = 10
+
+
+class ScanCancelled(Exception):
+    """Raised inside a scan whose progress was cancelled."""
+
+
+class ScanProgress:
+    def __init__(self, partial: bool = False):
+        self.partial = partial
+        self.phase = None
+        self.done = 0
+        self.total = 0
+        self.results = []
+        self._cancelled = threading.Event()
+
+    def start(self, phase: str, total: int):
+        self.check()
+        self.phase, self.done, self.total = phase, 0, total
+
+    def advance(self, n: int = 1):
+        self.check()
+        self.done += n
+
+    def due(self) -> bool:
+        """True when provisional results should be published after this symbol."""
+        if not self.partial or not self.total:
+            return False
+        step = max(self.total // PARTIAL_STEPS, 1)
+        return self.done % step == 0 or self.done == self.total
+
+    def publish(self, results: list):
+        self.results = results
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def check(self):
+        if self._cancelled.is_set():
+            raise ScanCancelled()
+
+    def to_dict(self) -> dict:
+        return {"phase": self.phase, "done": self.done, "total": self.total}
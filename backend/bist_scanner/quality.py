@@ -0,0 +1,167 @@
+"""
+Data-quality validation of the daily OHLCV frames before indicators are applied.
+
+All fetched frames are concatenated into one array and checked together:
+rows are tagged with their symbol, so duplicate dates, stale runs and missing
+sessions are found with shifted comparisons and bincounts instead of a Python
+loop per symbol. Sessions come from the Borsa Istanbul calendar (weekdays
+minus public holidays; half days are sessions).
+
+Repaired (the frame is rebuilt):
+    duplicate dates (the last bar is kept), bars on non-session days, bars with
+    missing or non-positive prices, and High/Low not enclosing Open/Close
+    (the range is widened to include them).
+Flagged only:
+    zero volume, runs of identical closes (suspended or frozen feed), sessions
+    missing between the first and last bar, and a last bar older than the rest
+    of the universe.
+"""
+import time
+import numpy as np
+from . import config
+from .lazy_imports import lazy_import
+
+pd = lazy_import("pandas")
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Borsa Istanbul full-day closures. Religious holidays move every year and the
+# government sometimes adds bridge days; add those with SCANNER_HOLIDAYS.
+BIST_HOLIDAYS = [
+    # 2024
+    "2024-01-01", "2024-04-10", "2024-04-11", "2024-04-12", "2024-04-23", "2024-05-01",
+    "2024-06-17", "2024-06-18", "2024-06-19", "2024-07-15", "2024-08-30", "2024-10-29",
+    # 2025
+    "2025-01-01", "2025-03-31", "2025-04-01", "2025-04-23", "2025-05-01", "2025-05-19",
+    "2025-06-06", "2025-06-09", "2025-07-15", "2025-10-29",
+    # 2026
+    "2026-01-01", "2026-03-20", "2026-04-23", "2026-05-01", "2026-05-19", "2026-05-27",
+    "2026-05-28", "2026-05-29", "2026-07-15", "2026-10-29",
+    # 2027
+    "2027-01-01", "2027-03-09", "2027-03-10", "2027-03-11", "2027-04-23", "2027-05-17",
+    "2027-05-18", "2027-05-19", "2027-07-15", "2027-08-30", "2027-10-29",
+]
+
+# Identical closes in a row before a symbol is flagged as stale
+STALE_RUN = 5
+
+
+def holidays() -> np.ndarray:
+    return np.array(BIST_HOLIDAYS + list(config.EXTRA_HOLIDAYS), dtype="datetime64[D]")
+
+
+def is_session(days: np.ndarray) -> np.ndarray:
+    return np.is_busday(days, holidays=holidays())
+
+
+def _days(indexes: list) -> np.ndarray:
+    """Local calendar days of the concatenated DatetimeIndexes."""
+    zones = {str(index.tz) for index in indexes}
+    if len(zones) > 1:
+        return np.concatenate([_days([index]) for index in indexes])
+    stamps = pd.DatetimeIndex(np.concatenate([index.values for index in indexes]))
+    tz = indexes[0].tz
+    if tz is not None:
+        # .values are UTC; one conversion for the whole universe instead of one per frame
+        stamps = stamps.tz_localize("UTC").tz_convert(tz).tz_localize(None)
+    return np.asarray(stamps, dtype="datetime64[D]")
+
+
+def _values(df) -> np.ndarray:
+    # A frame holding exactly OHLCV converts without selecting columns (much cheaper)
+    if list(df.columns) == OHLCV_COLUMNS:
+        return df.to_numpy(dtype=np.float64)
+    return df[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+
+
+def validate_frames(frames: dict):
+    """
+    Checks {symbol: OHLCV frame} in one vectorized pass. Returns (frames, report):
+    the frames with repairs applied (untouched frames are returned as is) and a
+    report with the number of symbols per issue and per-symbol issue counts.
+    """
+    started = time.perf_counter()
+    symbols = [s for s, df in frames.items() if df is not None and not df.empty]
+    sorted_frames = {s: frames[s] if frames[s].index.is_monotonic_increasing else frames[s].sort_index()
+                     for s in symbols}
+    lengths = np.array([len(sorted_frames[s]) for s in symbols], dtype=np.int64)
+    n = len(symbols)
+    report = {"symbols": n, "bars": int(lengths.sum()), "repaired": {}, "flagged": {}, "issues": {}}
+    if n == 0:
+        report["duration_ms"] = 0.0
+        return dict(frames), report
+
+    values = np.concatenate([_values(sorted_frames[s]) for s in symbols])
+    days = _days([sorted_frames[s].index for s in symbols])
+    owner = np.repeat(np.arange(n), lengths)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    open_, high, low, close, volume = values.T
+
+    # --- Repairs ---
+    duplicate = np.zeros(len(days), dtype=bool)
+    duplicate[:-1] = (owner[1:] == owner[:-1]) & (days[1:] == days[:-1])
+    non_session = ~is_session(days)
+    with np.errstate(invalid="ignore"):
+        invalid_price = ~(values[:, :4] > 0).all(axis=1)
+    drop = duplicate | non_session | invalid_price
+    top = np.fmax(np.fmax(open_, close), np.fmax(high, low))
+    bottom = np.fmin(np.fmin(open_, close), np.fmin(high, low))
+    bad_range = ~drop & ((high != top) | (low != bottom))
+
+    # --- Flags (on the bars that are kept) ---
+    keep = ~drop
+    zero_volume = keep & ~(volume > 0)
+    # A run continues while the next kept bar of the same symbol repeats the close
+    kept_idx = np.flatnonzero(keep)
+    repeat = np.zeros(len(kept_idx), dtype=bool)
+    repeat[1:] = (owner[kept_idx[1:]] == owner[kept_idx[:-1]]) & (close[kept_idx[1:]] == close[kept_idx[:-1]])
+    run_id = np.cumsum(~repeat)
+    run_length = np.bincount(run_id)[run_id]
+    stale_run = np.zeros(n, dtype=np.int64)
+    np.maximum.at(stale_run, owner[kept_idx], run_length)
+
+    # Sessions the calendar expects between each symbol's first and last kept bar
+    kept_per_symbol = np.bincount(owner[keep], minlength=n)
+    has_bars = kept_per_symbol > 0
+    first_pos = np.full(n, len(days))
+    last_pos = np.full(n, -1)
+    np.minimum.at(first_pos, owner[kept_idx], kept_idx)
+    np.maximum.at(last_pos, owner[kept_idx], kept_idx)
+    first_day = days[first_pos[has_bars]]
+    last_day = days[last_pos[has_bars]]
+    missing = np.zeros(n, dtype=np.int64)
+    missing[has_bars] = np.busday_count(first_day, last_day + 1, holidays=holidays()) - kept_per_symbol[has_bars]
+    lagging = np.zeros(n, dtype=bool)
+    if has_bars.any():
+        lagging[has_bars] = last_day < last_day.max()
+
+    counts = {
+        "duplicate_dates": np.bincount(owner[duplicate], minlength=n),
+        "non_session_bars": np.bincount(owner[non_session & ~duplicate], minlength=n),
+        "invalid_prices": np.bincount(owner[invalid_price & ~duplicate & ~non_session], minlength=n),
+        "inconsistent_ranges": np.bincount(owner[bad_range], minlength=n),
+        "zero_volume": np.bincount(owner[zero_volume], minlength=n),
+        "stale_closes": np.where(stale_run >= STALE_RUN, stale_run, 0),
+        "missing_sessions": np.maximum(missing, 0),
+        "lagging": lagging.astype(np.int64),
+    }
+    repaired = ("duplicate_dates", "non_session_bars", "invalid_prices", "inconsistent_ranges")
+    for name, per_symbol in counts.items():
+        section = "repaired" if name in repaired else "flagged"
+        report[section][name] = int(np.count_nonzero(per_symbol))
+        for i in np.flatnonzero(per_symbol):
+            report["issues"].setdefault(symbols[i], {})[name] = int(per_symbol[i])
+
+    # Rebuild only the frames that were repaired
+    out = dict(frames)
+    out.update(sorted_frames)
+    values[bad_range, 1] = top[bad_range]
+    values[bad_range, 2] = bottom[bad_range]
+    for i in np.flatnonzero(np.bincount(owner[drop | bad_range], minlength=n)):
+        rows = slice(starts[i], starts[i] + lengths[i])
+        kept = keep[rows]
+        out[symbols[i]] = pd.DataFrame(values[rows][kept], index=sorted_frames[symbols[i]].index[kept],
+                                       columns=OHLCV_COLUMNS)
+
+    report["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return out, report
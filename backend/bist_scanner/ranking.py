@@ -0,0 +1,121 @@
+"""
+Cross-sectional relative-strength ranking of the scanned universe.
+
+Every scan collects each symbol's trailing close and volume in a PriceHistory.
+The symbols are right-aligned into (time, symbol) arrays (BIST symbols share a
+trading calendar), trailing returns, volume surge and volatility are computed
+for every day, and each metric is turned into a 0-100 percentile across the
+universe on that day. The relative-strength rank is the percentile of a
+weighted blend of the return percentiles; horizons longer than the fetched
+history (e.g. 12m in the 1y swing scan) are left out of the blend.
+"""
+import numpy as np
+from .rolling import RollingWindows
+
+# Trailing return horizons in trading days, and their weight in the RS blend
+HORIZONS = {"1w": 5, "1m": 21, "3m": 63, "6m": 126, "12m": 252}
+RS_WEIGHTS = {"1w": 0.1, "1m": 0.2, "3m": 0.3, "6m": 0.2, "12m": 0.2}
+VOLUME_WINDOW = 20
+VOLATILITY_WINDOW = 20
+
+
+class PriceHistory:
+    """
+    Trailing close/volume of every symbol seen during a scan.
+    """
+    def __init__(self, rows: int = max(HORIZONS.values()) + 1):
+        self.rows = rows
+        self._series = {}
+
+    def __len__(self):
+        return len(self._series)
+
+    def add(self, symbol: str, close, volume):
+        close = np.asarray(close, dtype=np.float64)[-self.rows:]
+        volume = np.asarray(volume, dtype=np.float64)[-self.rows:]
+        self._series[symbol] = (close, volume)
+
+    def arrays(self):
+        """
+        Returns (symbols, close, volume) with close/volume right-aligned and NaN-padded.
+        """
+        symbols = list(self._series)
+        rows = max((len(close) for close, _ in self._series.values()), default=0)
+        close = np.full((rows, len(symbols)), np.nan)
+        volume = np.full((rows, len(symbols)), np.nan)
+        for j, symbol in enumerate(symbols):
+            c, v = self._series[symbol]
+            close[rows - len(c):, j] = c
+            volume[rows - len(v):, j] = v
+        return symbols, close, volume
+
+
+def percentile_rank(x: np.ndarray) -> np.ndarray:
+    """
+    Percentile (0-100) of every value within its row, ignoring NaN. Rows are days,
+    columns are symbols; a row with a single valid value ranks it 50.
+    """
+    order = np.argsort(x, axis=1)  # NaN sorts last
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(x.shape[1])[None, :], axis=1)
+    valid = x == x
+    n_valid = valid.sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(n_valid > 1, 100.0 * ranks / (n_valid - 1), 50.0)
+    return np.where(valid, pct, np.nan)
+
+
+def trailing_metrics(close: np.ndarray, volume: np.ndarray) -> dict:
+    """
+    Daily return_{horizon}, volume_surge and volatility arrays, all (time, symbol).
+    """
+    metrics = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for name, days in HORIZONS.items():
+            ret = np.full_like(close, np.nan)
+            if len(close) > days:
+                ret[days:] = close[days:] / close[:-days] - 1
+            metrics[f"return_{name}"] = ret
+
+        log_returns = np.full_like(close, np.nan)
+        log_returns[1:] = np.log(close[1:] / close[:-1])
+        windows = RollingWindows(volume=volume, log_returns=log_returns)
+        metrics["volume_surge"] = volume / windows.mean("volume", VOLUME_WINDOW) - 1
+        metrics["volatility"] = windows.std("log_returns", VOLATILITY_WINDOW) * np.sqrt(252)
+    return metrics
+
+
+def relative_strength(metrics: dict) -> dict:
+    """
+    Universe percentiles of every trailing metric plus the blended rs_rank, per day.
+    """
+    ranks = {f"{name}_pct": percentile_rank(values) for name, values in metrics.items()}
+
+    shape = metrics["volatility"].shape
+    blend = np.zeros(shape)
+    weight = np.zeros(shape)
+    for name, w in RS_WEIGHTS.items():
+        pct = ranks[f"return_{name}_pct"]
+        available = pct == pct
+        blend += np.where(available, w * pct, 0.0)
+        weight += np.where(available, w, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ranks["rs_rank"] = percentile_rank(np.where(weight > 0, blend / weight, np.nan))
+    return ranks
+
+
+def rank_universe(history: PriceHistory) -> dict:
+    """
+    Returns {symbol: {"rs_rank": .., "volume_surge_pct": .., "volatility_pct": ..}}
+    for the latest day; None where the history is too short.
+    """
+    symbols, close, volume = history.arrays()
+    if not symbols:
+        return {}
+    ranks = relative_strength(trailing_metrics(close, volume))
+
+    latest = {symbol: {} for symbol in symbols}
+    for name in ("rs_rank", "volume_surge_pct", "volatility_pct"):
+        for symbol, value in zip(symbols, ranks[name][-1]):
+            latest[symbol][name] = None if value != value else round(float(value), 1)
+    return latest
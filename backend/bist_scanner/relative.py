@@ -0,0 +1,133 @@
+"""
+Benchmark-relative momentum against the BIST 100 (XU100) and sector indices.
+
+In a high-inflation TRY market nearly every stock has positive absolute
+returns, so the long-term scan also requires beating the index. The index
+series are fetched once per scan; excess returns and beta are computed for all
+candidates at once on date-aligned (time, symbol) arrays.
+"""
+from __future__ import annotations
+
+import logging
+import numpy as np
+from .lazy_imports import lazy_import
+
+pd = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+MARKET_INDEX = "XU100.IS"
+
+# Sector index of each scanned symbol (BIST Banks, Holdings, Industrials, Services, Technology)
+SECTOR_INDEX = {
+    "AKBNK.IS": "XBANK.IS", "GARAN.IS": "XBANK.IS", "ISCTR.IS": "XBANK.IS", "YKBNK.IS": "XBANK.IS",
+    "ALARK.IS": "XHOLD.IS", "KCHOL.IS": "XHOLD.IS", "SAHOL.IS": "XHOLD.IS",
+    "ARCLK.IS": "XUSIN.IS", "EREGL.IS": "XUSIN.IS", "FROTO.IS": "XUSIN.IS", "HEKTS.IS": "XUSIN.IS",
+    "KOZAL.IS": "XUSIN.IS", "KRDMD.IS": "XUSIN.IS", "PETKM.IS": "XUSIN.IS", "SASA.IS": "XUSIN.IS",
+    "SISE.IS": "XUSIN.IS", "TOASO.IS": "XUSIN.IS", "TUPRS.IS": "XUSIN.IS", "VESTL.IS": "XUSIN.IS",
+    "BIMAS.IS": "XUHIZ.IS", "DOAS.IS": "XUHIZ.IS", "ENKAI.IS": "XUHIZ.IS", "MGROS.IS": "XUHIZ.IS",
+    "ODAS.IS": "XUHIZ.IS", "PGSUS.IS": "XUHIZ.IS", "TAVHL.IS": "XUHIZ.IS", "TCELL.IS": "XUHIZ.IS",
+    "THYAO.IS": "XUHIZ.IS", "TTKOM.IS": "XUHIZ.IS",
+    "ASELS.IS": "XUTEK.IS",
+}
+
+# Trading days per excess-return horizon, and the beta lookback
+HORIZONS = {"3m": 63, "6m": 126, "12m": 252}
+BETA_WINDOW = 252
+
+
+def fetch_benchmarks(provider, symbols, period: str = "2y") -> pd.DataFrame:
+    """
+    Fetches the market index and the sector indices of `symbols` once.
+    Returns their closes as a (date, index) frame; indices without data are left out.
+    """
+    tickers = [MARKET_INDEX] + sorted({SECTOR_INDEX[s] for s in symbols if s in SECTOR_INDEX})
+    closes = {}
+    for ticker in tickers:
+        df = provider.fetch_daily_ohlcv(ticker, period=period)
+        if df.empty:
+            logger.warning(f"No benchmark data for {ticker}")
+            continue
+        closes[ticker] = df['Close'].astype(np.float64)
+    return pd.DataFrame(closes)
+
+
+def _returns(close: np.ndarray, days: int) -> np.ndarray:
+    """Return over the last `days` rows of every column (NaN if the history is shorter)."""
+    if len(close) <= days:
+        return np.full(close.shape[1], np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return close[-1] / close[-1 - days] - 1
+
+
+def _beta(stock_returns: np.ndarray, market_returns: np.ndarray) -> np.ndarray:
+    """Beta of every column against one market column, over rows where both are valid."""
+    valid = (stock_returns == stock_returns) & (market_returns == market_returns)
+    n = valid.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = np.where(valid, stock_returns, 0.0)
+        m = np.where(valid, market_returns, 0.0)
+        s_mean = s.sum(axis=0) / n
+        m_mean = m.sum(axis=0) / n
+        cov = np.where(valid, (s - s_mean) * (m - m_mean), 0.0).sum(axis=0)
+        var = np.where(valid, (m - m_mean) ** 2, 0.0).sum(axis=0)
+        return np.where(n > 2, cov / var, np.nan)
+
+
+def relative_metrics(closes: dict, benchmarks: pd.DataFrame) -> dict:
+    """
+    Computes excess returns against the market and sector indices and beta against
+    the market for every symbol in `closes` ({symbol: date-indexed close Series}).
+
+    Returns {symbol: {"excess_3m": .., "excess_6m": .., "excess_12m": ..,
+    "sector_excess_3m": .., "beta": ..}} with returns as fractions; values are
+    None where a benchmark or enough history is missing.
+    """
+    symbols = list(closes)
+    if not symbols:
+        return {}
+
+    # Date-aligned (time, symbol) and (time, index) arrays over the stocks' calendar
+    stocks = pd.DataFrame(closes)
+    bench = benchmarks.reindex(stocks.index).ffill() if not benchmarks.empty else pd.DataFrame(index=stocks.index)
+    stock_close = stocks.to_numpy(dtype=np.float64)
+    has_market = MARKET_INDEX in bench
+
+    metrics = {}
+    if has_market:
+        market_close = bench[[MARKET_INDEX]].to_numpy(dtype=np.float64)
+        for name, days in HORIZONS.items():
+            metrics[f"excess_{name}"] = _returns(stock_close, days) - _returns(market_close, days)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            stock_log = np.diff(np.log(stock_close[-BETA_WINDOW - 1:]), axis=0)
+            market_log = np.diff(np.log(market_close[-BETA_WINDOW - 1:]), axis=0)
+        metrics["beta"] = _beta(stock_log, market_log)
+
+    # Each symbol is compared with its own sector column
+    sector_columns = [SECTOR_INDEX.get(s) for s in symbols]
+    sector_close = np.column_stack([
+        bench[c].to_numpy(dtype=np.float64) if c in bench else np.full(len(stocks), np.nan) for c in sector_columns
+    ])
+    metrics["sector_excess_3m"] = _returns(stock_close, HORIZONS["3m"]) - _returns(sector_close, HORIZONS["3m"])
+
+    result = {}
+    for j, symbol in enumerate(symbols):
+        result[symbol] = {
+            name: (None if values[j] != values[j] else float(values[j])) for name, values in metrics.items()
+        }
+        for name in ("excess_3m", "excess_6m", "excess_12m", "beta"):
+            result[symbol].setdefault(name, None)
+    return result
+
+
+def beats_benchmarks(metrics: dict, min_excess: float = 0.0) -> bool:
+    """
+    Relative-momentum filter: the stock must beat XU100 over 3 and 6 months and its
+    sector index over 3 months by more than min_excess. Missing benchmarks do not reject.
+    """
+    for name in ("excess_3m", "excess_6m", "sector_excess_3m"):
+        value = metrics.get(name)
+        if value is not None and value <= min_excess:
+            return False
+    return True
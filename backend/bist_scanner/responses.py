@@ -0,0 +1,180 @@
+"""
+JSON encoding, compression and conditional-request handling of the API responses.
+
+Bodies are encoded with orjson when installed (json otherwise) straight from
+the result dicts, skipping FastAPI's jsonable_encoder pass. Responses of the
+scan and history endpoints carry an ETag (derived from the scan version, or
+the file's mtime and size) and Last-Modified; a matching If-None-Match or
+If-Modified-Since answers 304 without encoding anything. Encoded and
+compressed bodies are kept per ETag, so repeated polls of the same scan
+version are served from memory. Brotli is used when the client accepts it and
+the `brotli` package is installed, gzip otherwise.
+"""
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi.responses import JSONResponse
+from starlette.responses import Response
+from . import config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_SIZE = 1000
+
+
+def _default(value):
+    # numpy scalars and anything else orjson/json cannot encode natively
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def dumps(data) -> bytes:
+    """Compact UTF-8 JSON. NaN/inf become null with orjson."""
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps (orjson when available)."""
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def _accepted(accept_encoding: str) -> set:
+    return {part.split(";")[0].strip().lower() for part in (accept_encoding or "").split(",")}
+
+
+def negotiate(accept_encoding: str):
+    """The preferred content coding the client accepts: "br", "gzip" or None."""
+    accepted = _accepted(accept_encoding)
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=config.BROTLI_LEVEL)
+    return gzip.compress(body, compresslevel=config.GZIP_LEVEL, mtime=0)
+
+
+def etag(*parts) -> str:
+    """A strong ETag from the given parts (scan type, version, query...)."""
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode("utf-8"), digest_size=10).hexdigest()
+    return f'"{digest}"'
+
+
+def content_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=10).hexdigest()}"'
+
+
+def not_modified(headers, tag: str, last_modified: float = None) -> bool:
+    """
+    True if the request's validators match: If-None-Match takes precedence over
+    If-Modified-Since (RFC 9110 13.2.2).
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # Weak comparison: W/"x" matches "x"
+        candidates = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return tag in candidates
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            return int(last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class BodyCache:
+    """
+    Encoded bodies by ETag, with their compressed variants, in LRU order.
+    """
+    def __init__(self, size: int = None):
+        self.size = config.RESPONSE_CACHE_SIZE if size is None else size
+        self._bodies = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, tag: str, encoding: str, build):
+        """
+        Returns (body, encoding) for the tag, encoding and compressing on a miss.
+        The encoding is None when the body is too small to be worth compressing.
+        """
+        with self._lock:
+            variants = self._bodies.get(tag)
+            if variants is not None:
+                self._bodies.move_to_end(tag)
+                if encoding in variants:
+                    return variants[encoding]
+        if variants is None:
+            plain = dumps(build())
+            variants = {None: (plain, None)}
+        plain = variants[None][0]
+        if encoding is not None:
+            variants[encoding] = (compress(plain, encoding), encoding) if len(plain) >= MIN_COMPRESS_SIZE \
+                else (plain, None)
+        with self._lock:
+            self._bodies[tag] = variants
+            self._bodies.move_to_end(tag)
+            while len(self._bodies) > self.size:
+                self._bodies.popitem(last=False)
+        return variants[encoding]
+
+
+def _headers(tag: str, last_modified: float = None) -> dict:
+    headers = {"ETag": tag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+    return headers
+
+
+def conditional_json(request, tag: str, build=None, body: bytes = None, last_modified: float = None,
+                     cache: BodyCache = None, headers: dict = None, body_encoding: str = None) -> Response:
+    """
+    A 304 when the request's validators match `tag`/`last_modified`, otherwise the
+    JSON body, compressed as negotiated. The body is either `body` (bytes, or a
+    callable returning them; already gzip-compressed with body_encoding="gzip") or
+    `build()` encoded through `cache`.
+    """
+    response_headers = _headers(tag, last_modified)
+    response_headers.update(headers or {})
+    if not_modified(request.headers, tag, last_modified):
+        return Response(status_code=304, headers=response_headers)
+
+    encoding = negotiate(request.headers.get("accept-encoding"))
+    if body is None:
+        content, encoding = (cache or BodyCache(1)).get(tag, encoding, build)
+    else:
+        body = body() if callable(body) else body
+        if body_encoding is not None:
+            # Stored compressed: sent as is when the client accepts it, inflated otherwise
+            if body_encoding in _accepted(request.headers.get("accept-encoding")):
+                response_headers["Content-Encoding"] = body_encoding
+                return Response(content=body, media_type="application/json", headers=response_headers)
+            body = gzip.decompress(body)
+        if encoding is not None and len(body) >= MIN_COMPRESS_SIZE:
+            content = compress(body, encoding)
+        else:
+            content, encoding = body, None
+    if encoding is not None:
+        response_headers["Content-Encoding"] = encoding
+    return Response(content=content, media_type="application/json", headers=response_headers)
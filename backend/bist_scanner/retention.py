@@ -0,0 +1,173 @@
+"""
+Retention and compaction of the scan history (config.HISTORY_DIR).
+
+By the age of a scan, per scan type:
+    up to keep_days     every scan is kept as its own file
+    up to daily_days    only the last scan of each day is kept
+    older               only the last scan of each ISO week is kept
+Kept scans older than keep_days are moved into monthly zip archives
+(archive_YYYY-MM.zip; gzip files are stored as is, plain JSON is deflated) and
+stay readable through /history under their original name. A dry run reports
+what would be deleted and archived and the bytes it would reclaim without
+touching anything. Runs hold the history index's lock, so a dry run never
+reads a file that a concurrent run is moving.
+
+Usage (from backend/):
+    python -m bist_scanner.retention --dry-run
+    python -m bist_scanner.retention [--keep-days 30] [--daily-days 180] [--rebuild-index]
+"""
+import os
+import json
+import zlib
+import logging
+import argparse
+import zipfile
+from datetime import datetime, timedelta
+from . import config
+from .history import get_index, history_dir, read_history_bytes
+
+logger = logging.getLogger(__name__)
+
+# (filename, size) -> deflated size; history files never change, so each is compressed once
+_estimated_sizes = {}
+
+
+def _archive_name(entry: dict) -> str:
+    return f"archive_{entry['timestamp'][:7]}.zip"
+
+
+def plan(entries: list, now: datetime, keep_days: float, daily_days: float):
+    """
+    Splits index entries into (keep, archive, delete): `archive` holds the kept
+    loose files old enough to be compacted, `keep` everything else that stays.
+    """
+    recent_cutoff = (now - timedelta(days=keep_days)).isoformat()
+    daily_cutoff = (now - timedelta(days=daily_days)).isoformat()
+    buckets = {}
+    keep = []
+    for entry in entries:
+        if entry["timestamp"] >= recent_cutoff:
+            keep.append(entry)
+            continue
+        dt = datetime.fromisoformat(entry["timestamp"])
+        period = dt.date().isoformat() if entry["timestamp"] >= daily_cutoff else "W%d-%02d" % dt.isocalendar()[:2]
+        buckets.setdefault((entry["type"], period), []).append(entry)
+
+    archive, delete = [], []
+    for bucket in buckets.values():
+        # Entries are in timestamp order: the last one of the period survives
+        *older, last = bucket
+        delete.extend(older)
+        (archive if last["archive"] is None else keep).append(last)
+    return keep, archive, delete
+
+
+def _estimated_size(entry: dict) -> int:
+    # Size of the entry once archived: gzip files are stored, plain JSON is deflated
+    if entry["filename"].endswith(".gz"):
+        return entry["size"]
+    key = (entry["filename"], entry["size"])
+    if key not in _estimated_sizes:
+        _estimated_sizes[key] = len(zlib.compress(read_history_bytes(entry), 6))
+    return _estimated_sizes[key]
+
+
+def _rewrite_archive(directory: str, name: str, members: list, new: list):
+    """Writes archive `name` with the kept `members` (entries already in it) plus `new` loose files."""
+    path = os.path.join(directory, name)
+    tmp_path = f"{path}.tmp"
+    sizes = {}
+    with zipfile.ZipFile(tmp_path, "w") as out:
+        if members:
+            with zipfile.ZipFile(path) as current:
+                for entry in members:
+                    info = current.getinfo(entry["filename"])
+                    out.writestr(info, current.read(info), compress_type=info.compress_type)
+        for entry in new:
+            compress_type = zipfile.ZIP_STORED if entry["filename"].endswith(".gz") else zipfile.ZIP_DEFLATED
+            out.writestr(entry["filename"], read_history_bytes(entry), compress_type=compress_type)
+        for info in out.infolist():
+            sizes[info.filename] = info.compress_size
+    if sizes:
+        os.replace(tmp_path, path)
+    else:
+        os.remove(tmp_path)
+        if os.path.exists(path):
+            os.remove(path)
+    return sizes
+
+
+def apply_retention(dry_run: bool = False, now: datetime = None, keep_days: float = None,
+                    daily_days: float = None) -> dict:
+    """
+    Applies (or with dry_run, only reports) the retention policy. Returns counts of
+    kept, archived and deleted scans and the bytes on disk before and after.
+    """
+    now = now or datetime.now()
+    keep_days = config.HISTORY_KEEP_DAYS if keep_days is None else keep_days
+    daily_days = config.HISTORY_DAILY_DAYS if daily_days is None else max(daily_days, keep_days)
+    index = get_index()
+    with index.lock:
+        return _apply(index, history_dir(), dry_run, now, keep_days, daily_days)
+
+
+def _apply(index, directory: str, dry_run: bool, now: datetime, keep_days: float, daily_days: float) -> dict:
+    entries = index.entries()
+    keep, archive, delete = plan(entries, now, keep_days, daily_days)
+
+    archives = {e["archive"] for e in entries if e["archive"]}
+    bytes_before = sum(e["size"] for e in entries if e["archive"] is None) + sum(
+        os.path.getsize(os.path.join(directory, name)) for name in archives
+        if os.path.exists(os.path.join(directory, name)))
+    report = {
+        "dry_run": dry_run, "scans": len(entries), "kept": len(keep) + len(archive), "archived": len(archive),
+        "deleted": len(delete), "keep_days": keep_days, "daily_days": daily_days, "bytes_before": bytes_before,
+    }
+
+    if dry_run:
+        archived_delta = sum(e["size"] - _estimated_size(e) for e in archive)
+        report["bytes_after"] = bytes_before - sum(e["size"] for e in delete) - archived_delta
+        report["reclaimed_bytes"] = bytes_before - report["bytes_after"]
+        return report
+
+    # Archives that gain members or lose deleted ones are rewritten
+    touched = {_archive_name(e) for e in archive} | {e["archive"] for e in delete if e["archive"]}
+    final = [e for e in keep if e["archive"] not in touched]
+    for name in sorted(touched):
+        members = [e for e in keep if e["archive"] == name]
+        new = [e for e in archive if _archive_name(e) == name]
+        sizes = _rewrite_archive(directory, name, members, new)
+        final.extend(dict(e, archive=name, size=sizes[e["filename"]]) for e in members + new)
+
+    index.replace(final)
+    for entry in archive + [e for e in delete if e["archive"] is None]:
+        try:
+            os.remove(os.path.join(directory, entry["filename"]))
+        except FileNotFoundError:
+            pass
+
+    archives = {e["archive"] for e in final if e["archive"]}
+    report["bytes_after"] = sum(e["size"] for e in final if e["archive"] is None) + sum(
+        os.path.getsize(os.path.join(directory, name)) for name in archives)
+    report["reclaimed_bytes"] = bytes_before - report["bytes_after"]
+    logger.info(f"History retention: {report}")
+    return report
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Apply the scan history retention policy")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would change")
+    parser.add_argument("--keep-days", type=float, default=None)
+    parser.add_argument("--daily-days", type=float, default=None)
+    parser.add_argument("--rebuild-index", action="store_true", help="re-read the directory first")
+    args = parser.parse_args()
+
+    if args.rebuild_index:
+        get_index().rebuild()
+    report = apply_retention(dry_run=args.dry_run, keep_days=args.keep_days, daily_days=args.daily_days)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Shared rolling-window statistics for the Bollinger, Stochastic, volume MA and
+High_10 columns.
+
+RollingWindows takes prefix sums (value, square, count) of every series once,
+so any window's sum, mean and variance is O(1) per row, and computes rolling
+min/max with an O(n) monotonic deque (Numba) or a sliding-window view (NumPy
+fallback). Arrays are (time, symbol) like kernels.py; a window containing NaN
+yields NaN, as pandas' rolling(window) does. Derived columns match pandas_ta
+0.4.x to float rounding; see tests/test_rolling.py.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from .kernels import Kernel, _as_2d, _EPSILON
+
+
+def _extreme_loop(x, window, sign, out):
+    # Monotonic deque of row indices per column; sign=1 for max, -1 for min
+    n_rows, n_cols = x.shape
+    queue = np.empty(n_rows, dtype=np.int64)
+    for j in range(n_cols):
+        head = 0
+        tail = 0
+        last_nan = -window
+        for i in range(n_rows):
+            value = x[i, j]
+            if value != value:
+                last_nan = i
+                head = 0
+                tail = 0
+            else:
+                while tail > head and sign * x[queue[tail - 1], j] <= sign * value:
+                    tail -= 1
+                queue[tail] = i
+                tail += 1
+                if queue[head] <= i - window:
+                    head += 1
+            if i - last_nan >= window and i >= window - 1:
+                out[i, j] = x[queue[head], j]
+            else:
+                out[i, j] = np.nan
+    return out
+
+
+def _extreme_numpy(x, window, sign, out):
+    out[:window - 1] = np.nan
+    if len(x) >= window:
+        view = sliding_window_view(x, window, axis=0)
+        out[window - 1:] = view.max(axis=-1) if sign > 0 else view.min(axis=-1)
+    return out
+
+
+_extreme = Kernel(_extreme_loop, _extreme_numpy)
+
+
+def _prefix(x: np.ndarray) -> np.ndarray:
+    out = np.zeros((x.shape[0] + 1,) + x.shape[1:])
+    np.cumsum(x, axis=0, out=out[1:])
+    return out
+
+
+def _nonzero_range(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    # pandas_ta's non_zero_range: adds epsilon to a column that has any zero difference
+    diff = x - y
+    return diff + np.where((diff == 0).any(axis=0), _EPSILON, 0.0)
+
+
+class RollingWindows:
+    """
+    Rolling statistics over named (time, symbol) series, cached per series and window.
+    """
+    def __init__(self, **series):
+        self.series = {name: _as_2d(values) for name, values in series.items()}
+        self._prefix = {}
+        self._extremes = {}
+
+    def _sums(self, name: str):
+        if name not in self._prefix:
+            x = self.series[name]
+            valid = x == x
+            # Centering each column keeps the sum of squares well conditioned
+            center = np.where(valid, x, 0.0).sum(axis=0) / np.maximum(valid.sum(axis=0), 1)
+            centered = np.where(valid, x - center, 0.0)
+            self._prefix[name] = (center, _prefix(centered), _prefix(centered * centered), _prefix(valid.astype(np.float64)))
+        return self._prefix[name]
+
+    def _window(self, prefix: np.ndarray, window: int) -> np.ndarray:
+        out = np.full(prefix[1:].shape, np.nan)
+        out[window - 1:] = prefix[window:] - prefix[:-window]
+        return out
+
+    def _full(self, name: str, window: int) -> np.ndarray:
+        _, _, _, count = self._sums(name)
+        return self._window(count, window) == window
+
+    def sum(self, name: str, window: int) -> np.ndarray:
+        center, total, _, _ = self._sums(name)
+        return np.where(self._full(name, window), self._window(total, window) + window * center, np.nan)
+
+    def mean(self, name: str, window: int) -> np.ndarray:
+        center, total, _, _ = self._sums(name)
+        return np.where(self._full(name, window), self._window(total, window) / window + center, np.nan)
+
+    def var(self, name: str, window: int, ddof: int = 1) -> np.ndarray:
+        _, total, squares, _ = self._sums(name)
+        s = self._window(total, window)
+        var = (self._window(squares, window) - s * s / window) / (window - ddof)
+        return np.where(self._full(name, window), np.maximum(var, 0.0), np.nan)
+
+    def std(self, name: str, window: int, ddof: int = 1) -> np.ndarray:
+        return np.sqrt(self.var(name, window, ddof))
+
+    def max(self, name: str, window: int) -> np.ndarray:
+        return self._extreme(name, window, 1)
+
+    def min(self, name: str, window: int) -> np.ndarray:
+        return self._extreme(name, window, -1)
+
+    def _extreme(self, name: str, window: int, sign: int) -> np.ndarray:
+        key = (name, window, sign)
+        if key not in self._extremes:
+            x = np.ascontiguousarray(self.series[name])
+            self._extremes[key] = _extreme(x, window, sign, np.empty_like(x))
+        return self._extremes[key]
+
+
+def rolling_mean(x, window: int) -> np.ndarray:
+    """Simple moving average of an arbitrary (time, symbol) array."""
+    return RollingWindows(x=x).mean("x", window)
+
+
+def bbands(windows: RollingWindows, length: int = 20, std: float = 2.0, source: str = "close") -> dict:
+    """
+    Bollinger Bands keyed BBL/BBM/BBU/BBB/BBP_{length}_{std}.
+    """
+    close = windows.series[source]
+    mid = windows.mean(source, length)
+    deviation = std * windows.std(source, length)
+    lower, upper = mid - deviation, mid + deviation
+    with np.errstate(divide="ignore", invalid="ignore"):
+        width = _nonzero_range(upper, lower)
+        props = f"_{length}_{float(std)}"
+        return {
+            f"BBL{props}": lower,
+            f"BBM{props}": mid,
+            f"BBU{props}": upper,
+            f"BBB{props}": 100 * width / mid,
+            f"BBP{props}": _nonzero_range(close, lower) / width,
+        }
+
+
+def stoch(windows: RollingWindows, k: int = 14, d: int = 3, smooth_k: int = 3) -> dict:
+    """
+    Slow stochastic keyed STOCHk/STOCHd/STOCHh_{k}_{d}_{smooth_k}; needs high, low and close series.
+    """
+    lowest = windows.min("low", k)
+    highest = windows.max("high", k)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        raw = 100 * (windows.series["close"] - lowest) / _nonzero_range(highest, lowest)
+    stoch_k = rolling_mean(raw, smooth_k) if smooth_k > 1 else raw
+    stoch_d = rolling_mean(stoch_k, d)
+    props = f"_{k}_{d}_{smooth_k}"
+    return {
+        f"STOCHk{props}": stoch_k,
+        f"STOCHd{props}": stoch_d,
+        f"STOCHh{props}": stoch_k - stoch_d,
+    }
@@ -0,0 +1,117 @@
+"""
+Differences between consecutive scans of the same type, keyed by stock code.
+
+Every new result list gets the next version number. Only a compact summary
+(rank, strategies, score) of the last few versions is kept, so /scan/diff can
+answer "what changed since version N" from memory: the full rows of new
+entries, the codes that dropped out, and strategy or score changes of the rest.
+"""
+import logging
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Versions kept per scan type for `since` queries
+KEEP_VERSIONS = 10
+SCORE_KEYS = {"swing": "priority_score", "longterm": "score"}
+
+
+def summarize(results: list, score_key: str) -> dict:
+    """{code: (rank, strategies, score)} of a ranked result list."""
+    return {
+        stock["code"]: (rank, tuple(stock.get("strategies", [])), stock.get(score_key))
+        for rank, stock in enumerate(results, start=1)
+    }
+
+
+def diff_summaries(old: dict, new: dict, results: list) -> dict:
+    """
+    New entries (full rows from `results`), dropped codes and changed entries
+    between two summaries. `unchanged` counts entries with identical strategies and score.
+    """
+    added = [stock for stock in results if stock["code"] not in old]
+    dropped = [code for code in old if code not in new]
+    changed = []
+    unchanged = 0
+    for code, (rank, strategies, score) in new.items():
+        if code not in old:
+            continue
+        old_rank, old_strategies, old_score = old[code]
+        if strategies == old_strategies and score == old_score:
+            unchanged += 1
+            continue
+        entry = {"code": code, "rank": rank, "previous_rank": old_rank, "score": score}
+        if score is not None and old_score is not None:
+            entry["score_delta"] = round(score - old_score, 4)
+        if strategies != old_strategies:
+            entry["strategies_added"] = [s for s in strategies if s not in old_strategies]
+            entry["strategies_removed"] = [s for s in old_strategies if s not in strategies]
+        changed.append(entry)
+    return {"new": added, "dropped": dropped, "changed": changed, "unchanged": unchanged}
+
+
+class ScanDiffs:
+    """
+    Versioned summaries of the latest scans per type, and the diff between them.
+    """
+    def __init__(self, keep: int = KEEP_VERSIONS):
+        self.keep = keep
+        self._versions = {}
+        self._results = {}
+        self._created = {}
+        self._lock = threading.Lock()
+        # Called with (scan_type, version) after every new version, e.g. webhook pushes
+        self.listeners = []
+
+    def record(self, scan_type: str, results: list) -> int:
+        """
+        Stores a new result list and returns its version. Recording the same list
+        object again (e.g. a cached index) is a no-op.
+        """
+        with self._lock:
+            versions = self._versions.setdefault(scan_type, {})
+            if self._results.get(scan_type) is results:
+                return max(versions)
+            version = max(versions, default=0) + 1
+            versions[version] = summarize(results, SCORE_KEYS.get(scan_type, "priority_score"))
+            for old in sorted(versions)[:-self.keep]:
+                del versions[old]
+            self._results[scan_type] = results
+            self._created[scan_type] = datetime.now().isoformat()
+        for listener in self.listeners:
+            try:
+                listener(scan_type, version)
+            except Exception as e:
+                logger.error(f"Scan diff listener failed: {e}")
+        return version
+
+    def version(self, scan_type: str) -> int:
+        """The latest version of a scan type (0 if none)."""
+        return max(self._versions.get(scan_type) or [0])
+
+    def latest(self, scan_type: str) -> list:
+        """The most recently recorded results of a scan type (empty if none)."""
+        return self._results.get(scan_type, [])
+
+    def diff(self, scan_type: str, since: int = None) -> dict:
+        """
+        Changes from version `since` (default: the previous scan) to the latest.
+        When `since` is no longer kept, reset=True and `new` holds the full list.
+        Raises KeyError if nothing of this type was recorded yet.
+        """
+        with self._lock:
+            versions = self._versions[scan_type]
+            results = self._results[scan_type]
+            version = max(versions)
+            if since is None:
+                since = version - 1
+            payload = {"type": scan_type, "version": version, "since": since,
+                       "created": self._created[scan_type], "reset": False}
+            if since == version:
+                payload.update(new=[], dropped=[], changed=[], unchanged=len(results))
+            elif since in versions or since == 0:
+                payload.update(diff_summaries(versions.get(since, {}), versions[version], results))
+            else:
+                payload.update(reset=True, new=list(results), dropped=[], changed=[], unchanged=0)
+            return payload
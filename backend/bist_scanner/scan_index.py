@@ -0,0 +1,108 @@
+import time
+import threading
+from .strategies import get_registry
+
+RISK_LEVELS = ("Low", "Medium", "High")
+
+
+class ScanIndex:
+    """
+    Scan results presorted by priority_score, with one bitmap per strategy,
+    risk level and holding period. Bit i is the i-th ranked stock, so AND-ing
+    the bitmaps of a combined filter and walking the set bits yields matches
+    already in rank order.
+    """
+
+    def __init__(self, results: list):
+        self.results = sorted(results, key=lambda x: x.get('priority_score', 0), reverse=True)
+        self.created = time.time()
+        self.all = (1 << len(self.results)) - 1
+        self.strategies = {}
+        self.risks = {}
+        self.holdings = {}
+
+        for pos, stock in enumerate(self.results):
+            bit = 1 << pos
+            for strategy in stock.get("strategies", []):
+                self.strategies[strategy] = self.strategies.get(strategy, 0) | bit
+            risk = stock.get("risk_level")
+            if risk is not None:
+                self.risks[risk] = self.risks.get(risk, 0) | bit
+            holding = stock.get("estimated_holding_period_days")
+            if holding is not None:
+                self.holdings[holding] = self.holdings.get(holding, 0) | bit
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.created
+
+    def query(self, strategy: str = "all", risk: str = None, holding: int = None, limit: int = None) -> list:
+        """
+        Returns ranked stocks matching every given filter.
+        Raises ValueError for an unknown strategy or risk level.
+        """
+        mask = self.all
+        if strategy and strategy != "all":
+            # Query keys accepted by /scan?strategy= map to the strategy names stored on each stock
+            strategy_keys = get_registry().keys
+            if strategy not in strategy_keys:
+                raise ValueError(f"Unknown strategy '{strategy}'. Valid: all, {', '.join(strategy_keys)}")
+            mask &= self.strategies.get(strategy_keys[strategy], 0)
+        if risk:
+            risk = risk.capitalize()
+            if risk not in RISK_LEVELS:
+                raise ValueError(f"Unknown risk level '{risk}'. Valid: {', '.join(RISK_LEVELS)}")
+            mask &= self.risks.get(risk, 0)
+        if holding is not None:
+            mask &= self.holdings.get(holding, 0)
+
+        matches = []
+        while mask and (limit is None or len(matches) < limit):
+            low = mask & -mask
+            matches.append(self.results[low.bit_length() - 1])
+            mask ^= low
+        return matches
+
+
+class ScanCache:
+    """
+    Keeps the latest ScanIndex per scan type and rebuilds it once it is older
+    than max_age. Concurrent requests wait for one rescan instead of each
+    running their own.
+    """
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def get(self, scan_type: str, run_scan, refresh: bool = False):
+        """
+        Returns (index, fresh) where fresh tells whether run_scan was called.
+        """
+        index = self._indexes.get(scan_type)
+        if index is not None and not refresh and index.age < self.max_age:
+            return index, False
+
+        with self._lock:
+            index = self._indexes.get(scan_type)
+            if index is not None and not refresh and index.age < self.max_age:
+                return index, False
+            index = ScanIndex(run_scan())
+            self._indexes[scan_type] = index
+            return index, True
+
+    def peek(self, scan_type: str, fresh: bool = True):
+        """The cached index (None if there is none, or with fresh=True if it has expired); never scans."""
+        index = self._indexes.get(scan_type)
+        if index is None or (fresh and index.age >= self.max_age):
+            return None
+        return index
+
+    def invalidate(self, scan_type: str = None):
+        """Drops the cached index of one scan type (or all), so the next get rescans."""
+        with self._lock:
+            if scan_type is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(scan_type, None)
@@ -0,0 +1,648 @@
+from __future__ import annotations
+
+import time
+from contextlib import nullcontext
+import numpy as np
+from . import config, kernels, rolling, timeframes
+from .lazy_imports import lazy_import
+from .data_provider import DataProvider
+from .memory import BufferPool, track_peak_memory
+from .price_panel import PricePanel
+from .ranking import PriceHistory, rank_universe
+from .diversify import ReturnCorrelation
+from .ohlcv_cache import OHLCVCache
+from .progress import ScanProgress
+from .quality import validate_frames
+from .strategies import FeatureMatrix, get_registry
+from . import relative
+import logging
+
+# Heavy modules are imported on first use to keep cold starts fast
+pd = lazy_import("pandas")
+ta = lazy_import("pandas_ta")
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+class StockScanner:
+    def __init__(self, compact: bool = None, track_memory: bool = None, panel_path: str = None):
+        self.provider = DataProvider()
+
+        # Shared memory-mapped panel written by the loader process (see price_panel.py)
+        if panel_path is None and config.PANEL_ENABLED:
+            panel_path = config.PANEL_PATH
+        self.panel = PricePanel(panel_path) if panel_path else None
+
+        # Compact mode: float32 OHLCV in pooled buffers, frames dropped after feature extraction
+        self.compact = config.COMPACT if compact is None else compact
+        self.track_memory = config.TRACK_MEMORY if track_memory is None else track_memory
+        self.buffer_pool = BufferPool(cols=len(OHLCV_COLUMNS))
+        self.last_scan_stats = {}
+        # Last-row features of every symbol in the latest swing scan (used by snapshots)
+        self.last_features = {}
+        # Universe relative-strength percentiles of the latest scan, by symbol
+        self.last_ranks = {}
+        # Data-quality report of the latest swing scan's fetched frames (see quality.py)
+        self.last_quality = {}
+        # Closes of the latest completed swing scan, and their cached return correlation
+        self.swing_history = PriceHistory()
+        self.correlation = ReturnCorrelation(window=config.CORRELATION_WINDOW)
+        # Daily OHLCV kept between swing scans; only changed symbols are refetched or recomputed
+        self.ohlcv_cache = OHLCVCache(config.SWING_PERIOD, config.OHLCV_TAIL_PERIOD) if config.OHLCV_CACHE else None
+        self._panel_sources = 0
+
+    def compact_frame(self, df: pd.DataFrame):
+        """
+        Copies OHLCV into a pooled float32 buffer when compact mode is on.
+        Returns the frame and the buffer to release once the frame is no longer needed.
+        """
+        if not self.compact or df.empty:
+            return df, None
+
+        buf = self.buffer_pool.acquire(len(df))
+        for i, col in enumerate(OHLCV_COLUMNS):
+            buf[:, i] = df[col].to_numpy()
+        return pd.DataFrame(buf, index=df.index, columns=OHLCV_COLUMNS, copy=False), buf
+
+    def release_frame(self, buf):
+        if buf is not None:
+            self.buffer_pool.release(buf)
+
+    def extract_features(self, df: pd.DataFrame):
+        """
+        Returns the last two rows as plain float dicts so the frame can be dropped.
+        """
+        last = {col: float(val) for col, val in df.iloc[-1].items()}
+        prev = {col: float(val) for col, val in df.iloc[-2].items()}
+        return last, prev
+
+    def _record_scan_stats(self, scan_type: str, symbols: int, started: float, mem: dict, **extra):
+        self.last_scan_stats = {
+            "type": scan_type,
+            "symbols": symbols,
+            "compact": self.compact,
+            "duration_s": round(time.perf_counter() - started, 3),
+            "peak_memory_mb": mem.get("peak_memory_mb"),
+            "panel_symbols": self._panel_sources,
+            "panel_version": self.panel.version if self.panel else None,
+            **extra,
+        }
+        logger.info(f"Scan stats: {self.last_scan_stats}")
+
+    def apply_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calculates necessary technical indicators for all strategies.
+        """
+        if df.empty:
+            return df
+            
+        # Ensure we have enough data (need more for EMA50, MACD, etc)
+        if len(df) < 60:
+            return pd.DataFrame() 
+
+        # Indicators are collected and joined once instead of growing df with repeated pd.concat
+        columns = {}
+        frames = []
+
+        # --- Trend Indicators ---
+        # EMA(10), EMA(20), EMA(50)
+        columns['EMA_10'] = ta.ema(df['Close'], length=10)
+        columns['EMA_20'] = ta.ema(df['Close'], length=20)
+        columns['EMA_50'] = ta.ema(df['Close'], length=50)
+
+        # MACD (12, 26, 9)
+        macd = ta.macd(df['Close'], fast=12, slow=26, signal=9)
+        if macd is not None:
+            frames.append(macd) # Adds MACD_12_26_9, MACDs_12_26_9, MACDh_12_26_9
+
+        high, low, close = df['High'].to_numpy(), df['Low'].to_numpy(), df['Close'].to_numpy()
+
+        # --- Wilder-smoothed indicators ---
+        # RSI(14), ATR(14), ADX(14) with DMP_14/DMN_14 from the shared kernels (see kernels.py)
+        columns.update(kernels.wilder_indicators(high, low, close, length=14))
+
+        # Rolling sums and extrema over windows 10/14/20 are shared by the columns below (see rolling.py)
+        windows = rolling.RollingWindows(high=high, low=low, close=close, volume=df['Volume'].to_numpy())
+
+        # --- Momentum Indicators ---
+        # Stochastic (14)
+        columns.update(rolling.stoch(windows, k=14, d=3, smooth_k=3)) # Adds STOCHk_14_3_3, STOCHd_14_3_3, STOCHh_14_3_3
+
+        # --- Volatility Indicators ---
+        # Bollinger Bands (20, 2)
+        columns.update(rolling.bbands(windows, length=20, std=2)) # Adds BBL_20_2.0, BBM_20_2.0, BBU_20_2.0, BBB_20_2.0, BBP_20_2.0
+
+        # Volume MA(20)
+        columns['Vol_MA_20'] = windows.mean('volume', 20)
+
+        # 10-day High (Highest close of last 10 days)
+        columns['High_10'] = windows.max('close', 10)
+
+        # --- Weekly / monthly confirmation ---
+        # W_/M_ EMA, MACD and RSI resampled from these same daily bars (see timeframes.py)
+        if isinstance(df.index, pd.DatetimeIndex):
+            columns.update(timeframes.multi_timeframe_indicators(
+                df.index, close, columns=timeframes.available_columns(config.SWING_PERIOD)))
+
+        columns = {name: values[:, 0] if values.ndim == 2 else values for name, values in columns.items()}
+        indicators = pd.concat([pd.DataFrame(columns, index=df.index)] + frames, axis=1)
+        if self.compact:
+            indicators = indicators.astype(np.float32)
+
+        return pd.concat([df, indicators], axis=1)
+
+    def check_momentum_breakout(self, row, prev_row, symbol=""):
+        """
+        Strategy A: Momentum Breakout (see strategies.BUILTIN_STRATEGIES)
+        """
+        return get_registry().get("momentum_breakout").matches(row, prev_row)
+
+    def check_trend_continuation(self, row, prev_row, symbol=""):
+        """
+        Strategy B: Trend Continuation (see strategies.BUILTIN_STRATEGIES)
+        """
+        return get_registry().get("trend_continuation").matches(row, prev_row)
+
+    def check_momentum_volatility(self, row, symbol=""):
+        """
+        Strategy C: Momentum / Volatility (see strategies.BUILTIN_STRATEGIES)
+        """
+        return get_registry().get("momentum_volatility").matches(row)
+
+    def analyze_stock_result(self, stock):
+        """
+        Analyzes the stock to determine holding period, risk, and priority.
+        """
+        holding_days = 1
+        risk = "Medium"
+        reason = ""
+        priority = 0.0
+        
+        strategies = stock.get("strategies", [])
+        volume_change = stock.get("volumeChange", 0)
+        rsi = stock.get("rsi", 50)
+        score = stock.get("score", 0)
+
+        # --- Estimated Holding Period ---
+        if "Momentum Breakout" in strategies:
+            if volume_change >= 20 and 50 <= rsi <= 70:
+                holding_days = 2
+                reason = "Momentum Breakout + strong volume + healthy RSI"
+                priority += 50
+            elif volume_change < 20:
+                holding_days = 1
+                reason = "Momentum Breakout but low volume"
+                priority += 20
+            else:
+                holding_days = 1
+                reason = "Momentum Breakout"
+                priority += 10
+        elif "Trend Continuation" in strategies:
+            if volume_change > 0 and rsi <= 70:
+                holding_days = 2
+                reason = "Trend continues with positive volume"
+                priority += 30
+            elif rsi > 70:
+                holding_days = 1
+                reason = "Trend continues but RSI high"
+                priority += 10
+            else:
+                holding_days = 1
+                reason = "Trend continues"
+                priority += 10
+        elif "Momentum Volatility" in strategies:
+             holding_days = 1
+             reason = "High volatility play"
+             priority += 15
+
+        # --- Risk Level ---
+        if volume_change < 0 and rsi > 70:
+            risk = "High"
+            reason += " | Negative volume & high RSI"
+            priority -= 20
+        elif volume_change < 0:
+            risk = "Medium"
+            reason += " | Negative volume"
+            priority -= 10
+        elif 50 <= rsi <= 70:
+            risk = "Low"
+        elif rsi > 70:
+            risk = "Medium"
+
+        # --- Add Score Influence ---
+        priority += score
+        
+        stock["estimated_holding_period_days"] = holding_days
+        stock["risk_level"] = risk
+        stock["reason"] = reason
+        stock["priority_score"] = int(priority)
+        
+        return stock
+
+    def filter_stocks(self, progress: ScanProgress = None) -> list:
+        """
+        Swing scan of every BIST symbol. `progress` receives the fetch and indicator
+        phases per symbol (and provisional results); cancelling it raises ScanCancelled.
+        """
+        progress = progress if progress is not None else ScanProgress()
+        tickers = self.provider.get_all_bist_tickers()
+        started = time.perf_counter()
+
+        # Picks up a newly published panel version without a restart
+        use_panel = self.panel is not None and self.panel.refresh()
+        if self.panel is not None and not use_panel:
+            logger.warning(f"Price panel {self.panel.path} missing or stale, fetching live data")
+        self._panel_sources = 0
+        # Swapped in once the scan is complete, so position sizing never sees a half-filled dict
+        last_features = {}
+        # Local to the scan: a swing and a long-term scan may run at the same time
+        history = PriceHistory()
+        if self.ohlcv_cache is not None:
+            self.ohlcv_cache.reset_stats()
+
+        with track_peak_memory() if self.track_memory else nullcontext({}) as mem:
+            # Live data for every symbol the panel does not cover
+            fetched = {}
+            progress.start("fetch", len(tickers))
+            for symbol in tickers:
+                if not (use_panel and symbol in self.panel):
+                    fetched[symbol] = self._fetch_swing_frame(symbol)
+                progress.advance()
+            frames = {symbol: raw for symbol, (raw, _) in fetched.items()}
+            # One vectorized data-quality pass before any indicator is computed (see quality.py)
+            self.last_quality = {}
+            if config.VALIDATE:
+                frames, self.last_quality = validate_frames(frames)
+
+            candidates = {}
+            progress.start("indicators", len(tickers))
+            for symbol in tickers:
+                if symbol in fetched:
+                    rows = self._scan_swing_symbol(symbol, self._swing_features, frames[symbol],
+                                                   fetched[symbol][1], history)
+                else:
+                    rows = self._scan_swing_symbol(symbol, self._panel_features, history)
+                if rows:
+                    candidates[symbol] = rows
+                    last_features[symbol] = rows[0]
+                progress.advance()
+                if progress.due():
+                    progress.publish(self.evaluate_universe(candidates))
+            # Every strategy is evaluated once over the whole universe
+            passed_stocks = self.evaluate_universe(candidates)
+            self.apply_relative_strength(passed_stocks, "priority_score", history)
+
+        issues = {symbol.replace(".IS", ""): found for symbol, found in self.last_quality.get("issues", {}).items()}
+        for stock in passed_stocks:
+            if stock["code"] in issues:
+                stock["data_issues"] = issues[stock["code"]]
+        self.swing_history = history
+        self.last_features = last_features
+        quality = {key: self.last_quality[key] for key in ("repaired", "flagged", "duration_ms") if key in self.last_quality}
+        self._record_scan_stats("swing", len(tickers), started, mem, data_quality=quality,
+                                **(self.ohlcv_cache.stats if self.ohlcv_cache is not None else {}))
+
+        # Sort by priority_score descending
+        passed_stocks.sort(key=lambda x: x.get('priority_score', 0), reverse=True)
+        return passed_stocks
+
+    def _scan_swing_symbol(self, symbol: str, load, *args):
+        """
+        Loads one symbol's last two feature rows with load(symbol, *args). Returns (last, prev) or None.
+        """
+        try:
+            features = load(symbol, *args)
+            if not features:
+                return None
+
+            return features[-1], features[-2]
+
+        except Exception as e:
+            logger.error(f"Error processing {symbol}: {e}")
+            return None
+
+    def _panel_features(self, symbol: str, history: PriceHistory):
+        """
+        Returns [prev, last] feature rows from the shared panel, or [] if too short.
+        """
+        history.add(symbol, self.panel.column(symbol, 'Close'), self.panel.column(symbol, 'Volume'))
+        self._panel_sources += 1
+        return self.panel.last_rows(symbol) if self.panel.length(symbol) >= 50 else []
+
+    def _fetch_swing_frame(self, symbol: str):
+        """
+        Returns (ohlcv, changed) from the OHLCV cache or a full live fetch.
+        """
+        try:
+            if self.ohlcv_cache is not None:
+                return self.ohlcv_cache.get(self.provider, symbol)
+            return self.provider.fetch_daily_ohlcv(symbol, period=config.SWING_PERIOD), True
+        except Exception as e:
+            logger.error(f"Error fetching {symbol}: {e}")
+            return pd.DataFrame(), True
+
+    def _swing_features(self, symbol: str, raw, changed: bool = True, history: PriceHistory = None):
+        """
+        Applies the indicators to a validated frame and returns [prev, last] feature rows, or [] if unusable.
+        The closes and volumes go into the scan's `history`.
+        """
+        buf = None
+        try:
+            if not raw.empty and history is not None:
+                history.add(symbol, raw['Close'].to_numpy(), raw['Volume'].to_numpy())
+            cached = self.ohlcv_cache.features(symbol) if self.ohlcv_cache is not None else None
+            if not changed and cached is not None:
+                # Same bars as the last scan: the indicators are not recomputed
+                return cached
+
+            df, buf = self.compact_frame(raw)
+            df = self.apply_indicators(df)
+            
+            if df.empty or len(df) < 50:
+                features = []
+            else:
+                # Only the last two rows are ever read, so the frame is dropped right here
+                last, prev = self.extract_features(df)
+                features = [prev, last]
+            if self.ohlcv_cache is not None:
+                self.ohlcv_cache.set_features(symbol, features)
+            return features
+        finally:
+            self.release_frame(buf)
+
+    def evaluate_swing(self, symbol: str, last, prev):
+        """
+        Applies the swing strategies to the last two feature rows.
+        Returns the analyzed stock dict or None when nothing matched.
+        """
+        results = self.evaluate_universe({symbol: (last, prev)})
+        return results[0] if results else None
+
+    def evaluate_universe(self, candidates: dict) -> list:
+        """
+        Evaluates every registered strategy on {symbol: (last, prev)} in one
+        vectorized pass and returns the analyzed stocks that matched any.
+        """
+        if not candidates:
+            return []
+        symbols = list(candidates)
+        features = FeatureMatrix([candidates[s][0] for s in symbols], [candidates[s][1] for s in symbols])
+        # One memo across all strategies, so shared subexpressions are computed once
+        memo = {}
+        strategies, masks = [], []
+        for strategy in get_registry():
+            # A strategy that fails to evaluate is skipped rather than failing the scan
+            try:
+                mask = strategy.mask(features, memo)
+                if mask.shape != (features.size,):
+                    raise ValueError(f"mask has shape {mask.shape}, expected ({features.size},)")
+            except Exception as e:
+                logger.error(f"Strategy {strategy.key} failed: {e}")
+                continue
+            strategies.append(strategy)
+            masks.append(mask)
+        if not strategies:
+            return []
+        matched = np.column_stack(masks)
+        scores = np.array([s.score for s in strategies], dtype=np.float64)
+        # Basic scoring for sorting
+        raw_scores = matched @ scores
+
+        results = []
+        for i in np.flatnonzero(matched.any(axis=1)):
+            last = candidates[symbols[i]][0]
+            raw_score = float(raw_scores[i])
+            stock_data = {
+                "code": symbols[i].replace(".IS", ""),
+                "price": round(last['Close'], 2),
+                "volumeChange": round(((last['Volume'] / last['Vol_MA_20']) - 1) * 100, 1) if last['Vol_MA_20'] else 0,
+                "rsi": round(last['RSI_14'], 2),
+                "score": int(raw_score) if raw_score.is_integer() else raw_score,
+                "strategies": [s.name for s, hit in zip(strategies, matched[i]) if hit]
+            }
+            # Apply detailed analysis
+            results.append(self.analyze_stock_result(stock_data))
+        return results
+
+    def return_correlation(self) -> ReturnCorrelation:
+        """
+        Return correlation over the latest swing scan's universe, keyed by stock code.
+        Updated incrementally from the previous call's window.
+        """
+        symbols, close, _ = self.swing_history.arrays()
+        return self.correlation.update([s.replace(".IS", "") for s in symbols], close)
+
+    def apply_relative_strength(self, stocks: list, score_key: str, history: PriceHistory):
+        """
+        Ranks every symbol in the scan's `history` against that universe and adds each
+        stock's rs_rank (0-100); stocks[score_key] moves by RS_WEIGHT points per
+        percentile above or below the median.
+        """
+        self.last_ranks = rank_universe(history)
+        by_code = {symbol.replace(".IS", ""): ranks for symbol, ranks in self.last_ranks.items()}
+        for stock in stocks:
+            rs_rank = by_code.get(stock["code"], {}).get("rs_rank")
+            stock["rs_rank"] = rs_rank
+            if rs_rank is None:
+                continue
+            score = stock[score_key] + (rs_rank - 50) * config.RS_WEIGHT
+            # priority_score stays an integer; the long-term score is a float
+            stock[score_key] = int(round(score)) if isinstance(stock[score_key], int) else score
+            if "reason" in stock and rs_rank >= 80:
+                stock["reason"] += " | Strong relative strength"
+            elif "reason" in stock and rs_rank <= 20:
+                stock["reason"] += " | Weak relative strength"
+
+    def check_long_term_momentum(self, row, df400, symbol=""):
+        """
+        Strategy 1: Multi-Period Momentum & Trend Filter (3mo-1yr)
+        """
+        try:
+            # Price > 200MA (Trend)
+            if row['Close'] <= row['EMA_200']:
+                return False
+
+            # 3, 6, 9, 12 Month Returns check
+            # Approx: 3m=60 candles, 6m=120, 9m=180, 12m=250
+            if len(df400) < 252:
+                return False
+                 
+            price_3m_ago = df400.iloc[-63]['Close'] # ~3 mo
+            price_6m_ago = df400.iloc[-126]['Close'] # ~6 mo
+            price_12m_ago = df400.iloc[-252]['Close'] # ~1 yr
+             
+            ret_3m = (row['Close'] / price_3m_ago) - 1
+            ret_6m = (row['Close'] / price_6m_ago) - 1
+            ret_12m = (row['Close'] / price_12m_ago) - 1
+             
+            if ret_3m <= 0 or ret_6m <= 0 or ret_12m <= 0:
+                return False
+                 
+            # MACD Bullish
+            macd_line = row['MACD_12_26_9']
+            signal_line = row['MACDs_12_26_9']
+            if macd_line <= signal_line: # Basic bullish trend check
+                return False
+
+            return True
+        except Exception as e:
+            # logger.error(f"Error checking LT Momentum for {symbol}: {e}")
+            return False
+
+    def check_fundamental_strength(self, fundamentals):
+        """
+        Strategy 2: Fundamental Strength (P/E, EPS, Debt)
+        """
+        try:
+            pe = fundamentals.get('pe_ratio', 0)
+            debt_eq = fundamentals.get('debt_to_equity', 0)
+            eps_growth = fundamentals.get('revenue_growth', 0) # Using rev growth as proxy if eps growth missing
+            
+            # P/E Moderate (0 < PE < 35)
+            if not (0 < pe < 35):
+                return False
+                
+            # Low Debt/Equity (< 100 or 1.0 depending on data source, yfinance typically returns % or decimal? usually decimal in info but strict check needed)
+            # Assuming yfinance returns ratio (e.g. 0.5 for 50%). Safe limit < 1.5
+            # Actually yfinance often returns it as percentage (e.g. 50.4) or ratio.
+            # Let's assume < 150 (if %), or < 1.5
+            if debt_eq > 150: 
+                return False
+            
+            # Positive Growth
+            if eps_growth <= 0:
+                pass # Relaxing this as data might be missing
+
+            return True
+        except:
+            return False
+            
+    def scan_long_term(self, progress: ScanProgress = None):
+        """
+        Scans for long-term investment opportunities (3m - 2y).
+        Technical filters run first for every symbol, then the survivors are compared
+        with XU100 and their sector index in one vectorized pass, and only those that
+        beat their benchmarks get the slow fundamentals fetch. `progress` receives the
+        technical and fundamentals phases; cancelling it raises ScanCancelled.
+        """
+        progress = progress if progress is not None else ScanProgress()
+        tickers = self.provider.get_all_bist_tickers()
+        passed_stocks = []
+        started = time.perf_counter()
+        history = PriceHistory()
+
+        with track_peak_memory() if self.track_memory else nullcontext({}) as mem:
+            candidates = []
+            progress.start("technical", len(tickers))
+            for symbol in tickers:
+                candidate = self._long_term_candidate(symbol, history)
+                if candidate:
+                    candidates.append(candidate)
+                progress.advance()
+
+            # Index series are fetched once per scan (see relative.py)
+            excess = {}
+            if candidates and config.RELATIVE_FILTER:
+                benchmarks = relative.fetch_benchmarks(self.provider, [c["symbol"] for c in candidates])
+                excess = relative.relative_metrics({c["symbol"]: c["close"] for c in candidates}, benchmarks)
+                candidates = [c for c in candidates if relative.beats_benchmarks(excess[c["symbol"]], config.MIN_EXCESS_RETURN)]
+
+            progress.start("fundamentals", len(candidates))
+            for candidate in candidates:
+                stock = self._finish_long_term(candidate, excess.get(candidate["symbol"], {}))
+                if stock:
+                    passed_stocks.append(stock)
+                progress.advance()
+                if progress.due():
+                    progress.publish([dict(stock) for stock in passed_stocks])
+            self.apply_relative_strength(passed_stocks, "score", history)
+        self._record_scan_stats("longterm", len(tickers), started, mem, fundamentals_fetched=len(candidates))
+
+        passed_stocks.sort(key=lambda x: x['score'], reverse=True)
+        return passed_stocks
+
+    def _long_term_candidate(self, symbol: str, history: PriceHistory):
+        """
+        Fetches 2y of data and applies the technical filter to one symbol, adding its
+        closes to the scan's `history`. Returns the candidate (closes and display returns) or None.
+        """
+        buf = None
+        try:
+            # Need ~1 year of data minimum, fetching 2y to be safe
+            df, buf = self.compact_frame(self.provider.fetch_daily_ohlcv(symbol, period="2y"))
+            if not df.empty:
+                history.add(symbol, df['Close'].to_numpy(), df['Volume'].to_numpy())
+
+            if df.empty or len(df) < 260:
+                return None
+
+            # Calculate indicators (Need EMA 200)
+            df['EMA_50'] = ta.ema(df['Close'], length=50)
+            df['EMA_200'] = ta.ema(df['Close'], length=200)
+
+            # MACD
+            macd = ta.macd(df['Close'], fast=12, slow=26, signal=9)
+            if macd is not None:
+                df = pd.concat([df, macd], axis=1)
+
+            last = df.iloc[-1]
+
+            # --- Step 1: Technical Filter (Fast) ---
+            if not self.check_long_term_momentum(last, df, symbol):
+                return None
+
+            # Calculate returns for display (float() keeps float32 values JSON-serializable)
+            price_3m = df.iloc[-63]['Close']
+            price_1y = df.iloc[-252]['Close']
+            return {
+                "symbol": symbol,
+                "price": float(last['Close']),
+                "return_3m": float(((last['Close'] / price_3m) - 1) * 100),
+                "return_1y": float(((last['Close'] / price_1y) - 1) * 100),
+                # Date-indexed closes for the benchmark comparison (copied out of the pooled buffer)
+                "close": df['Close'].astype(np.float64),
+            }
+
+        except Exception as e:
+            logger.error(f"Error scanning LT for {symbol}: {e}")
+            return None
+        finally:
+            self.release_frame(buf)
+
+    def _finish_long_term(self, candidate: dict, excess: dict):
+        """
+        Fetches fundamentals for a candidate that passed the technical and relative
+        filters and builds the result dict.
+        """
+        symbol = candidate["symbol"]
+        try:
+            fundamentals = self.provider.fetch_fundamentals(symbol)
+
+            # --- Step 2: Fundamental Filter ---
+            is_fundamental = self.check_fundamental_strength(fundamentals)
+
+            matched_strategies = ["LT Momentum"]
+            if is_fundamental: matched_strategies.append("Fundamental Strength")
+
+            ret_3m = candidate["return_3m"]
+            return {
+                "code": symbol.replace(".IS", ""),
+                "price": round(candidate["price"], 2),
+                "return_3m": round(ret_3m, 1),
+                "return_1y": round(candidate["return_1y"], 1),
+                # Excess returns vs XU100 / sector index in percent, beta vs XU100 (None without benchmark data)
+                "excess_3m": round(excess["excess_3m"] * 100, 1) if excess.get("excess_3m") is not None else None,
+                "sector_excess_3m": round(excess["sector_excess_3m"] * 100, 1) if excess.get("sector_excess_3m") is not None else None,
+                "beta": round(excess["beta"], 2) if excess.get("beta") is not None else None,
+                "pe_ratio": round(fundamentals.get('pe_ratio', 0) if fundamentals.get('pe_ratio') else 0, 2),
+                "debt_to_equity": round(fundamentals.get('debt_to_equity', 0) if fundamentals.get('debt_to_equity') else 0, 2),
+                "strategies": matched_strategies,
+                "score": 10 + (ret_3m * 0.5) # simple scoring
+            }
+
+        except Exception as e:
+            logger.error(f"Error scanning LT for {symbol}: {e}")
+            return None
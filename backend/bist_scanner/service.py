@@ -0,0 +1,190 @@
+"""
+Scan service shared by every entry point (uvicorn/Vercel API, functions).
+
+Owns the lazily created scanner, the in-memory scan cache, the snapshot store
+and the profiler, so all deployment targets answer from the same engine.
+"""
+import time
+import logging
+import threading
+from . import config
+from .scanner import StockScanner
+from .scan_index import ScanCache
+from .scan_diff import ScanDiffs
+from .history import HistoryWriter
+from .jobs import JobManager, QueueFull
+from .webhooks import WebhookDispatcher, WebhookRegistry, signals
+from .profiling import ScanProfiler
+from .snapshot import SnapshotStore
+from .warmup import warmup
+
+logger = logging.getLogger(__name__)
+
+
+class ScanService:
+    def __init__(self, scanner: StockScanner = None, snapshot_path: str = None):
+        # The scanner (and the HTTP session it owns) is created on first use
+        self._scanner = scanner
+        self._scanner_lock = threading.Lock()
+        # Scan results are indexed in memory and reused for SCAN_CACHE_TTL seconds
+        self.cache = ScanCache(max_age=config.SCAN_CACHE_TTL)
+        # Versioned summaries of the served results for /scan/diff
+        self.diffs = ScanDiffs()
+        # Scan results are persisted off the request path
+        self.history = HistoryWriter()
+        # Webhook subscribers get the new/changed swing signals of every new version
+        self.webhooks = WebhookDispatcher(WebhookRegistry(config.WEBHOOKS_PATH))
+        self.diffs.listeners.append(self._push_signals)
+        self._scheduler = None
+        self._scheduler_stop = threading.Event()
+        # POST /scans jobs: bounded queue, SCANNER_JOB_WORKERS scans at a time
+        self.jobs = JobManager(self._run_job)
+        # (scanner.last_features, the same keyed by stock code)
+        self._features = (None, {})
+        # Serverless snapshot mode: serve a prebuilt artifact instead of scanning
+        if snapshot_path is None and config.SNAPSHOT_ENABLED:
+            snapshot_path = config.SNAPSHOT_PATH
+        self.snapshot = SnapshotStore(snapshot_path) if snapshot_path else None
+        self.profiler = ScanProfiler.from_config()
+        self.warmup_report = {}
+
+    @property
+    def scanner(self) -> StockScanner:
+        if self._scanner is None:
+            with self._scanner_lock:
+                if self._scanner is None:
+                    self._scanner = StockScanner()
+        return self._scanner
+
+    def index(self, scan_type: str = "swing", refresh: bool = False, profile: bool = False,
+              timeout: float = None):
+        """
+        Returns (index, job) for the swing scan (the cached one; long-term scans run
+        through long_term()). The cached index is served while it is fresh; otherwise,
+        or with refresh/profile, the scan runs as a job on self.jobs and `job` is that
+        finished job (None when nothing was scanned). In snapshot mode nothing is scanned.
+        Raises QueueFull, JobPending if the job is not done within `timeout` seconds
+        (None waits indefinitely) and RuntimeError if it failed.
+        """
+        if self.snapshot is not None:
+            index = self.snapshot.index(scan_type)
+            # A no-op unless the snapshot was reloaded
+            self.diffs.record(scan_type, index.results)
+            return index, None
+        if not (refresh or profile):
+            index = self.cache.peek(scan_type)
+            if index is not None:
+                return index, None
+        # Requests that only need a current index share a running scan
+        job = self.jobs.submit(scan_type, profile=profile, join=not (refresh or profile))
+        job.result(timeout)
+        return self.cache.peek(scan_type, fresh=False), job
+
+    def _scan(self, scan_type: str, progress=None):
+        """Runs a scan into the cache (on a job worker) and returns (index, fresh)."""
+        scan = self.scanner.filter_stocks if scan_type == "swing" else self.scanner.scan_long_term
+        index, fresh = self.cache.get(scan_type, lambda: scan(progress=progress), refresh=True)
+        # A no-op unless the index holds new results
+        self.diffs.record(scan_type, index.results)
+        return index, fresh
+
+    def _push_signals(self, scan_type: str, version: int):
+        # The first version has nothing to compare with; subscribers start from the next change
+        if scan_type != "swing" or version < 2 or not len(self.webhooks.registry):
+            return
+        items = signals(self.diffs.diff(scan_type, version - 1), self.diffs.latest(scan_type))
+        if items:
+            self.webhooks.dispatch(scan_type, version, items)
+
+    def _run_job(self, job) -> list:
+        """Runs a ScanJob's scan with its progress and saves the results to history."""
+        if self.snapshot is not None:
+            # Nothing is scanned in snapshot mode; the job serves the prebuilt results
+            return self.snapshot.index(job.scan_type).results
+        if job.scan_type == "swing":
+            (index, fresh), job.profile_id = self.profiler.run(
+                "swing", lambda: self._scan("swing", progress=job.progress), job.profile)
+            if fresh:
+                self.history.submit(index.results, "swing_all")
+            return index.results
+        results, job.profile_id = self.profiler.run(
+            "longterm", lambda: self.scanner.scan_long_term(progress=job.progress), job.profile)
+        self.diffs.record("longterm", results)
+        self.history.submit(results, "longterm")
+        return results
+
+    def scheduled_scan(self):
+        """Rescans swing as a job (recording its diff, pushing webhooks and saving it to history)."""
+        try:
+            index, _ = self.index("swing", refresh=True)
+        except QueueFull:
+            logger.warning("Scheduled scan skipped: the scan queue is full")
+            return None
+        return index
+
+    def start_scheduler(self, interval: float = None) -> bool:
+        """
+        Rescans swing every `interval` seconds (default SCANNER_SCAN_INTERVAL) in a
+        daemon thread. With an interval below SCAN_CACHE_TTL, /scan polls never scan.
+        """
+        interval = config.SCAN_INTERVAL if interval is None else interval
+        if interval <= 0 or self.snapshot is not None or self._scheduler is not None:
+            return False
+
+        def loop():
+            while not self._scheduler_stop.is_set():
+                try:
+                    self.scheduled_scan()
+                except Exception as e:
+                    logger.error(f"Scheduled scan failed: {e}")
+                self._scheduler_stop.wait(interval)
+
+        self._scheduler_stop.clear()
+        self._scheduler = threading.Thread(target=loop, name="scan-scheduler", daemon=True)
+        self._scheduler.start()
+        return True
+
+    def stop_scheduler(self):
+        self._scheduler_stop.set()
+        self._scheduler = None
+
+    def features(self) -> dict:
+        """
+        Last-row features of the swing scan being served (snapshot or live), keyed by
+        stock code without the .IS suffix, as in the scan results and the snapshot.
+        """
+        if self.snapshot is not None:
+            self.snapshot.index("swing")
+            return self.snapshot.features
+        last_features = self.scanner.last_features
+        # The scanner swaps in a new dict per scan, so one conversion serves until the next
+        if self._features[0] is not last_features:
+            self._features = (last_features, {s.replace(".IS", ""): row for s, row in last_features.items()})
+        return self._features[1]
+
+    def long_term(self, profile: bool = False, timeout: float = None):
+        """
+        Returns (results, profile_id). Outside snapshot mode the scan runs as a job
+        (joining a running one unless profiled); raises like index().
+        """
+        if self.snapshot is not None:
+            results = self.snapshot.index("longterm").results
+            self.diffs.record("longterm", results)
+            return results, None
+        job = self.jobs.submit("longterm", profile=profile, join=not profile)
+        return job.result(timeout), job.profile_id
+
+    def warmup(self, scan: bool = False) -> dict:
+        """Preloads imports, indicator kernels, the panel and optionally the scan cache."""
+        try:
+            if self.snapshot is not None:
+                started = time.perf_counter()
+                self.snapshot.index("swing")
+                report = {"snapshot_s": round(time.perf_counter() - started, 3)}
+            else:
+                report = warmup(self.scanner, run_scan=(lambda: self.index("swing")) if scan else None)
+            self.warmup_report.update(report)
+            return report
+        except Exception as e:
+            logger.error(f"Warmup failed: {e}")
+            return {"error": str(e)}
@@ -0,0 +1,53 @@
+"""
+ATR-based position sizing for a ranked signal list.
+
+Each stock gets a stop `atr_multiple` ATRs below its price and as many shares as
+keep the loss at the stop within `risk_per_trade` of equity. Positions are
+capped at `max_position` of equity, and once the cumulative risk ("portfolio
+heat") of the ranking would exceed `max_heat` the remaining stocks get zero
+shares. risk_per_trade, max_position, max_heat and portfolio_heat are all
+fractions of equity (0.06 = 6%). Everything is computed on arrays for the
+whole list at once.
+"""
+import numpy as np
+
+
+def size_positions(stocks: list, atr, equity: float, risk_per_trade: float = 0.01, atr_multiple: float = 2.0,
+                   max_position: float = 1.0, max_heat: float = None) -> list:
+    """
+    Returns copies of the ranked stocks with stop_loss, shares, position_value,
+    risk_amount and portfolio_heat (cumulative risk as a fraction of equity) added.
+    `atr` holds each stock's ATR_14 in the same order; NaN/missing yields zero shares.
+    """
+    if not stocks:
+        return []
+    price = np.array([float(s["price"]) for s in stocks])
+    atr = np.array([np.nan if a is None else a for a in atr], dtype=np.float64)
+
+    stop = price - atr_multiple * atr
+    risk_per_share = price - stop
+    valid = (risk_per_share > 0) & (stop > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shares = np.where(valid, np.floor(equity * risk_per_trade / risk_per_share), 0.0)
+        shares = np.minimum(shares, np.where(valid, np.floor(equity * max_position / price), 0.0))
+    risk = shares * np.where(valid, risk_per_share, 0.0)
+
+    if max_heat is not None:
+        # Rank order decides who gets capital; the first stock past the heat budget and all later ones are dropped
+        over_budget = np.cumsum(risk) > equity * max_heat + 1e-9
+        cutoff = np.argmax(over_budget) if over_budget.any() else len(stocks)
+        shares[cutoff:] = 0.0
+        risk[cutoff:] = 0.0
+    heat = np.cumsum(risk) / equity
+
+    sized = []
+    for i, stock in enumerate(stocks):
+        sized.append(dict(
+            stock,
+            stop_loss=round(float(stop[i]), 2) if valid[i] else None,
+            shares=int(shares[i]),
+            position_value=round(float(shares[i] * price[i]), 2),
+            risk_amount=round(float(risk[i]), 2),
+            portfolio_heat=round(float(heat[i]), 4),
+        ))
+    return sized
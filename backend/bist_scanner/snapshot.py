@@ -0,0 +1,123 @@
+"""
+Pre-built scan snapshot for serverless deployments.
+
+An offline job runs the full scans once and writes a gzip-compressed JSON
+artifact holding the results plus each symbol's last-row features. The API
+then only loads the artifact and filters it from memory (see service.py,
+SCANNER_SNAPSHOT), so a request never fetches data or computes indicators.
+
+Build from backend/:
+    python -m bist_scanner.snapshot build [--out snapshot/scan_snapshot.json.gz] [--skip-long-term]
+"""
+import os
+import gzip
+import json
+import math
+import logging
+import argparse
+import threading
+from datetime import datetime
+from . import config
+from .scan_index import ScanIndex
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+
+def _clean(value):
+    # NaN/inf are not valid JSON
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def build_snapshot(scanner, path: str = None, long_term: bool = True) -> dict:
+    """
+    Runs the scans and writes the snapshot artifact atomically. Returns its metadata.
+    """
+    path = path or config.SNAPSHOT_PATH
+    swing = scanner.filter_stocks()
+    features = {
+        symbol.replace(".IS", ""): {col: _clean(val) for col, val in row.items()}
+        for symbol, row in scanner.last_features.items()
+    }
+    longterm = scanner.scan_long_term() if long_term else None
+
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "created": datetime.now().isoformat(),
+        "scans": {"swing": swing},
+        "features": features,
+    }
+    if longterm is not None:
+        snapshot["scans"]["longterm"] = longterm
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=9) as f:
+        json.dump(snapshot, f, separators=(",", ":"), ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+    meta = {"path": path, "created": snapshot["created"], "size": os.path.getsize(path),
+            "counts": {name: len(results) for name, results in snapshot["scans"].items()}}
+    logger.info(f"Wrote scan snapshot: {meta}")
+    return meta
+
+
+class SnapshotStore:
+    """
+    Loads the snapshot artifact once and serves a ScanIndex per scan type.
+    Reloads only when the file on disk changes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.meta = {}
+        self.features = {}
+        self._indexes = {}
+        self._stat_key = None
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        st = os.stat(self.path)
+        stat_key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if stat_key == self._stat_key:
+            return
+        with self._lock:
+            if stat_key == self._stat_key:
+                return
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            if snapshot.get("version") != SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported snapshot version {snapshot.get('version')}")
+            self._indexes = {name: ScanIndex(results) for name, results in snapshot["scans"].items()}
+            self.features = snapshot.get("features", {})
+            self.meta = {"created": snapshot["created"],
+                         "counts": {name: len(idx.results) for name, idx in self._indexes.items()}}
+            self._stat_key = stat_key
+
+    def index(self, scan_type: str) -> ScanIndex:
+        """
+        Returns the prebuilt index; raises LookupError if the snapshot has no such scan.
+        """
+        self._refresh()
+        if scan_type not in self._indexes:
+            raise LookupError(f"Snapshot has no '{scan_type}' scan")
+        return self._indexes[scan_type]
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Build the serverless scan snapshot")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--out", default=config.SNAPSHOT_PATH)
+    parser.add_argument("--skip-long-term", action="store_true")
+    args = parser.parse_args()
+
+    from .scanner import StockScanner
+    build_snapshot(StockScanner(), args.out, long_term=not args.skip_long_term)
+
+
+if __name__ == "__main__":
+    main()
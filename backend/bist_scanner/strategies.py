@@ -0,0 +1,331 @@
+"""
+Declarative strategies: screens written as expressions over the scan features,
+compiled once into NumPy mask functions over the whole universe.
+
+Expression language (a safe subset of Python expression syntax):
+    Close > EMA_20 and 50 <= RSI_14 <= 70 and Volume >= 1.0 * Vol_MA_20
+    Close > prev.High                      # prev.<column> is the previous bar
+    not (ATR_14 / Close < 0.005) or abs(MACDh_12_26_9) > 1
+
+Names are feature columns (see FEATURE_COLUMNS); operators are and/or/not,
+comparisons (chained), + - * / and abs/min/max. The whole expression must be a
+comparison or an and/or/not of them. A comparison involving NaN is False. Every distinct subexpression is evaluated once per scan, even when it
+appears in several strategies.
+
+User-defined strategies are registered through the /strategies API and kept in
+config.STRATEGIES_PATH (JSON; YAML is also read if PyYAML is installed).
+"""
+import os
+import ast
+import json
+import logging
+import re
+import threading
+import numpy as np
+from . import config
+from .timeframes import available_columns
+
+logger = logging.getLogger(__name__)
+
+# Columns produced by StockScanner.apply_indicators, available as names in expressions.
+# Weekly/monthly ones only where SCANNER_SWING_PERIOD holds enough bars for a value.
+FEATURE_COLUMNS = [
+    "Open", "High", "Low", "Close", "Volume",
+    "EMA_10", "EMA_20", "EMA_50",
+    "MACD_12_26_9", "MACDh_12_26_9", "MACDs_12_26_9",
+    "RSI_14", "ATR_14", "ADX_14", "ADXR_14_2", "DMP_14", "DMN_14",
+    "STOCHk_14_3_3", "STOCHd_14_3_3", "STOCHh_14_3_3",
+    "BBL_20_2.0", "BBM_20_2.0", "BBU_20_2.0", "BBB_20_2.0", "BBP_20_2.0",
+    "Vol_MA_20", "High_10",
+] + available_columns(config.SWING_PERIOD)
+
+# The swing strategies; key -> (name, expression, score)
+BUILTIN_STRATEGIES = {
+    "momentum_breakout": (
+        "Momentum Breakout",
+        "Close > prev.High and Volume >= 1.0 * Vol_MA_20 and 50 <= RSI_14 <= 70 and Close > EMA_20",
+        10,
+    ),
+    "trend_continuation": (
+        "Trend Continuation",
+        "Close > EMA_20 and Close > EMA_50 and MACD_12_26_9 > MACDs_12_26_9 and ADX_14 > 20",
+        8,
+    ),
+    "momentum_volatility": (
+        "Momentum Volatility",
+        "STOCHk_14_3_3 > STOCHd_14_3_3 and ATR_14 / Close >= 0.005 and BBP_20_2.0 >= 0.60",
+        9,
+    ),
+}
+
+KEY_PATTERN = re.compile(r"^[a-z][a-z0-9_]{0,47}$")
+MAX_EXPRESSION_LENGTH = 1000
+
+_COMPARE = {
+    ast.Gt: np.greater, ast.GtE: np.greater_equal, ast.Lt: np.less,
+    ast.LtE: np.less_equal, ast.Eq: np.equal, ast.NotEq: np.not_equal,
+}
+_ARITHMETIC = {ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply, ast.Div: np.divide}
+_FUNCTIONS = {"abs": (np.abs, 1), "min": (np.minimum, 2), "max": (np.maximum, 2)}
+
+
+class FeatureMatrix:
+    """
+    Column arrays over the universe: one value per symbol for the last and previous bar.
+    """
+    def __init__(self, lasts: list, prevs: list = None):
+        self.size = len(lasts)
+        self._rows = {"": lasts, "prev.": prevs or [{}] * len(lasts)}
+        self._columns = {}
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in self._columns:
+            prefix = "prev." if name.startswith("prev.") else ""
+            field = name[len(prefix):]
+            self._columns[name] = np.array([row.get(field, np.nan) for row in self._rows[prefix]], dtype=np.float64)
+        return self._columns[name]
+
+
+class _Compiler:
+    """
+    Turns an expression AST into nested closures. Each node is keyed by its
+    normalized source so identical subexpressions share one cached result.
+    """
+    def __init__(self, columns):
+        self.columns = set(columns)
+
+    def compile(self, node):
+        key = ast.dump(node)
+        fn = self._node(node)
+
+        def cached(features, memo):
+            if key not in memo:
+                memo[key] = fn(features, memo)
+            return memo[key]
+        return cached
+
+    def _node(self, node):
+        if isinstance(node, ast.Expression):
+            return self.compile(node.body)
+        if isinstance(node, ast.BoolOp):
+            parts = [self.compile(v) for v in node.values]
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            def boolop(f, m):
+                result = parts[0](f, m).astype(bool)
+                for part in parts[1:]:
+                    result = combine(result, part(f, m))
+                return result
+            return boolop
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.USub)):
+            operand = self.compile(node.operand)
+            if isinstance(node.op, ast.Not):
+                return lambda f, m: ~operand(f, m).astype(bool)
+            return lambda f, m: -operand(f, m)
+        if isinstance(node, ast.Compare):
+            terms = [self.compile(node.left)] + [self.compile(c) for c in node.comparators]
+            ops = []
+            for op in node.ops:
+                if type(op) not in _COMPARE:
+                    raise ValueError(f"Unsupported comparison '{type(op).__name__}'")
+                ops.append(_COMPARE[type(op)])
+            def compare(f, m):
+                values = [t(f, m) for t in terms]
+                result = np.ones(f.size, dtype=bool)
+                with np.errstate(invalid="ignore"):
+                    for op, a, b in zip(ops, values, values[1:]):
+                        result &= op(a, b)
+                return result
+            return compare
+        if isinstance(node, ast.BinOp):
+            if type(node.op) not in _ARITHMETIC:
+                raise ValueError(f"Unsupported operator '{type(node.op).__name__}'")
+            left, right, op = self.compile(node.left), self.compile(node.right), _ARITHMETIC[type(node.op)]
+            def binop(f, m):
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    return op(left(f, m), right(f, m))
+            return binop
+        if isinstance(node, ast.Call):
+            name = node.func.id if isinstance(node.func, ast.Name) else None
+            if name not in _FUNCTIONS or node.keywords or len(node.args) != _FUNCTIONS[name][1]:
+                raise ValueError(f"Unsupported function call '{ast.unparse(node)}'")
+            fn, args = _FUNCTIONS[name][0], [self.compile(a) for a in node.args]
+            return lambda f, m: fn(*(a(f, m) for a in args))
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            value = float(node.value)
+            # Broadcast to one value per symbol, so constants combine like columns
+            return lambda f, m: np.full(f.size, value)
+        if isinstance(node, ast.Name):
+            return self._column(node.id)
+        if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "prev":
+            return self._column(node.attr, prev=True)
+        raise ValueError(f"Unsupported syntax '{ast.unparse(node)}'")
+
+    def _column(self, name: str, prev: bool = False):
+        if name not in self.columns:
+            raise ValueError(f"Unknown feature '{name}'")
+        column = f"prev.{name}" if prev else name
+        return lambda f, m: f.column(column)
+
+
+def _parse(expression: str):
+    if not isinstance(expression, str) or not expression.strip():
+        raise ValueError("Strategy expression must not be empty")
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(f"Strategy expression is longer than {MAX_EXPRESSION_LENGTH} characters")
+    # Column names such as BBP_20_2.0 are not Python identifiers; they are rewritten before parsing
+    aliases = {}
+    def alias(match):
+        aliases[match.group(0)] = f"__col{len(aliases)}"
+        return aliases[match.group(0)]
+    dotted = [c for c in FEATURE_COLUMNS if not c.isidentifier()]
+    if dotted:
+        pattern = r"(?<![\w.])(" + "|".join(re.escape(c) for c in sorted(dotted, key=len, reverse=True)) + r")(?![\w.])"
+        expression = re.sub(pattern, alias, expression)
+    try:
+        tree = ast.parse(expression, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression: {e.msg}")
+    names = {v: k for k, v in aliases.items()}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and node.id in names:
+            node.id = names[node.id]
+        elif isinstance(node, ast.Attribute) and node.attr in names:
+            node.attr = names[node.attr]
+    return tree
+
+
+def _is_condition(node) -> bool:
+    """True for a comparison, and/or, or not at the root of an expression."""
+    return isinstance(node, (ast.Compare, ast.BoolOp)) or (
+        isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not))
+
+
+class Strategy:
+    def __init__(self, key: str, name: str, expression: str, score: float = 5, builtin: bool = False,
+                 columns=FEATURE_COLUMNS):
+        if not KEY_PATTERN.match(key):
+            raise ValueError("Strategy key must be lowercase letters, digits or '_' (max 48)")
+        if not name or not str(name).strip():
+            raise ValueError("Strategy name must not be empty")
+        self.key = key
+        self.name = str(name).strip()
+        self.expression = expression
+        if isinstance(score, bool) or not isinstance(score, (int, float)):
+            raise ValueError("Strategy score must be a number")
+        self.score = score
+        self.builtin = builtin
+        tree = _parse(expression)
+        if not _is_condition(tree.body):
+            raise ValueError("Strategy expression must be a comparison or an and/or/not of comparisons")
+        self.evaluate = _Compiler(columns).compile(tree)
+
+    def mask(self, features: FeatureMatrix, memo: dict = None) -> np.ndarray:
+        return np.asarray(self.evaluate(features, {} if memo is None else memo), dtype=bool)
+
+    def matches(self, last: dict, prev: dict = None) -> bool:
+        """Evaluates the strategy on a single symbol's rows."""
+        return bool(self.mask(FeatureMatrix([last], [prev or {}]))[0])
+
+    def to_dict(self) -> dict:
+        return {"key": self.key, "name": self.name, "expression": self.expression,
+                "score": self.score, "builtin": self.builtin}
+
+
+class StrategyRegistry:
+    """
+    Built-in and user-defined strategies; user ones are persisted to `path`.
+    """
+    def __init__(self, path: str = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._strategies = {
+            key: Strategy(key, name, expression, score, builtin=True)
+            for key, (name, expression, score) in BUILTIN_STRATEGIES.items()
+        }
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def _load(self, path: str):
+        with open(path, "r", encoding="utf-8") as f:
+            if path.endswith((".yml", ".yaml")):
+                import yaml
+                definitions = yaml.safe_load(f) or []
+            else:
+                definitions = json.load(f)
+        for definition in definitions:
+            try:
+                self._add(Strategy(definition["key"], definition["name"], definition["expression"],
+                                   definition.get("score", 5)))
+            except (KeyError, ValueError) as e:
+                logger.error(f"Skipping strategy {definition.get('key')}: {e}")
+
+    def _save(self):
+        if not self.path:
+            return
+        definitions = [s.to_dict() for s in self._strategies.values() if not s.builtin]
+        for definition in definitions:
+            definition.pop("builtin")
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            if self.path.endswith((".yml", ".yaml")):
+                import yaml
+                yaml.safe_dump(definitions, f, allow_unicode=True, sort_keys=False)
+            else:
+                json.dump(definitions, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def _add(self, strategy: Strategy):
+        existing = self._strategies.get(strategy.key)
+        if existing is not None and existing.builtin:
+            raise ValueError(f"'{strategy.key}' is a built-in strategy")
+        if any(s.name == strategy.name and s.key != strategy.key for s in self._strategies.values()):
+            raise ValueError(f"Strategy name '{strategy.name}' is already used")
+        self._strategies[strategy.key] = strategy
+
+    def __iter__(self):
+        return iter(list(self._strategies.values()))
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._strategies
+
+    def get(self, key: str) -> Strategy:
+        return self._strategies.get(key)
+
+    @property
+    def keys(self) -> dict:
+        """Query key -> strategy name, as used by /scan?strategy=."""
+        return {key: s.name for key, s in self._strategies.items()}
+
+    def register(self, key: str, name: str, expression: str, score: float = 5) -> Strategy:
+        """Compiles and stores a user strategy (replacing one with the same key). Raises ValueError."""
+        strategy = Strategy(key, name, expression, score)
+        with self._lock:
+            self._add(strategy)
+            self._save()
+        return strategy
+
+    def remove(self, key: str) -> bool:
+        with self._lock:
+            strategy = self._strategies.get(key)
+            if strategy is None:
+                return False
+            if strategy.builtin:
+                raise ValueError(f"'{key}' is a built-in strategy")
+            del self._strategies[key]
+            self._save()
+        return True
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> StrategyRegistry:
+    """The process-wide registry used by the scanner and the API."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = StrategyRegistry(config.STRATEGIES_PATH)
+    return _registry
@@ -0,0 +1,149 @@
+"""
+Weekly and monthly indicators derived from the daily series already fetched for
+the swing scan, so multi-timeframe confirmation needs no extra download.
+
+Days are grouped into calendar weeks (Monday-Sunday) or months, and each
+period's bar closes at its last trading day. EMA, MACD and RSI are smoothed
+over the completed bars with the shared kernels; every day then advances that
+state by one step with its own close, i.e. the value the weekly indicator would
+have if the week ended that day. The last day of a period therefore equals the
+completed bar's value, and no day sees a later close.
+
+Arrays are (time, symbol) with a shared calendar, like kernels.py. A value is
+NaN until `length` bars (RSI: length + 1) are available. Columns that cannot get
+a value within the fetched period (e.g. everything but W_EMA_10 from the
+default 3mo, or monthly MACD, which needs 34 months) are left out; see
+available_columns().
+"""
+import re
+import numpy as np
+from .kernels import _as_2d, _ewm, _shift
+
+EMA_LENGTHS = (10, 20)
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+RSI_LENGTH = 14
+TIMEFRAMES = {"W": "W_", "M": "M_"}
+_MACD = f"_{MACD_FAST}_{MACD_SLOW}_{MACD_SIGNAL}"
+# Bars a column needs before its first value
+MIN_BARS = {
+    **{f"EMA_{length}": length for length in EMA_LENGTHS},
+    f"MACD{_MACD}": MACD_SLOW,
+    f"MACDh{_MACD}": MACD_SLOW + MACD_SIGNAL - 1,
+    f"MACDs{_MACD}": MACD_SLOW + MACD_SIGNAL - 1,
+    f"RSI_{RSI_LENGTH}": RSI_LENGTH + 1,
+}
+# Months per unit of a yfinance period string
+_PERIOD_MONTHS = {"d": 12 / 365, "wk": 12 / 52, "mo": 1, "y": 12}
+_BARS_PER_MONTH = {"W": 52 / 12, "M": 1}
+
+
+def period_months(period: str) -> float:
+    """Months of daily bars in a yfinance period such as '1y' or '6mo' ('max' is unbounded, 'ytd' counts as 0)."""
+    if period == "max":
+        return float("inf")
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period)
+    return int(match.group(1)) * _PERIOD_MONTHS[match.group(2)] if match else 0.0
+
+
+def available_columns(period: str) -> list:
+    """Prefixed W_/M_ columns that get a value within `period` of daily bars."""
+    months = period_months(period)
+    return [
+        f"{prefix}{name}" for rule, prefix in TIMEFRAMES.items() for name, bars in MIN_BARS.items()
+        if months * _BARS_PER_MONTH[rule] >= bars - 1e-9
+    ]
+
+
+def _days(dates) -> np.ndarray:
+    # Local calendar days; tz-aware timestamps would otherwise be converted to UTC first
+    if getattr(dates, "tz", None) is not None:
+        dates = dates.tz_localize(None)
+    return np.asarray(dates, dtype="datetime64[D]")
+
+
+def period_bars(dates, rule: str = "W"):
+    """
+    Returns (bar_of_day, last_day): the period number of every day (0-based) and
+    a mask of the days that close a period (the final, partial period included).
+    """
+    days = _days(dates)
+    if rule == "W":
+        # 1970-01-01 was a Thursday; shifting by 3 days starts weeks on Monday
+        periods = (days.astype(np.int64) + 3) // 7
+    elif rule == "M":
+        periods = days.astype("datetime64[M]").astype(np.int64)
+    else:
+        raise ValueError(f"Unknown timeframe '{rule}'")
+    new_period = periods[1:] != periods[:-1]
+    bar_of_day = np.concatenate(([0], np.cumsum(new_period)))
+    last_day = np.concatenate((new_period, [True]))
+    return bar_of_day, last_day
+
+
+def _ewm_bars(bars: np.ndarray, alpha: float) -> np.ndarray:
+    return _ewm(np.ascontiguousarray(bars), alpha, np.empty_like(bars))
+
+
+def _advance(bar_state: np.ndarray, bar_of_day: np.ndarray, x: np.ndarray, alpha: float) -> np.ndarray:
+    # One smoothing step from the previous completed bar's state with each day's value
+    prev = _shift(bar_state)[bar_of_day]
+    return np.where(prev == prev, alpha * x + (1 - alpha) * prev, x)
+
+
+def _min_bars(values: np.ndarray, bar_of_day: np.ndarray, bars: int) -> np.ndarray:
+    return np.where((bar_of_day >= bars - 1)[:, None], values, np.nan)
+
+
+def _ema(bar_close, bar_of_day, close, length):
+    alpha = 2.0 / (length + 1)
+    return _advance(_ewm_bars(bar_close, alpha), bar_of_day, close, alpha)
+
+
+def timeframe_indicators(dates, close, rule: str = "W") -> dict:
+    """
+    Daily-aligned EMA_10/EMA_20, MACD_12_26_9 (with MACDh/MACDs) and RSI_14 of the
+    weekly ("W") or monthly ("M") bars, keyed with a W_ or M_ prefix.
+    """
+    close = _as_2d(close)
+    prefix = TIMEFRAMES[rule]
+    bar_of_day, last_day = period_bars(dates, rule)
+    bar_close = close[last_day]
+    out = {}
+
+    for length in EMA_LENGTHS:
+        out[f"{prefix}EMA_{length}"] = _min_bars(_ema(bar_close, bar_of_day, close, length), bar_of_day, length)
+
+    # MACD of the bar closes; the signal line starts at the first complete slow EMA
+    macd = _ema(bar_close, bar_of_day, close, MACD_FAST) - _ema(bar_close, bar_of_day, close, MACD_SLOW)
+    macd = _min_bars(macd, bar_of_day, MACD_SLOW)
+    alpha = 2.0 / (MACD_SIGNAL + 1)
+    signal = _advance(_ewm_bars(macd[last_day], alpha), bar_of_day, macd, alpha)
+    signal = _min_bars(signal, bar_of_day, MACD_SLOW + MACD_SIGNAL - 1)
+    props = f"_{MACD_FAST}_{MACD_SLOW}_{MACD_SIGNAL}"
+    out[f"{prefix}MACD{props}"] = macd
+    out[f"{prefix}MACDh{props}"] = macd - signal
+    out[f"{prefix}MACDs{props}"] = signal
+
+    # Wilder RSI of the bar-to-bar changes; today's change is against the last completed bar
+    prev_bar_close = _shift(bar_close)
+    bar_change = bar_close - prev_bar_close
+    day_change = close - prev_bar_close[bar_of_day]
+    alpha = 1.0 / RSI_LENGTH
+    gains = _advance(_ewm_bars(np.where(bar_change < 0, 0.0, bar_change), alpha), bar_of_day,
+                     np.where(day_change < 0, 0.0, day_change), alpha)
+    losses = _advance(_ewm_bars(np.where(bar_change > 0, 0.0, -bar_change), alpha), bar_of_day,
+                      np.where(day_change > 0, 0.0, -day_change), alpha)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 * gains / (gains + losses)
+    out[f"{prefix}RSI_{RSI_LENGTH}"] = _min_bars(rsi, bar_of_day, RSI_LENGTH + 1)
+    return out
+
+
+def multi_timeframe_indicators(dates, close, columns=None) -> dict:
+    """Weekly and monthly indicator columns for a daily close series, only `columns` if given."""
+    out = {}
+    for rule in TIMEFRAMES:
+        out.update(timeframe_indicators(dates, close, rule))
+    if columns is not None:
+        out = {name: values for name, values in out.items() if name in columns}
+    return out
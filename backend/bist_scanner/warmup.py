@@ -0,0 +1,66 @@
+import time
+import logging
+import numpy as np
+from .lazy_imports import lazy_import
+
+logger = logging.getLogger(__name__)
+
+HEAVY_MODULES = ("pandas", "pandas_ta", "yfinance")
+
+
+def import_profile(modules=HEAVY_MODULES) -> dict:
+    """
+    Forces the lazily imported heavy modules and returns seconds spent per module.
+    Modules that were already loaded report ~0.
+    """
+    timings = {}
+    for name in modules:
+        started = time.perf_counter()
+        module = lazy_import(name)
+        getattr(module, "__name__")  # first attribute access executes a lazy module
+        timings[name] = round(time.perf_counter() - started, 3)
+    return timings
+
+
+def synthetic_frame(rows: int = 70, seed: int = 0):
+    """
+    Small random-walk OHLCV frame used to exercise the indicator code paths.
+    """
+    pd = lazy_import("pandas")
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, rows)))
+    return pd.DataFrame({
+        "Open": close,
+        "High": close * 1.01,
+        "Low": close * 0.99,
+        "Close": close,
+        "Volume": rng.integers(100_000, 1_000_000, rows).astype(float),
+    }, index=pd.bdate_range(end="2026-01-30", periods=rows))
+
+
+def warmup(scanner, run_scan=None) -> dict:
+    """
+    Preloads heavy imports, runs the indicator kernels once (JIT/caches), loads the
+    shared panel if configured and optionally primes the scan cache via run_scan().
+    Returns a timing report.
+    """
+    started = time.perf_counter()
+    report = {"imports": import_profile()}
+
+    t = time.perf_counter()
+    scanner.apply_indicators(synthetic_frame())
+    report["indicators_s"] = round(time.perf_counter() - t, 3)
+
+    if scanner.panel is not None:
+        t = time.perf_counter()
+        report["panel_loaded"] = scanner.panel.refresh()
+        report["panel_s"] = round(time.perf_counter() - t, 3)
+
+    if run_scan is not None:
+        t = time.perf_counter()
+        run_scan()
+        report["scan_s"] = round(time.perf_counter() - t, 3)
+
+    report["total_s"] = round(time.perf_counter() - started, 3)
+    logger.info(f"Warmup finished: {report}")
+    return report
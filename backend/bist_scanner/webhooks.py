@@ -0,0 +1,361 @@
+"""
+Webhook subscriptions: push new and changed swing signals instead of polling /scan.
+
+A subscription is a URL plus an optional filter (strategy key, risk level,
+minimum priority_score). Whenever a swing scan produces a new result version
+(see scan_diff.py), the entries that are new or whose strategies or score
+changed are matched against every subscription and POSTed in batches. Each
+subscription's deliveries are queued and sent one at a time, version after
+version, on a bounded pool, so a slow receiver holds one slot instead of the
+scan and never sees version N+1 before version N; failed posts (connection
+errors, 429 and 5xx) are retried with exponential backoff.
+
+Webhook hosts must resolve to public addresses, checked on registration and
+again before every POST (redirects are not followed), so subscriptions cannot
+reach loopback, private, link-local or metadata addresses. Subscription secrets
+are only persisted encrypted with Fernet (the optional `cryptography` package)
+under SCANNER_WEBHOOK_KEY; without that key, signed subscriptions cannot be
+registered on a persistent registry.
+"""
+import hashlib
+import hmac
+import ipaddress
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlsplit
+from . import config
+from .scan_index import RISK_LEVELS
+from .strategies import get_registry
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {408, 425, 429}
+MAX_BACKOFF = 30.0
+
+
+class BlockedURL(ValueError):
+    """Raised for a webhook URL whose host resolves to a non-public address."""
+
+
+def check_url(url: str, allow_private: bool = False):
+    """
+    Resolves the URL's host and raises BlockedURL unless every address it resolves
+    to is public, or ValueError if it cannot be resolved.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError("url must be an http:// or https:// URL with a host")
+    if allow_private:
+        return
+    try:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        addresses = {info[4][0] for info in socket.getaddrinfo(parts.hostname, port, proto=socket.IPPROTO_TCP)}
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Cannot resolve webhook host '{parts.hostname}': {e}")
+    for text in addresses:
+        address = ipaddress.ip_address(text.split("%")[0])
+        if address.version == 6 and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        if not address.is_global or address.is_multicast:
+            raise BlockedURL(f"Webhook host '{parts.hostname}' resolves to a non-public address ({address})")
+
+
+class SecretBox:
+    """
+    Seals subscription secrets for the webhooks file with Fernet (AES-128-CBC
+    plus HMAC-SHA256). `key` is a Fernet key, e.g. from
+    `python -c "from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())"`.
+    Raises ValueError for a malformed key and ImportError without `cryptography`.
+    """
+    def __init__(self, key: str):
+        from cryptography.fernet import Fernet
+        try:
+            self._fernet = Fernet(key.encode("utf-8"))
+        except ValueError as e:
+            raise ValueError(f"SCANNER_WEBHOOK_KEY is not a valid Fernet key: {e}")
+
+    def seal(self, secret: str) -> str:
+        return self._fernet.encrypt(secret.encode("utf-8")).decode("ascii")
+
+    def unseal(self, sealed: str) -> str:
+        """Raises ValueError if the value was not sealed with this key."""
+        from cryptography.fernet import InvalidToken
+        try:
+            return self._fernet.decrypt(sealed.encode("ascii")).decode("utf-8")
+        except InvalidToken:
+            raise ValueError("Secret does not match SCANNER_WEBHOOK_KEY")
+
+
+class Subscription:
+    """
+    A webhook URL and the filter its signals must pass. Raises ValueError for an
+    invalid URL, strategy or risk level.
+    """
+    def __init__(self, url: str, strategy: str = None, risk: str = None, min_score: float = None,
+                 secret: str = None, id: str = None, created: str = None):
+        if not url.startswith(("http://", "https://")):
+            raise ValueError("url must start with http:// or https://")
+        if strategy and strategy != "all" and strategy not in get_registry():
+            raise ValueError(f"Unknown strategy '{strategy}'")
+        if risk:
+            risk = risk.capitalize()
+            if risk not in RISK_LEVELS:
+                raise ValueError(f"Unknown risk level '{risk}'. Valid: {', '.join(RISK_LEVELS)}")
+        self.id = id or uuid.uuid4().hex[:12]
+        self.url = url
+        self.strategy = None if strategy == "all" else strategy
+        self.risk = risk or None
+        self.min_score = min_score
+        self.secret = secret
+        self.created = created or datetime.now().isoformat()
+
+    def matches(self, stock: dict, strategy_names: dict) -> bool:
+        if self.strategy and strategy_names.get(self.strategy) not in stock.get("strategies", []):
+            return False
+        if self.risk and stock.get("risk_level") != self.risk:
+            return False
+        if self.min_score is not None and (stock.get("priority_score") or 0) < self.min_score:
+            return False
+        return True
+
+    def sign(self, body: bytes) -> dict:
+        if not self.secret:
+            return {}
+        digest = hmac.new(self.secret.encode(), body, hashlib.sha256).hexdigest()
+        return {"X-Scanner-Signature": f"sha256={digest}"}
+
+    def to_dict(self) -> dict:
+        return {"id": self.id, "url": self.url, "strategy": self.strategy, "risk": self.risk,
+                "min_score": self.min_score, "created": self.created, "signed": bool(self.secret)}
+
+
+class WebhookRegistry:
+    """
+    Subscriptions by id, persisted to a JSON file at `path` with secrets sealed by
+    `key` (default SCANNER_WEBHOOK_KEY). Without a key, secrets are never written:
+    registering a signed subscription raises ValueError, and stored secrets are
+    left untouched in the file but their subscriptions are not loaded. Plaintext
+    secrets of older files are sealed when the file is loaded with a key.
+    """
+    def __init__(self, path: str = None, allow_private: bool = None, key: str = None):
+        self.path = path
+        self.allow_private = config.WEBHOOK_ALLOW_PRIVATE if allow_private is None else allow_private
+        key = config.WEBHOOK_KEY if key is None else key
+        self.box = SecretBox(key) if key else None
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+        # Stored definitions this registry cannot load, written back as they were
+        self._unreadable = []
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def _load(self, path: str):
+        with open(path, "r", encoding="utf-8") as f:
+            definitions = json.load(f)
+        plaintext = False
+        for stored in definitions:
+            definition = dict(stored)
+            try:
+                definition.pop("signed", None)
+                sealed = definition.pop("sealed_secret", None)
+                if (sealed or definition.get("secret")) and self.box is None:
+                    raise ValueError("its secret needs SCANNER_WEBHOOK_KEY")
+                plaintext = plaintext or bool(definition.get("secret"))
+                if sealed:
+                    definition["secret"] = self.box.unseal(sealed)
+                subscription = Subscription(**definition)
+                self._subscriptions[subscription.id] = subscription
+            except (TypeError, ValueError) as e:
+                logger.error(f"Skipping webhook {stored.get('id')}: {e}")
+                self._unreadable.append(stored)
+        if plaintext:
+            self._save()
+
+    def _save(self):
+        if not self.path:
+            return
+        definitions = list(self._unreadable)
+        for subscription in self._subscriptions.values():
+            definition = subscription.to_dict()
+            del definition["signed"]
+            if subscription.secret:
+                definition["sealed_secret"] = self.box.seal(subscription.secret)
+            definitions.append(definition)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(definitions, f, indent=4)
+        os.replace(tmp_path, self.path)
+
+    def __iter__(self):
+        return iter(list(self._subscriptions.values()))
+
+    def __len__(self):
+        return len(self._subscriptions)
+
+    def register(self, url: str, strategy: str = None, risk: str = None, min_score: float = None,
+                 secret: str = None) -> Subscription:
+        """Validates and stores a subscription. Raises ValueError (BlockedURL for non-public hosts)."""
+        if secret and self.path and self.box is None:
+            raise ValueError("Signed webhooks need SCANNER_WEBHOOK_KEY to store their secret")
+        subscription = Subscription(url, strategy, risk, min_score, secret)
+        check_url(url, self.allow_private)
+        with self._lock:
+            self._subscriptions[subscription.id] = subscription
+            self._save()
+        return subscription
+
+    def remove(self, subscription_id: str) -> bool:
+        with self._lock:
+            if self._subscriptions.pop(subscription_id, None) is None:
+                return False
+            self._save()
+        return True
+
+
+def signals(diff: dict, results: list) -> list:
+    """
+    New and changed entries of a scan diff as signals carrying the current stock row.
+    """
+    rows = {stock["code"]: stock for stock in results}
+    out = [{"event": "new", "code": stock["code"], "stock": stock} for stock in diff["new"]]
+    for change in diff["changed"]:
+        stock = rows.get(change["code"])
+        if stock is not None:
+            out.append({"event": "changed", **change, "stock": stock})
+    return out
+
+
+class WebhookDispatcher:
+    """
+    Matches scan signals against the registry and delivers them on a bounded pool,
+    one delivery per subscription at a time and in dispatch order. Defaults come
+    from SCANNER_WEBHOOK_* settings.
+    """
+    def __init__(self, registry: WebhookRegistry, concurrency: int = None, batch_size: int = None,
+                 retries: int = None, backoff: float = None, timeout: float = None, allow_private: bool = None):
+        self.registry = registry
+        self.allow_private = registry.allow_private if allow_private is None else allow_private
+        self.concurrency = config.WEBHOOK_CONCURRENCY if concurrency is None else concurrency
+        self.batch_size = config.WEBHOOK_BATCH_SIZE if batch_size is None else batch_size
+        self.retries = config.WEBHOOK_RETRIES if retries is None else retries
+        self.backoff = config.WEBHOOK_BACKOFF if backoff is None else backoff
+        self.timeout = config.WEBHOOK_TIMEOUT if timeout is None else timeout
+        self._pool = None
+        self._session = None
+        self._lock = threading.Lock()
+        # Subscription id -> deliveries waiting behind the one being sent
+        self._queues = {}
+        self.stats = {"scans": 0, "signals": 0, "batches": 0, "delivered": 0, "retries": 0, "failed": 0}
+
+    def _count(self, name: str, n: int = 1):
+        with self._lock:
+            self.stats[name] += n
+
+    def _ensure_pool(self):
+        with self._lock:
+            if self._pool is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                self._session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.concurrency, pool_maxsize=self.concurrency)
+                self._session.mount("https://", adapter)
+                self._session.mount("http://", adapter)
+                self._pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="webhook")
+            return self._pool
+
+    def dispatch(self, scan_type: str, version: int, items: list) -> list:
+        """
+        Queues the matching signals for every subscription and returns the futures
+        (one per subscription with at least one signal); does not wait for delivery.
+        """
+        self._count("scans")
+        strategy_names = get_registry().keys
+        futures = []
+        for subscription in self.registry:
+            matched = [s for s in items if subscription.matches(s["stock"], strategy_names)]
+            if not matched:
+                continue
+            self._count("signals", len(matched))
+            pool = self._ensure_pool()
+            future = Future()
+            with self._lock:
+                queue = self._queues.get(subscription.id)
+                idle = queue is None
+                if idle:
+                    queue = self._queues[subscription.id] = deque()
+                queue.append((scan_type, version, matched, future))
+            if idle:
+                pool.submit(self._drain, subscription)
+            futures.append(future)
+        return futures
+
+    def _drain(self, subscription: Subscription):
+        """Sends a subscription's queued deliveries in order until its queue is empty."""
+        while True:
+            with self._lock:
+                queue = self._queues[subscription.id]
+                if not queue:
+                    del self._queues[subscription.id]
+                    return
+                scan_type, version, matched, future = queue.popleft()
+            try:
+                future.set_result(self._deliver(subscription, scan_type, version, matched))
+            except Exception as e:
+                future.set_exception(e)
+
+    def _deliver(self, subscription: Subscription, scan_type: str, version: int, matched: list) -> bool:
+        batches = [matched[i:i + self.batch_size] for i in range(0, len(matched), self.batch_size)]
+        for number, batch in enumerate(batches, start=1):
+            body = json.dumps({
+                "subscription": subscription.id, "type": scan_type, "version": version,
+                "batch": number, "batches": len(batches), "signals": batch,
+            }, ensure_ascii=False, default=str).encode("utf-8")
+            self._count("batches")
+            if not self._post(subscription, body):
+                self._count("failed")
+                logger.error(f"Webhook {subscription.id}: giving up on version {version} "
+                             f"after batch {number}/{len(batches)}")
+                return False
+            self._count("delivered")
+        return True
+
+    def _post(self, subscription: Subscription, body: bytes) -> bool:
+        headers = {"Content-Type": "application/json", **subscription.sign(body)}
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._count("retries")
+                time.sleep(min(self.backoff * 2 ** (attempt - 1), MAX_BACKOFF))
+            try:
+                # Resolved again on every attempt: DNS may have changed since registration
+                check_url(subscription.url, self.allow_private)
+                response = self._session.post(subscription.url, data=body, headers=headers, timeout=self.timeout,
+                                              allow_redirects=False)
+            except BlockedURL as e:
+                logger.warning(f"Webhook {subscription.id} not sent: {e}")
+                return False
+            except Exception as e:
+                logger.warning(f"Webhook {subscription.id} attempt {attempt + 1} failed: {e}")
+                continue
+            if response.status_code < 300:
+                return True
+            if response.status_code not in RETRY_STATUSES and response.status_code < 500:
+                logger.warning(f"Webhook {subscription.id} rejected with HTTP {response.status_code}")
+                return False
+            logger.warning(f"Webhook {subscription.id} attempt {attempt + 1}: HTTP {response.status_code}")
+        return False
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._session.close()
+                self._pool = self._session = None
@@ -0,0 +1,59 @@
+"""
+API endpoints (bist_scanner/api.py) against a prebuilt snapshot and a stubbed live scanner.
+"""
+import gzip
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from bist_scanner import api
+from bist_scanner.service import ScanService
+from bist_scanner.snapshot import SNAPSHOT_VERSION
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    path = tmp_path / "scan_snapshot.json.gz"
+    swing = [{"code": "AAA", "price": 100.0, "priority_score": 9, "strategies": ["Trend Continuation"]}]
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump({"version": SNAPSHOT_VERSION, "created": "2026-10-19T18:00:00", "scans": {"swing": swing},
+                   "features": {"AAA": {"Close": 100.0, "ATR_14": 2.5}}}, f)
+    monkeypatch.setattr(api, "service", ScanService(snapshot_path=str(path)))
+    return TestClient(api.app)
+
+
+def test_equity_sizing_in_snapshot_mode(client):
+    response = client.get("/scan", params={"equity": 10_000, "risk_per_trade": 0.01})
+    assert response.status_code == 200
+    stock, = response.json()
+    # 1% of 10,000 at a stop 2 x 2.5 below the price
+    assert (stock["shares"], stock["stop_loss"]) == (20, 95.0)
+    assert client.get("/scan", params={"diversify": "true"}).status_code == 400
+
+
+class FixedScanner:
+    rows = [{"code": "AAA", "price": 100.0, "priority_score": 9, "risk_level": "Low", "strategies": ["Trend Continuation"]},
+            {"code": "BBB", "price": 50.0, "priority_score": 5, "risk_level": "High", "strategies": ["Momentum Breakout"]}]
+
+    def filter_stocks(self, progress=None):
+        return [dict(row) for row in self.rows]
+
+
+class RecordedHistory:
+    def __init__(self):
+        self.saved = []
+
+    def submit(self, data, scan_type):
+        self.saved.append((scan_type, [row["code"] for row in data]))
+
+
+def test_history_keeps_the_whole_scan_not_the_request_view(monkeypatch):
+    service = ScanService()
+    service._scanner, service.history = FixedScanner(), RecordedHistory()
+    monkeypatch.setattr(api, "service", service)
+    client = TestClient(api.app)
+    response = client.get("/scan", params={"strategy": "momentum_breakout", "risk": "High", "limit": 1})
+    assert [stock["code"] for stock in response.json()] == ["BBB"]
+    client.get("/scan", params={"strategy": "trend_continuation", "refresh": "true"})
+    assert service.history.saved == [("swing_all", ["AAA", "BBB"])] * 2
@@ -0,0 +1,42 @@
+"""
+Background history writer and history files (bist_scanner/history.py).
+"""
+import pytest
+
+from bist_scanner import config, history
+
+
+@pytest.fixture(autouse=True)
+def history_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "HISTORY_DIR", str(tmp_path))
+    return tmp_path
+
+
+def rows(score):
+    return [{"code": "AAA", "priority_score": score, "strategies": ["Trend"]}]
+
+
+def test_writer_batches_and_skips_identical_results():
+    writer = history.HistoryWriter(asynchronous=True, flush_interval=0.2)
+    writer.submit(rows(5), "swing_all")
+    writer.submit(rows(5), "swing_all")
+    writer.submit(rows(5), "longterm")
+    writer.flush()
+    assert writer.stats["written"] == 2 and writer.stats["deduplicated"] == 1
+    assert writer.stats["batches"] == 1
+
+    writer.submit(rows(6), "swing_all")
+    writer.flush()
+    assert writer.stats["written"] == 3
+
+
+def test_compressed_and_plain_files_are_listed_and_loaded(history_dir):
+    plain = history.save_scan_result(rows(1), "swing_all", compress=False)
+    compressed = history.save_scan_result(rows(2), "swing_momentum_breakout", compress=True)
+    assert compressed.endswith(".json.gz") and plain.endswith(".json")
+
+    listed = {item["filename"]: item["type"] for item in history.list_history()}
+    assert listed == {plain: "swing_all", compressed: "swing_momentum_breakout"}
+    loaded = history.load_history(compressed)
+    assert loaded["count"] == 1 and loaded["data"] == rows(2) and loaded["type"] == "swing_momentum_breakout"
+    assert history.load_history(plain)["data"] == rows(1)
@@ -0,0 +1,62 @@
+"""
+Scan jobs: progress, provisional results, cancellation and admission control (bist_scanner/jobs.py).
+"""
+import time
+import threading
+
+import pytest
+
+from bist_scanner.jobs import JobManager, QueueFull
+
+
+def fake_scan(release: threading.Event = None, symbols: int = 20):
+    def run(job):
+        progress = job.progress
+        rows = []
+        progress.start("indicators", symbols)
+        for i in range(symbols):
+            if release is not None and i == symbols // 2:
+                progress.publish(list(rows))
+                release.wait(5)
+            rows.append({"code": f"S{i}", "priority_score": i})
+            progress.advance()
+        return sorted(rows, key=lambda r: r["priority_score"], reverse=True)
+    return run
+
+
+def test_job_reports_progress_and_results():
+    jobs = JobManager(fake_scan(), workers=1, queue_size=2)
+    job = jobs.submit("swing")
+    assert job.wait(5) and job.status == "done"
+    data = job.to_dict(limit=3)
+    assert data["progress"] == {"phase": "indicators", "done": 20, "total": 20}
+    assert data["partial"] is False and data["count"] == 20
+    assert [r["code"] for r in data["results"]] == ["S19", "S18", "S17"]
+    with pytest.raises(ValueError):
+        jobs.submit("intraday")
+
+
+def test_running_job_has_partial_results_and_can_be_cancelled():
+    release = threading.Event()
+    jobs = JobManager(fake_scan(release), workers=1, queue_size=1)
+    running = jobs.submit("swing")
+    while running.progress.done < 10:
+        time.sleep(0.01)
+    data = running.to_dict()
+    assert running.status == "running" and data["partial"] is True and data["count"] == 10
+    assert data["results"][0]["code"] == "S9"
+    # Callers that only need a current scan join the running one
+    assert jobs.submit("swing", join=True) is running
+
+    queued = jobs.submit("longterm")
+    # The same scan type is not queued twice; a full queue is refused
+    assert jobs.submit("longterm") is queued
+    with pytest.raises(QueueFull) as full:
+        jobs.submit("swing")
+    assert full.value.retry_after >= 1
+
+    assert jobs.cancel(queued.id).status == "cancelled"
+    assert jobs.cancel(running.id).status == "cancelling"
+    release.set()
+    assert running.wait(5) and running.status == "cancelled" and running.results is None
+    assert jobs.submit("swing").wait(5)
@@ -0,0 +1,82 @@
+"""
+Parity of the Wilder kernels (bist_scanner/kernels.py) with pandas_ta.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from bist_scanner import kernels
+
+ta = pytest.importorskip("pandas_ta")
+
+LENGTH = 14
+RTOL = 1e-9
+ATOL = 1e-9
+
+
+def random_ohlc(rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, rows)))
+    spread = np.abs(rng.normal(0, 0.01, rows)) * close
+    return pd.DataFrame({
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close + rng.uniform(-1, 1, rows) * spread,
+    })
+
+
+def reference(df: pd.DataFrame) -> dict:
+    adx = ta.adx(df["High"], df["Low"], df["Close"], length=LENGTH)
+    return {
+        "RSI_14": ta.rsi(df["Close"], length=LENGTH),
+        "ATR_14": ta.atr(df["High"], df["Low"], df["Close"], length=LENGTH),
+        "ADX_14": adx["ADX_14"],
+        "DMP_14": adx["DMP_14"],
+        "DMN_14": adx["DMN_14"],
+    }
+
+
+@pytest.fixture(params=["numba", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "numba":
+        pytest.importorskip("numba")
+        monkeypatch.setattr(kernels.config, "NUMBA", True)
+    else:
+        monkeypatch.setattr(kernels.config, "NUMBA", False)
+    kernels.reset()
+    assert kernels.backend() == request.param
+    yield request.param
+    kernels.reset()
+
+
+@pytest.mark.parametrize("rows", [60, 250])
+def test_single_symbol_matches_pandas_ta(backend, rows):
+    df = random_ohlc(rows, seed=rows)
+    result = kernels.wilder_indicators(df["High"], df["Low"], df["Close"], length=LENGTH)
+    for name, expected in reference(df).items():
+        np.testing.assert_allclose(result[name][:, 0], expected.to_numpy(), rtol=RTOL, atol=ATOL, err_msg=name)
+
+
+def test_padded_panel_matches_per_symbol(backend):
+    # Right-aligned columns of different lengths, NaN-padded like the shared price panel
+    lengths = [250, 180, 61]
+    frames = [random_ohlc(n, seed=i) for i, n in enumerate(lengths)]
+    rows = max(lengths)
+    panel = {col: np.full((rows, len(frames)), np.nan) for col in ("High", "Low", "Close")}
+    for j, df in enumerate(frames):
+        for col in panel:
+            panel[col][rows - len(df):, j] = df[col].to_numpy()
+
+    result = kernels.wilder_indicators(panel["High"], panel["Low"], panel["Close"], length=LENGTH)
+    for j, df in enumerate(frames):
+        for name, expected in reference(df).items():
+            np.testing.assert_allclose(result[name][rows - len(df):, j], expected.to_numpy(),
+                                       rtol=RTOL, atol=ATOL, err_msg=f"{name} column {j}")
+            assert np.isnan(result[name][:rows - len(df), j]).all()
+
+
+def test_gaps_match_pandas_ewm(backend):
+    x = random_ohlc(120, seed=7)["Close"].to_numpy(copy=True)
+    x[[0, 1, 30, 31, 32, 90]] = np.nan
+    expected = pd.Series(x).ewm(alpha=1 / LENGTH, adjust=False).mean().to_numpy()
+    np.testing.assert_allclose(kernels.rma(x, LENGTH)[:, 0], expected, rtol=RTOL, atol=ATOL)
@@ -0,0 +1,21 @@
+"""
+Peak memory tracking across overlapping scans (bist_scanner/memory.py).
+"""
+import tracemalloc
+
+import numpy as np
+
+from bist_scanner.memory import track_peak_memory
+
+
+def test_overlapping_blocks_share_one_tracing_session():
+    with track_peak_memory() as outer:
+        first = np.ones(1_000_000)
+        with track_peak_memory() as inner:
+            second = np.ones(500_000)
+            del second
+        # The inner block ending neither stops tracing nor resets the outer peak
+        assert tracemalloc.is_tracing()
+        del first
+    assert not tracemalloc.is_tracing()
+    assert inner["peak_memory_mb"] >= 3.8 and outer["peak_memory_mb"] >= 11.4
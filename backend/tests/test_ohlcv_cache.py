@@ -0,0 +1,89 @@
+"""
+Incremental OHLCV refresh and corporate-action invalidation (bist_scanner/ohlcv_cache.py).
+"""
+import numpy as np
+import pandas as pd
+
+from bist_scanner.ohlcv_cache import OHLCVCache
+
+ROWS = {"5d": 5, "1y": 252}
+
+
+class MarketProvider:
+    """Serves adjusted history up to `today`; a split divides every earlier price, as Yahoo does."""
+
+    def __init__(self, rows: int = 300, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, rows)))
+        self.frame = pd.DataFrame({
+            "Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close,
+            "Volume": rng.integers(1_000, 10_000, rows).astype(float),
+            "Dividends": 0.0, "Stock Splits": 0.0,
+        }, index=pd.bdate_range(end="2026-01-30", periods=rows, tz="Europe/Istanbul"))
+        self.today = rows - 20
+        self.calls = []
+
+    def split(self, ratio: float):
+        # Ex-date is the next bar
+        ex = self.today
+        self.frame.iloc[:ex, :4] /= ratio
+        self.frame.iloc[ex, self.frame.columns.get_loc("Stock Splits")] = ratio
+
+    def fetch_daily_ohlcv(self, symbol, period="3mo", actions=False):
+        self.calls.append(period)
+        df = self.frame.iloc[max(self.today - ROWS[period], 0):self.today]
+        return df if actions else df.drop(columns=["Dividends", "Stock Splits"])
+
+
+def test_new_bars_are_spliced_onto_the_cache():
+    provider = MarketProvider()
+    cache = OHLCVCache(period="1y")
+    cache.get(provider, "A.IS")
+    cache.set_features("A.IS", ["features"])
+
+    frame, changed = cache.get(provider, "A.IS")
+    assert not changed and cache.features("A.IS") == ["features"]
+
+    provider.today += 2
+    frame, changed = cache.get(provider, "A.IS")
+    expected = provider.fetch_daily_ohlcv("A.IS", "1y")
+    assert changed and cache.features("A.IS") is None
+    pd.testing.assert_frame_equal(frame, expected, check_freq=False)
+    assert cache.stats == {"full_fetches": 1, "tail_fetches": 2, "unchanged": 1, "corporate_actions": 0}
+
+
+def test_split_refetches_only_the_affected_symbol():
+    split, other = MarketProvider(seed=1), MarketProvider(seed=2)
+    cache = OHLCVCache(period="1y")
+    cache.get(split, "S.IS")
+    cache.get(other, "O.IS")
+
+    split.split(2.0)
+    split.today += 1
+    other.today += 1
+    frame, changed = cache.get(split, "S.IS")
+    cache.get(other, "O.IS")
+
+    assert changed and split.calls[-1] == "1y" and other.calls[-1] == "5d"
+    np.testing.assert_allclose(frame["Close"].to_numpy(), split.fetch_daily_ohlcv("S.IS", "1y")["Close"].to_numpy())
+    assert cache.stats["corporate_actions"] == 1 and cache.stats["full_fetches"] == 3
+
+
+def test_readjusted_history_without_action_columns_is_detected():
+    provider = MarketProvider()
+    cache = OHLCVCache(period="1y")
+    cache.get(provider, "A.IS")
+    # e.g. a dividend reported late: earlier bars change but no action is in the tail
+    provider.frame.iloc[:provider.today - 1, :4] *= 0.98
+    provider.today += 1
+    cache.get(provider, "A.IS")
+    assert provider.calls[-1] == "1y" and cache.stats["corporate_actions"] == 1
+
+
+def test_gap_longer_than_the_tail_refetches():
+    provider = MarketProvider()
+    cache = OHLCVCache(period="1y")
+    cache.get(provider, "A.IS")
+    provider.today += 10
+    cache.get(provider, "A.IS")
+    assert provider.calls[-1] == "1y" and cache.stats["corporate_actions"] == 0
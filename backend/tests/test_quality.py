@@ -0,0 +1,66 @@
+"""
+Data-quality checks and repairs of the fetched OHLCV frames (bist_scanner/quality.py).
+"""
+import numpy as np
+import pandas as pd
+
+from bist_scanner import quality
+
+
+def sessions(n: int, end: str = "2026-01-30") -> pd.DatetimeIndex:
+    return pd.bdate_range(end=end, periods=n, freq="C", holidays=quality.BIST_HOLIDAYS, tz="Europe/Istanbul")
+
+
+def ohlcv(n: int = 40, seed: int = 0, index=None) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    return pd.DataFrame({
+        "Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close,
+        "Volume": rng.integers(1_000, 10_000, n).astype(float),
+    }, index=sessions(n) if index is None else index)
+
+
+def test_clean_frames_are_returned_untouched():
+    frames = {"A.IS": ohlcv(seed=1), "B.IS": ohlcv(seed=2)}
+    out, report = quality.validate_frames(frames)
+    assert out["A.IS"] is frames["A.IS"] and out["B.IS"] is frames["B.IS"]
+    assert report["issues"] == {} and report["bars"] == 80
+
+
+def test_repairs_bad_bars():
+    df = ohlcv()
+    df.iloc[5, df.columns.get_loc("High")] = df["Low"].iloc[5] * 0.9   # High < Low
+    df.iloc[8, df.columns.get_loc("Close")] = np.nan
+    df = pd.concat([df, df.iloc[[12]]]).sort_index()                   # duplicate date
+    holiday = pd.Timestamp("2026-01-01", tz="Europe/Istanbul")
+    df = pd.concat([df, df.iloc[[0]].set_axis([holiday])]).sort_index()
+    out, report = quality.validate_frames({"A.IS": df, "B.IS": ohlcv(seed=3)})
+
+    fixed = out["A.IS"]
+    assert fixed.index.is_unique and holiday not in fixed.index and len(fixed) == 39
+    assert (fixed["High"] >= fixed[["Open", "Close", "Low"]].max(axis=1)).all()
+    assert (fixed["Low"] <= fixed[["Open", "Close", "High"]].min(axis=1)).all()
+    assert report["issues"]["A.IS"] == {
+        "duplicate_dates": 1, "non_session_bars": 1, "invalid_prices": 1, "inconsistent_ranges": 1, "missing_sessions": 1,
+    }
+    assert report["repaired"]["duplicate_dates"] == 1 and "B.IS" not in report["issues"]
+
+
+def test_flags_stale_zero_volume_missing_and_lagging():
+    stale = ohlcv(seed=4)
+    stale.iloc[-6:, :4] = stale["Close"].iloc[-7]
+    stale.iloc[-1, stale.columns.get_loc("Volume")] = 0
+    gappy = ohlcv(seed=5).drop(sessions(40)[[10, 11]])
+    lagging = ohlcv(seed=6, index=sessions(40, end="2026-01-29"))
+    out, report = quality.validate_frames({"S.IS": stale, "G.IS": gappy, "L.IS": lagging})
+
+    assert out["S.IS"] is stale
+    assert report["issues"]["S.IS"] == {"stale_closes": 7, "zero_volume": 1}
+    assert report["issues"]["G.IS"] == {"missing_sessions": 2}
+    assert report["issues"]["L.IS"] == {"lagging": 1}
+    assert report["flagged"] == {"zero_volume": 1, "stale_closes": 1, "missing_sessions": 1, "lagging": 1}
+
+
+def test_calendar_skips_weekends_and_holidays():
+    days = np.array(["2026-01-01", "2026-01-02", "2026-01-03", "2026-05-19", "2026-05-20"], dtype="datetime64[D]")
+    assert quality.is_session(days).tolist() == [False, True, False, False, True]
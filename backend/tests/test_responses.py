@@ -0,0 +1,49 @@
+"""
+Conditional requests, compression and encoding of API responses (bist_scanner/responses.py).
+"""
+import gzip
+import json
+
+import numpy as np
+from starlette.requests import Request
+
+from bist_scanner.responses import BodyCache, conditional_json, dumps, etag, not_modified
+
+
+def request(**headers) -> Request:
+    raw = [(k.replace("_", "-").lower().encode(), v.encode()) for k, v in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "query_string": b"", "headers": raw})
+
+
+ROWS = [{"code": f"SYN{i:03d}", "priority_score": np.float64(i), "strategies": ["Trend"]} for i in range(100)]
+
+
+def test_dumps_is_compact_and_handles_numpy():
+    assert json.loads(dumps(ROWS))[5]["priority_score"] == 5.0
+    assert b": " not in dumps(ROWS)
+
+
+def test_validators():
+    tag = etag("swing", 3, [("limit", "5")])
+    assert tag == etag("swing", 3, [("limit", "5")]) != etag("swing", 4, [("limit", "5")])
+    assert not_modified({"if-none-match": f'W/"x", {tag}'}, tag)
+    assert not not_modified({"if-none-match": '"other"'}, tag, last_modified=0)
+    assert not_modified({"if-modified-since": "Thu, 01 Jan 1970 00:00:10 GMT"}, tag, last_modified=10.5)
+    assert not not_modified({"if-modified-since": "Thu, 01 Jan 1970 00:00:10 GMT"}, tag, last_modified=11)
+
+
+def test_conditional_json_compresses_caches_and_answers_304():
+    cache = BodyCache(2)
+    calls = []
+    build = lambda: calls.append(1) or ROWS
+    tag = etag("swing", 1)
+
+    first = conditional_json(request(accept_encoding="gzip"), tag, build=build, cache=cache)
+    assert first.headers["content-encoding"] == "gzip" and first.headers["etag"] == tag
+    assert json.loads(gzip.decompress(first.body)) == json.loads(dumps(ROWS))
+    plain = conditional_json(request(), tag, build=build, cache=cache)
+    assert "content-encoding" not in plain.headers and plain.body == dumps(ROWS)
+    assert len(calls) == 1
+
+    cached = conditional_json(request(if_none_match=tag), tag, build=build, cache=cache)
+    assert cached.status_code == 304 and cached.body == b""
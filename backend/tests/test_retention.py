@@ -0,0 +1,79 @@
+"""
+History index, retention policy and archive compaction (bist_scanner/history.py, retention.py).
+"""
+import os
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from bist_scanner import config, history
+from bist_scanner.retention import apply_retention
+
+NOW = datetime(2026, 10, 19, 18, 0)
+
+
+@pytest.fixture(autouse=True)
+def history_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "HISTORY_DIR", str(tmp_path))
+    return tmp_path
+
+
+def save(days_ago: float, hour: int = 10, scan_type: str = "swing_all", compress: bool = True) -> str:
+    timestamp = (NOW - timedelta(days=days_ago)).replace(hour=hour)
+    rows = [{"code": f"C{i}", "priority_score": days_ago + i, "note": "x" * 40} for i in range(30)]
+    return history.save_scan_result(rows, scan_type, timestamp=timestamp, compress=compress)
+
+
+def test_index_pages_newest_first_and_rebuilds(history_dir):
+    names = [save(d) for d in (3, 2, 1)] + [save(1, hour=12, scan_type="longterm")]
+    page, total = history.history_page(limit=2)
+    assert total == 4 and [p["filename"] for p in page] == [names[3], names[2]]
+    page, total = history.history_page(limit=2, offset=1, scan_type="swing_all")
+    assert total == 3 and [p["filename"] for p in page] == [names[1], names[0]]
+
+    os.remove(history_dir / history.INDEX_FILE)
+    assert [e["filename"] for e in history.HistoryIndex(str(history_dir)).entries()] == names[:3] + [names[3]]
+
+
+def test_retention_downsamples_and_archives(history_dir):
+    recent = [save(2, hour=h) for h in (9, 10, 11)]
+    daily = [save(40, hour=h) for h in (9, 10, 11)]
+    # 2026-04-13 (Monday) and 2026-04-15 fall into one ISO week, older than daily_days
+    weekly = [save((NOW - datetime(2026, 4, d, 18)).days) for d in (13, 15)]
+    plain = save(60, compress=False)
+
+    dry = apply_retention(dry_run=True, now=NOW, keep_days=30, daily_days=180)
+    assert (dry["deleted"], dry["archived"], dry["kept"]) == (3, 3, 6)
+    assert dry["reclaimed_bytes"] > 0
+    assert sorted(os.listdir(history_dir)) == sorted(recent + daily + weekly + [plain, history.INDEX_FILE])
+
+    report = apply_retention(now=NOW, keep_days=30, daily_days=180)
+    assert (report["deleted"], report["archived"]) == (3, 3)
+    assert report["bytes_after"] < report["bytes_before"]
+    kept = {e["filename"]: e["archive"] for e in history.get_index().entries()}
+    assert set(kept) == set(recent + [daily[-1], weekly[-1], plain])
+    assert {kept[daily[-1]], kept[plain], kept[weekly[-1]]} == {"archive_2026-09.zip", "archive_2026-08.zip",
+                                                                "archive_2026-04.zip"}
+    assert history.load_history(daily[-1])["count"] == 30
+    assert history.load_history(plain)["type"] == "swing_all"
+    assert history.load_history(daily[0]) is None
+
+    # Idempotent once applied
+    again = apply_retention(now=NOW, keep_days=30, daily_days=180)
+    assert (again["deleted"], again["archived"], again["reclaimed_bytes"]) == (0, 0, 0)
+
+
+def test_dry_run_waits_for_a_running_pass(history_dir):
+    [save(40, hour=h) for h in (9, 10, 11)]
+    reports = []
+    index = history.get_index()
+    with index.lock:
+        # The writer thread would hold this lock while moving files
+        dry = threading.Thread(target=lambda: reports.append(apply_retention(dry_run=True, now=NOW)))
+        dry.start()
+        dry.join(0.2)
+        assert dry.is_alive() and not reports
+        apply_retention(now=NOW, keep_days=30, daily_days=180)
+    dry.join(5)
+    assert (reports[0]["deleted"], reports[0]["archived"]) == (0, 0)
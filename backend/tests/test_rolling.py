@@ -0,0 +1,78 @@
+"""
+Parity of the rolling-window statistics (bist_scanner/rolling.py) with pandas and pandas_ta.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from bist_scanner import kernels, rolling
+
+ta = pytest.importorskip("pandas_ta")
+
+RTOL = 1e-9
+ATOL = 1e-8
+
+
+def random_ohlcv(rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, rows)))
+    spread = np.abs(rng.normal(0, 0.01, rows)) * close
+    return pd.DataFrame({
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close + rng.uniform(-1, 1, rows) * spread,
+        "Volume": rng.integers(100_000, 1_000_000, rows).astype(float),
+    })
+
+
+def windows_for(df: pd.DataFrame) -> rolling.RollingWindows:
+    return rolling.RollingWindows(high=df["High"], low=df["Low"], close=df["Close"], volume=df["Volume"])
+
+
+@pytest.fixture(params=["numba", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "numba":
+        pytest.importorskip("numba")
+    monkeypatch.setattr(kernels.config, "NUMBA", request.param == "numba")
+    kernels.reset()
+    yield request.param
+    kernels.reset()
+
+
+@pytest.mark.parametrize("window", [10, 14, 20])
+def test_window_statistics_match_pandas(backend, window):
+    df = random_ohlcv(120, seed=window)
+    windows = windows_for(df)
+    close = df["Close"].rolling(window)
+    np.testing.assert_allclose(windows.sum("close", window)[:, 0], close.sum(), rtol=RTOL, atol=ATOL)
+    np.testing.assert_allclose(windows.mean("close", window)[:, 0], close.mean(), rtol=RTOL, atol=ATOL)
+    np.testing.assert_allclose(windows.std("close", window)[:, 0], close.std(), rtol=1e-7, atol=ATOL)
+    np.testing.assert_array_equal(windows.max("close", window)[:, 0], close.max())
+    np.testing.assert_array_equal(windows.min("low", window)[:, 0], df["Low"].rolling(window).min())
+
+
+def test_indicators_match_pandas_ta(backend):
+    df = random_ohlcv(250, seed=3)
+    windows = windows_for(df)
+
+    bb = rolling.bbands(windows, length=20, std=2)
+    expected_bb = ta.bbands(df["Close"], length=20)
+    for band in ("BBL", "BBM", "BBU", "BBB", "BBP"):
+        np.testing.assert_allclose(bb[f"{band}_20_2.0"][:, 0], expected_bb[f"{band}_20_2.0_2.0"],
+                                   rtol=1e-7, atol=ATOL, err_msg=band)
+
+    st = rolling.stoch(windows, k=14, d=3, smooth_k=3)
+    expected_st = ta.stoch(df["High"], df["Low"], df["Close"], k=14, d=3, smooth_k=3)
+    for name in ("STOCHk_14_3_3", "STOCHd_14_3_3"):
+        np.testing.assert_allclose(st[name][:, 0], expected_st[name], rtol=RTOL, atol=ATOL, err_msg=name)
+
+    np.testing.assert_allclose(windows.mean("volume", 20)[:, 0], ta.sma(df["Volume"], length=20), rtol=RTOL)
+
+
+def test_windows_with_nan_are_nan(backend):
+    x = random_ohlcv(60, seed=5)["Close"].to_numpy(copy=True)
+    x[[0, 1, 25]] = np.nan
+    windows = rolling.RollingWindows(close=x)
+    expected = pd.Series(x).rolling(10)
+    np.testing.assert_array_equal(windows.max("close", 10)[:, 0], expected.max())
+    np.testing.assert_allclose(windows.mean("close", 10)[:, 0], expected.mean(), rtol=RTOL)
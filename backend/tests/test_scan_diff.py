@@ -0,0 +1,43 @@
+"""
+Versioned scan diffs keyed by stock code (bist_scanner/scan_diff.py).
+"""
+from bist_scanner.scan_diff import ScanDiffs
+
+
+def stock(code, score, *strategies):
+    return {"code": code, "priority_score": score, "strategies": list(strategies)}
+
+
+def test_diff_against_previous_scan():
+    diffs = ScanDiffs()
+    assert diffs.record("swing", [stock("A", 9, "Breakout"), stock("B", 7, "Trend"), stock("C", 5)]) == 1
+    current = [stock("B", 8, "Trend", "Golden Cross"), stock("A", 9, "Breakout"), stock("D", 4, "Trend")]
+    assert diffs.record("swing", current) == 2
+
+    diff = diffs.diff("swing")
+    assert (diff["version"], diff["since"], diff["reset"]) == (2, 1, False)
+    assert diff["new"] == [current[2]]
+    assert diff["dropped"] == ["C"]
+    assert diff["unchanged"] == 1
+    (changed,) = diff["changed"]
+    assert changed["code"] == "B" and changed["score_delta"] == 1
+    assert (changed["rank"], changed["previous_rank"]) == (1, 2)
+    assert changed["strategies_added"] == ["Golden Cross"] and changed["strategies_removed"] == []
+
+
+def test_same_results_are_not_a_new_version():
+    diffs = ScanDiffs()
+    results = [stock("A", 9)]
+    diffs.record("swing", results)
+    assert diffs.record("swing", results) == 1
+    diff = diffs.diff("swing", since=1)
+    assert diff["new"] == [] and diff["unchanged"] == 1
+
+
+def test_expired_version_resets():
+    diffs = ScanDiffs(keep=2)
+    for score in range(4):
+        diffs.record("swing", [stock("A", score)])
+    diff = diffs.diff("swing", since=1)
+    assert diff["reset"] and [s["code"] for s in diff["new"]] == ["A"]
+    assert diffs.diff("swing", since=3)["changed"][0]["score_delta"] == 1
@@ -0,0 +1,13 @@
+"""
+ATR position sizing (bist_scanner/sizing.py).
+"""
+from bist_scanner.sizing import size_positions
+
+
+def test_heat_is_a_fraction_of_equity_like_max_heat():
+    stocks = [{"code": c, "price": 100.0} for c in ("A", "B", "C", "D")]
+    sized = size_positions(stocks, [2.5, 2.5, None, 2.5], equity=100_000, risk_per_trade=0.02, max_heat=0.04)
+    # 2% of equity at a stop 5.0 below the price: 400 shares, 2000 at risk each
+    assert [s["shares"] for s in sized] == [400, 400, 0, 0]
+    assert [s["portfolio_heat"] for s in sized] == [0.02, 0.04, 0.04, 0.04]
+    assert sized[0]["stop_loss"] == 95.0 and sized[2]["stop_loss"] is None
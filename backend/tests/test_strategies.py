@@ -0,0 +1,84 @@
+"""
+Compilation and evaluation of the strategy expressions (bist_scanner/strategies.py).
+"""
+import json
+import numpy as np
+import pytest
+
+from bist_scanner.scanner import StockScanner
+from bist_scanner.strategies import FeatureMatrix, Strategy, StrategyRegistry
+
+
+def matrix(**columns):
+    size = len(next(iter(columns.values())))
+    lasts = [{name: values[i] for name, values in columns.items()} for i in range(size)]
+    return FeatureMatrix(lasts, lasts)
+
+
+def test_chained_comparison_and_arithmetic():
+    features = matrix(RSI_14=[40.0, 55.0, 75.0], ATR_14=[1.0, 2.0, 3.0], Close=[100.0, 100.0, 100.0])
+    strategy = Strategy("s", "S", "50 <= RSI_14 <= 70 or ATR_14 / Close >= 0.03")
+    assert strategy.mask(features).tolist() == [False, True, True]
+
+
+def test_nan_comparisons_are_false():
+    features = matrix(Close=[np.nan, 10.0], EMA_20=[1.0, np.nan])
+    assert Strategy("s", "S", "Close > EMA_20").mask(features).tolist() == [False, False]
+    assert Strategy("s", "S", "not (Close > EMA_20)").mask(features).tolist() == [True, True]
+
+
+def test_previous_bar_and_dotted_columns():
+    features = FeatureMatrix([{"Close": 11.0, "BBP_20_2.0": 0.7}], [{"High": 10.0}])
+    assert Strategy("s", "S", "Close > prev.High and BBP_20_2.0 >= 0.6").mask(features).tolist() == [True]
+
+
+def test_shared_subexpressions_are_evaluated_once():
+    features = matrix(Close=[1.0, 2.0], EMA_20=[1.5, 1.5])
+    memo = {}
+    Strategy("a", "A", "Close > EMA_20 and Close > 0").mask(features, memo)
+    size = len(memo)
+    Strategy("b", "B", "Close > EMA_20 or Close < 0").mask(features, memo)
+    # Only the new comparison, its constant and the 'or' are added
+    assert len(memo) == size + 3
+
+
+def test_constants_broadcast_to_every_symbol():
+    features = matrix(Close=[1.0, 2.0, 3.0])
+    assert Strategy("s", "S", "1 and Close > 1").mask(features).tolist() == [False, True, True]
+    assert Strategy("s", "S", "not 0").mask(features).tolist() == [True, True, True]
+    assert Strategy("s", "S", "2 > 1 or Close > 5").mask(features).tolist() == [True, True, True]
+
+
+@pytest.mark.parametrize("expression", [
+    "__import__('os')", "Close.__class__", "Foo > 1", "Close > 'x'", "Close in (1, 2)", "lambda: 1", "Close >",
+    "1", "Close", "Close - EMA_20", "abs(RSI_14)", "-1",
+])
+def test_rejects_unsafe_or_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        Strategy("s", "S", expression)
+
+
+def test_registry_persists_user_strategies(tmp_path):
+    path = str(tmp_path / "strategies.json")
+    registry = StrategyRegistry(path)
+    registry.register("oversold", "Oversold", "RSI_14 < 30", score=4)
+    with pytest.raises(ValueError):
+        registry.register("momentum_breakout", "Mine", "Close > 1")
+    with pytest.raises(ValueError):
+        registry.remove("trend_continuation")
+
+    assert json.load(open(path))[0]["key"] == "oversold"
+    reloaded = StrategyRegistry(path)
+    assert reloaded.keys["oversold"] == "Oversold"
+    assert reloaded.remove("oversold") and "oversold" not in StrategyRegistry(path)
+
+
+def test_failing_strategy_does_not_fail_the_scan(monkeypatch):
+    registry = StrategyRegistry()
+    broken = registry.register("broken", "Broken", "Close > 0")
+    broken.evaluate = lambda features, memo: 1.0
+    monkeypatch.setattr("bist_scanner.scanner.get_registry", lambda: registry)
+    row = {"Close": 10.0, "Volume": 100.0, "Vol_MA_20": 100.0, "RSI_14": 60.0, "EMA_20": 9.0, "EMA_50": 8.0,
+           "MACD_12_26_9": 1.0, "MACDs_12_26_9": 0.5, "ADX_14": 25.0}
+    results = StockScanner().evaluate_universe({"AAA.IS": (row, row)})
+    assert [r["strategies"] for r in results] == [["Trend Continuation"]]
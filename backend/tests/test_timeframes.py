@@ -0,0 +1,62 @@
+"""
+Weekly/monthly indicators (bist_scanner/timeframes.py) against pandas resampling of the daily bars.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from bist_scanner import kernels, timeframes
+
+
+def daily_close(rows: int = 504, seed: int = 3) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end="2026-01-30", periods=rows, tz="Europe/Istanbul")
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0.001, 0.02, rows))), index=index)
+
+
+@pytest.mark.parametrize("rule,freq", [("W", "W-SUN"), ("M", "ME")])
+def test_period_closes_match_resampled_bars(rule, freq):
+    close = daily_close()
+    bars = close.tz_localize(None).resample(freq).last().dropna()
+    out = timeframes.timeframe_indicators(close.index, close.to_numpy(), rule)
+    _, last_day = timeframes.period_bars(close.index, rule)
+    prefix = timeframes.TIMEFRAMES[rule]
+
+    ema = bars.ewm(span=10, adjust=False).mean().to_numpy()
+    macd = (bars.ewm(span=12, adjust=False).mean() - bars.ewm(span=26, adjust=False).mean()).to_numpy(copy=True)
+    macd[:25] = np.nan
+    signal = pd.Series(macd).ewm(span=9, adjust=False).mean().to_numpy()
+    expected = {
+        f"{prefix}EMA_10": ema, f"{prefix}MACD_12_26_9": macd,
+        f"{prefix}MACDs_12_26_9": signal, f"{prefix}RSI_14": kernels.rsi(bars.to_numpy())[:, 0],
+    }
+    for name, values in expected.items():
+        got = out[name][last_day, 0]
+        valid = ~np.isnan(got)
+        np.testing.assert_allclose(got[valid], values[valid], rtol=1e-12, err_msg=name)
+
+
+def test_days_only_see_their_own_close():
+    close = daily_close(rows=260)
+    full = timeframes.multi_timeframe_indicators(close.index, close.to_numpy())
+    cut = 200
+    partial = timeframes.multi_timeframe_indicators(close.index[:cut], close.to_numpy()[:cut])
+    for name, values in partial.items():
+        np.testing.assert_array_equal(values, full[name][:cut], err_msg=name)
+
+
+@pytest.mark.parametrize("period,rows", [("3mo", 63), ("1y", 252)])
+def test_period_only_offers_columns_with_values(period, rows):
+    # SCANNER_SWING_PERIOD defaults to 3mo: about 63 daily bars, 13 weeks; 1y is about 252
+    close = daily_close(rows=rows)
+    out = timeframes.multi_timeframe_indicators(close.index, close.to_numpy())
+    available = timeframes.available_columns(period)
+    for name, values in out.items():
+        assert np.isnan(values[-1, 0]) != (name in available), name
+    assert set(timeframes.multi_timeframe_indicators(close.index, close.to_numpy(), columns=available)) == set(available)
+    assert timeframes.available_columns("3y") == list(out)
+
+
+def test_default_period_fills_only_the_short_weekly_ema():
+    assert timeframes.available_columns("3mo") == ["W_EMA_10"]
+    assert "M_EMA_10" in timeframes.available_columns("1y") and "W_MACDs_12_26_9" in timeframes.available_columns("1y")
@@ -0,0 +1,151 @@
+"""
+Webhook subscriptions and batched delivery against a local receiver (bist_scanner/webhooks.py).
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from bist_scanner.scan_diff import ScanDiffs
+from bist_scanner.webhooks import BlockedURL, WebhookDispatcher, WebhookRegistry, signals
+
+
+class Receiver(BaseHTTPRequestHandler):
+    received = []
+    failures = 0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if Receiver.failures:
+            Receiver.failures -= 1
+            self.send_response(503)
+        else:
+            Receiver.received.append((self.path, self.headers.get("X-Scanner-Signature"), body))
+            self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def receiver():
+    Receiver.received, Receiver.failures = [], 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Receiver)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def stock(code, score, risk="Low", *strategies):
+    return {"code": code, "priority_score": score, "risk_level": risk, "strategies": list(strategies)}
+
+
+def scan_signals():
+    diffs = ScanDiffs()
+    diffs.record("swing", [stock("A", 9, "Low", "Momentum Breakout")])
+    current = [stock("A", 10, "Low", "Momentum Breakout"), stock("B", 6, "High", "Trend Continuation"),
+               stock("C", 8, "Low", "Momentum Breakout")]
+    diffs.record("swing", current)
+    return signals(diffs.diff("swing"), current)
+
+
+def test_filters_batches_and_retries(receiver):
+    registry = WebhookRegistry(allow_private=True)
+    registry.register(f"{receiver}/all", secret="s3cret")
+    registry.register(f"{receiver}/breakouts", strategy="momentum_breakout", min_score=9)
+    dispatcher = WebhookDispatcher(registry, concurrency=2, batch_size=2, retries=2, backoff=0, timeout=2)
+    Receiver.failures = 1
+
+    futures = dispatcher.dispatch("swing", 2, scan_signals())
+    assert all(f.result(timeout=10) for f in futures)
+    dispatcher.close()
+
+    by_path = {}
+    for path, signature, body in Receiver.received:
+        by_path.setdefault(path, []).append((signature, body))
+    assert [b["batch"] for _, b in by_path["/all"]] == [1, 2]
+    assert all(sig.startswith("sha256=") for sig, _ in by_path["/all"])
+    codes = [s["code"] for _, b in by_path["/all"] for s in b["signals"]]
+    assert sorted(codes) == ["A", "B", "C"]
+    (_, breakouts), = by_path["/breakouts"]
+    assert [(s["event"], s["code"]) for s in breakouts["signals"]] == [("changed", "A")]
+    assert dispatcher.stats["retries"] == 1 and dispatcher.stats["failed"] == 0
+
+
+def test_versions_arrive_in_order(receiver):
+    registry = WebhookRegistry(allow_private=True)
+    registry.register(f"{receiver}/all")
+    dispatcher = WebhookDispatcher(registry, concurrency=4, batch_size=1, retries=2, backoff=0, timeout=2)
+    Receiver.failures = 1
+    futures = [f for version in range(2, 7) for f in dispatcher.dispatch("swing", version, scan_signals())]
+    assert all(f.result(timeout=10) for f in futures)
+    dispatcher.close()
+    assert [(b["version"], b["batch"]) for _, _, b in Receiver.received] == \
+        [(version, batch) for version in range(2, 7) for batch in (1, 2, 3)]
+
+
+def test_invalid_subscriptions_are_rejected():
+    registry = WebhookRegistry()
+    with pytest.raises(ValueError):
+        registry.register("ftp://example.com")
+    with pytest.raises(ValueError):
+        registry.register("http://example.com", strategy="no_such_strategy")
+    with pytest.raises(ValueError):
+        registry.register("http://example.com", risk="extreme")
+
+
+@pytest.mark.parametrize("url", [
+    "http://127.0.0.1:8000/hook", "http://169.254.169.254/latest/meta-data", "http://10.0.0.5/", "http://[::1]/",
+    "http://[::ffff:192.168.1.1]/", "http://0.0.0.0/",
+])
+def test_non_public_hosts_are_refused(url):
+    with pytest.raises(BlockedURL):
+        WebhookRegistry().register(url)
+
+
+def test_delivery_rechecks_the_host(receiver):
+    registry = WebhookRegistry(allow_private=True)
+    registry.register(f"{receiver}/all")
+    dispatcher = WebhookDispatcher(registry, retries=2, backoff=0, timeout=2, allow_private=False)
+    assert not any(f.result(timeout=10) for f in dispatcher.dispatch("swing", 2, scan_signals()))
+    dispatcher.close()
+    assert Receiver.received == [] and dispatcher.stats["failed"] == 1 and dispatcher.stats["retries"] == 0
+
+
+def test_secrets_are_sealed_at_rest(tmp_path):
+    fernet = pytest.importorskip("cryptography.fernet")
+    key, other = (fernet.Fernet.generate_key().decode() for _ in range(2))
+    path = tmp_path / "webhooks.json"
+    registry = WebhookRegistry(str(path), allow_private=True, key=key)
+    subscription = registry.register("http://127.0.0.1/hook", secret="s3cret")
+    assert "s3cret" not in path.read_text()
+    reloaded, = WebhookRegistry(str(path), key=key)
+    assert reloaded.id == subscription.id and reloaded.secret == "s3cret"
+    # Another key cannot unseal them
+    assert len(WebhookRegistry(str(path), key=other)) == 0
+    with pytest.raises(ValueError):
+        WebhookRegistry(str(path), key="not-a-fernet-key")
+
+    # Files written before sealing are sealed on load
+    path.write_text(json.dumps([{"id": "abc", "url": "http://127.0.0.1/hook", "secret": "plain"}]))
+    assert next(iter(WebhookRegistry(str(path), key=key))).secret == "plain"
+    assert "plain" not in path.read_text() and "sealed_secret" in path.read_text()
+
+
+def test_secrets_are_not_stored_without_a_key(tmp_path):
+    path = tmp_path / "webhooks.json"
+    registry = WebhookRegistry(str(path), allow_private=True, key="")
+    with pytest.raises(ValueError):
+        registry.register("http://127.0.0.1/hook", secret="s3cret")
+    registry.register("http://127.0.0.1/plain")
+    assert len(WebhookRegistry(str(path), key="")) == 1
+
+    # Stored secrets are kept in the file, but their subscriptions are not loaded without the key
+    sealed = {"id": "abc", "url": "http://127.0.0.1/hook", "sealed_secret": "gAAAA"}
+    path.write_text(json.dumps([sealed]))
+    registry = WebhookRegistry(str(path), allow_private=True, key="")
+    assert len(registry) == 0
+    registry.register("http://127.0.0.1/plain")
+    assert sealed in json.loads(path.read_text())
@@ -0,0 +1,55 @@
+"""
+Cloud Functions entry point, backed by the same bist_scanner package as the API.
+
+The package is copied next to this file before deploy (see README); locally it
+is imported from ../backend.
+"""
+import os
+import sys
+import json
+
+FUNCTIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+os.environ.setdefault("SCANNER_HOME", FUNCTIONS_DIR)
+try:
+    import bist_scanner  # noqa: F401
+except ImportError:
+    sys.path.insert(0, os.path.join(os.path.dirname(FUNCTIONS_DIR), "backend"))
+
+from firebase_functions import https_fn  # noqa: E402
+from bist_scanner.service import ScanService  # noqa: E402
+
+service = ScanService()
+
+
+def _json(data, status: int = 200) -> https_fn.Response:
+    return https_fn.Response(json.dumps(data, ensure_ascii=False), status=status, mimetype="application/json")
+
+
+@https_fn.on_request()
+def scan(req: https_fn.Request) -> https_fn.Response:
+    """Swing scan with the same strategy/risk/holding/limit filters as GET /scan."""
+    args = req.args
+    try:
+        index, _ = service.index("swing", refresh=args.get("refresh", "").lower() == "true")
+        holding = args.get("holding")
+        limit = args.get("limit")
+        return _json(index.query(
+            strategy=args.get("strategy", "all"),
+            risk=args.get("risk"),
+            holding=int(holding) if holding else None,
+            limit=int(limit) if limit else None,
+        ))
+    except ValueError as e:
+        return _json({"detail": str(e)}, status=400)
+    except Exception as e:
+        return _json({"detail": str(e)}, status=500)
+
+
+@https_fn.on_request()
+def scan_long_term(req: https_fn.Request) -> https_fn.Response:
+    """Long-term scan, as GET /scan/long-term."""
+    try:
+        results, _ = service.long_term()
+        return _json(results)
+    except Exception as e:
+        return _json({"detail": str(e)}, status=500)
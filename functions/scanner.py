@@ -1,398 +0,0 @@
-import pandas as pd
-import pandas_ta as ta
-from .data_provider import DataProvider
-import logging
-
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-class StockScanner:
-    def __init__(self):
-        self.provider = DataProvider()
-
-    def apply_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
-        """
-        Calculates necessary technical indicators for all strategies.
-        """
-        if df.empty:
-            return df
-            
-        # Ensure we have enough data (need more for EMA50, MACD, etc)
-        if len(df) < 60:
-            return pd.DataFrame() 
-
-        # --- Trend Indicators ---
-        # EMA(10), EMA(20), EMA(50)
-        df['EMA_10'] = ta.ema(df['Close'], length=10)
-        df['EMA_20'] = ta.ema(df['Close'], length=20)
-        df['EMA_50'] = ta.ema(df['Close'], length=50)
-
-        # MACD (12, 26, 9)
-        macd = ta.macd(df['Close'], fast=12, slow=26, signal=9)
-        if macd is not None:
-             df = pd.concat([df, macd], axis=1) # Adds MACD_12_26_9, MACDs_12_26_9, MACDh_12_26_9
-
-        # --- Momentum Indicators ---
-        # RSI(14)
-        df['RSI_14'] = ta.rsi(df['Close'], length=14)
-        
-        # Stochastic (14)
-        stoch = ta.stoch(df['High'], df['Low'], df['Close'], k=14, d=3, smooth_k=3)
-        if stoch is not None:
-            df = pd.concat([df, stoch], axis=1) # Adds STOCHk_14_3_3, STOCHd_14_3_3
-
-        # --- Volatility Indicators ---
-        # ATR(14)
-        df['ATR_14'] = ta.atr(df['High'], df['Low'], df['Close'], length=14)
-
-        # Bollinger Bands (20, 2)
-        bb = ta.bbands(df['Close'], length=20, std=2)
-        if bb is not None:
-            df = pd.concat([df, bb], axis=1) # Adds BBL_20_2.0, BBM_20_2.0, BBU_20_2.0, BBB_20_2.0, BBP_20_2.0
-
-        # ADX(14)
-        adx = ta.adx(df['High'], df['Low'], df['Close'], length=14)
-        if adx is not None:
-            df = pd.concat([df, adx], axis=1) # Adds ADX_14, DMP_14, DMN_14
-
-        # Volume MA(20)
-        df['Vol_MA_20'] = ta.sma(df['Volume'], length=20)
-        
-        # 10-day High (Highest close of last 10 days)
-        df['High_10'] = df['Close'].rolling(window=10).max()
-        
-        return df
-
-    def check_momentum_breakout(self, row, prev_row, symbol=""):
-        """
-        Strategy A: Momentum Breakout
-        """
-        try:
-            # 1. Breakout above previous high
-            if row['Close'] <= prev_row['High']:
-                # logger.debug(f"{symbol} Fail MomBreakout: Close {row['Close']} <= PrevHigh {prev_row['High']}")
-                return False
-
-            # 2. Volume > 1.0 * 20-day avg volume (Relaxed to Average)
-            if row['Volume'] < 1.0 * row['Vol_MA_20']:
-                # logger.debug(f"{symbol} Fail MomBreakout: Vol {row['Volume']} < 1.0x Avg {row['Vol_MA_20']}")
-                return False
-
-            # 3. RSI 50-70
-            if not (50 <= row['RSI_14'] <= 70):
-                return False
-
-            # 4. Price above 20EMA
-            if row['Close'] <= row['EMA_20']:
-                return False
-
-            return True
-        except:
-            return False
-
-    def check_trend_continuation(self, row, prev_row, symbol=""):
-        """
-        Strategy B: Trend Continuation
-        """
-        try:
-            # 1. Price > EMA20 and Price > EMA50
-            if not (row['Close'] > row['EMA_20'] and row['Close'] > row['EMA_50']):
-                return False
-
-            # 2. MACD bullish crossover or Bullish alignment?
-            # User asked for "Crossover" (event). This is rare.
-            # Let's verify if they meant "MACD > Signal" (Trend).
-            # For now, let's relax to "MACD > Signal" (Bullish Trend) instead of just the crossover day
-            # to see if we get ANY results.
-            
-            macd_line = row['MACD_12_26_9']
-            signal_line = row['MACDs_12_26_9']
-            
-            if macd_line <= signal_line:
-                return False
-
-            # 3. ADX > 20 (Relaxed from 25)
-            if row['ADX_14'] <= 20:
-                return False
-
-            return True
-        except:
-            return False
-
-    def check_momentum_volatility(self, row, symbol=""):
-        """
-        Strategy C: Momentum / Volatility
-        """
-        try:
-             # 1. Stochastic %K > %D
-            k = row['STOCHk_14_3_3']
-            d = row['STOCHd_14_3_3']
-            if k <= d:
-                return False
-
-            # 2. ATR % > 0.5% (Very relaxed)
-            if (row['ATR_14'] / row['Close']) < 0.005:
-                return False
-
-            # 3. Bollinger Band Upper Proximity
-            # Relaxing to > 0.60 (Upper half of band)
-            if row['BBP_20_2.0'] < 0.60:
-                return False
-
-            return True
-        except:
-            return False
-
-    def analyze_stock_result(self, stock):
-        """
-        Analyzes the stock to determine holding period, risk, and priority.
-        """
-        holding_days = 1
-        risk = "Medium"
-        reason = ""
-        priority = 0.0
-        
-        strategies = stock.get("strategies", [])
-        volume_change = stock.get("volumeChange", 0)
-        rsi = stock.get("rsi", 50)
-        score = stock.get("score", 0)
-
-        # --- Estimated Holding Period ---
-        if "Momentum Breakout" in strategies:
-            if volume_change >= 20 and 50 <= rsi <= 70:
-                holding_days = 2
-                reason = "Momentum Breakout + strong volume + healthy RSI"
-                priority += 50
-            elif volume_change < 20:
-                holding_days = 1
-                reason = "Momentum Breakout but low volume"
-                priority += 20
-            else:
-                holding_days = 1
-                reason = "Momentum Breakout"
-                priority += 10
-        elif "Trend Continuation" in strategies:
-            if volume_change > 0 and rsi <= 70:
-                holding_days = 2
-                reason = "Trend continues with positive volume"
-                priority += 30
-            elif rsi > 70:
-                holding_days = 1
-                reason = "Trend continues but RSI high"
-                priority += 10
-            else:
-                holding_days = 1
-                reason = "Trend continues"
-                priority += 10
-        elif "Momentum Volatility" in strategies:
-             holding_days = 1
-             reason = "High volatility play"
-             priority += 15
-
-        # --- Risk Level ---
-        if volume_change < 0 and rsi > 70:
-            risk = "High"
-            reason += " | Negative volume & high RSI"
-            priority -= 20
-        elif volume_change < 0:
-            risk = "Medium"
-            reason += " | Negative volume"
-            priority -= 10
-        elif 50 <= rsi <= 70:
-            risk = "Low"
-        elif rsi > 70:
-            risk = "Medium"
-
-        # --- Add Score Influence ---
-        priority += score
-        
-        stock["estimated_holding_period_days"] = holding_days
-        stock["risk_level"] = risk
-        stock["reason"] = reason
-        stock["priority_score"] = int(priority)
-        
-        return stock
-
-    def filter_stocks(self) -> list:
-        tickers = self.provider.get_all_bist_tickers()
-        passed_stocks = []
-
-        for symbol in tickers:
-            try:
-                df = self.provider.fetch_daily_ohlcv(symbol)
-                df = self.apply_indicators(df)
-                
-                if df.empty or len(df) < 50:
-                    continue
-                
-                last = df.iloc[-1]
-                prev = df.iloc[-2]
-                
-                matched_strategies = []
-
-                if self.check_momentum_breakout(last, prev, symbol):
-                    matched_strategies.append("Momentum Breakout")
-                
-                if self.check_trend_continuation(last, prev, symbol):
-                    matched_strategies.append("Trend Continuation")
-                
-                if self.check_momentum_volatility(last, symbol):
-                    matched_strategies.append("Momentum Volatility")
-
-                if matched_strategies:
-                     # Basic scoring for sorting
-                    raw_score = 0
-                    if "Momentum Breakout" in matched_strategies: raw_score += 10
-                    if "Trend Continuation" in matched_strategies: raw_score += 8
-                    if "Momentum Volatility" in matched_strategies: raw_score += 9
-
-                    stock_data = {
-                        "code": symbol.replace(".IS", ""),
-                        "price": round(last['Close'], 2),
-                        "volumeChange": round(((last['Volume'] / last['Vol_MA_20']) - 1) * 100, 1) if last['Vol_MA_20'] else 0,
-                        "rsi": round(last['RSI_14'], 2),
-                        "score": raw_score,
-                        "strategies": matched_strategies
-                    }
-                    
-                    # Apply detailed analysis
-                    analyzed_stock = self.analyze_stock_result(stock_data)
-                    passed_stocks.append(analyzed_stock)
-
-            except Exception as e:
-                logger.error(f"Error processing {symbol}: {e}")
-                continue
-        
-        # Sort by priority_score descending
-        passed_stocks.sort(key=lambda x: x.get('priority_score', 0), reverse=True)
-        return passed_stocks
-
-    def check_long_term_momentum(self, row, df400, symbol=""):
-        """
-        Strategy 1: Multi-Period Momentum & Trend Filter (3mo-1yr)
-        """
-        try:
-            # Price > 200MA (Trend)
-            if row['Close'] <= row['EMA_200']:
-                return False
-
-            # 3, 6, 9, 12 Month Returns check
-            # Approx: 3m=60 candles, 6m=120, 9m=180, 12m=250
-            if len(df400) < 252:
-                return False
-                 
-            price_3m_ago = df400.iloc[-63]['Close'] # ~3 mo
-            price_6m_ago = df400.iloc[-126]['Close'] # ~6 mo
-            price_12m_ago = df400.iloc[-252]['Close'] # ~1 yr
-             
-            ret_3m = (row['Close'] / price_3m_ago) - 1
-            ret_6m = (row['Close'] / price_6m_ago) - 1
-            ret_12m = (row['Close'] / price_12m_ago) - 1
-             
-            if ret_3m <= 0 or ret_6m <= 0 or ret_12m <= 0:
-                return False
-                 
-            # MACD Bullish
-            macd_line = row['MACD_12_26_9']
-            signal_line = row['MACDs_12_26_9']
-            if macd_line <= signal_line: # Basic bullish trend check
-                return False
-
-            return True
-        except Exception as e:
-            # logger.error(f"Error checking LT Momentum for {symbol}: {e}")
-            return False
-
-    def check_fundamental_strength(self, fundamentals):
-        """
-        Strategy 2: Fundamental Strength (P/E, EPS, Debt)
-        """
-        try:
-            pe = fundamentals.get('pe_ratio', 0)
-            debt_eq = fundamentals.get('debt_to_equity', 0)
-            eps_growth = fundamentals.get('revenue_growth', 0) # Using rev growth as proxy if eps growth missing
-            
-            # P/E Moderate (0 < PE < 35)
-            if not (0 < pe < 35):
-                return False
-                
-            # Low Debt/Equity (< 100 or 1.0 depending on data source, yfinance typically returns % or decimal? usually decimal in info but strict check needed)
-            # Assuming yfinance returns ratio (e.g. 0.5 for 50%). Safe limit < 1.5
-            # Actually yfinance often returns it as percentage (e.g. 50.4) or ratio.
-            # Let's assume < 150 (if %), or < 1.5
-            if debt_eq > 150: 
-                return False
-            
-            # Positive Growth
-            if eps_growth <= 0:
-                pass # Relaxing this as data might be missing
-
-            return True
-        except:
-            return False
-            
-    def scan_long_term(self):
-        """
-        Scans for long-term investment opportunities (3m - 2y).
-        """
-        tickers = self.provider.get_all_bist_tickers()
-        passed_stocks = []
-        
-        for symbol in tickers:
-            try:
-                # Need ~1 year of data minimum, fetching 2y to be safe
-                df = self.provider.fetch_daily_ohlcv(symbol, period="2y")
-                
-                if df.empty or len(df) < 260:
-                    continue
-
-                # Calculate indicators (Need EMA 200)
-                df['EMA_50'] = ta.ema(df['Close'], length=50)
-                df['EMA_200'] = ta.ema(df['Close'], length=200)
-                
-                # MACD
-                macd = ta.macd(df['Close'], fast=12, slow=26, signal=9)
-                if macd is not None:
-                     df = pd.concat([df, macd], axis=1)
-
-                last = df.iloc[-1]
-                
-                # --- Step 1: Technical Filter (Fast) ---
-                # Check Technical Strategy 1
-                is_momentum = self.check_long_term_momentum(last, df, symbol)
-                
-                # If technically sound, fetch fundamentals (Slow)
-                if is_momentum:
-                    fundamentals = self.provider.fetch_fundamentals(symbol)
-                    
-                    # --- Step 2: Fundamental Filter ---
-                    is_fundamental = self.check_fundamental_strength(fundamentals)
-                    
-                    matched_strategies = []
-                    if is_momentum: matched_strategies.append("LT Momentum")
-                    if is_fundamental: matched_strategies.append("Fundamental Strength")
-                    
-                    # Calculate returns for display
-                    price_3m = df.iloc[-63]['Close']
-                    price_1y = df.iloc[-252]['Close']
-                    ret_3m = ((last['Close'] / price_3m) - 1) * 100
-                    ret_1y = ((last['Close'] / price_1y) - 1) * 100
-
-                    passed_stocks.append({
-                        "code": symbol.replace(".IS", ""),
-                        "price": round(last['Close'], 2),
-                        "return_3m": round(ret_3m, 1),
-                        "return_1y": round(ret_1y, 1),
-                        "pe_ratio": round(fundamentals.get('pe_ratio', 0) if fundamentals.get('pe_ratio') else 0, 2),
-                        "debt_to_equity": round(fundamentals.get('debt_to_equity', 0) if fundamentals.get('debt_to_equity') else 0, 2),
-                        "strategies": matched_strategies,
-                        "score": 10 + (ret_3m * 0.5) # simple scoring
-                    })
-                    
-            except Exception as e:
-                logger.error(f"Error scanning LT for {symbol}: {e}")
-                continue
-                
-        passed_stocks.sort(key=lambda x: x['score'], reverse=True)
-        return passed_stocks
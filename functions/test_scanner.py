@@ -1,4 +1,4 @@
-from backend.scanner import StockScanner
+from bist_scanner import StockScanner
 import json
 
 def test_scanner():
@@ -9,6 +9,34 @@ import HistorySidebar from './components/HistorySidebar';
 import Footer from './components/Footer';
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+const JOB_POLL_MS = 2000;
+
+// A scan still running after the server's wait comes back as 202 with a job to poll
+const fetchScan = async (url: string) => {
+  const response = await fetch(url);
+  if (!response.ok) {
+    throw new Error('Failed to fetch data');
+  }
+  if (response.status !== 202) {
+    return response.json();
+  }
+  const job = await response.json();
+  const jobUrl = `${API_URL}${response.headers.get('Location') || `/scans/${job.id}`}`;
+  for (;;) {
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_MS));
+    const poll = await fetch(jobUrl);
+    if (!poll.ok) {
+      throw new Error('Failed to poll scan job');
+    }
+    const status = await poll.json();
+    if (status.status === 'done') {
+      return status.results;
+    }
+    if (status.status === 'failed' || status.status === 'cancelled') {
+      throw new Error(status.error || `Scan ${status.status}`);
+    }
+  }
+};
 
 function App() {
   const [mode, setMode] = useState<'swing' | 'longterm'>('swing');
@@ -89,12 +117,7 @@ function App() {
         url = `${API_URL}/scan/long-term`;
       }
 
-      const response = await fetch(url);
-      if (!response.ok) {
-        throw new Error('Failed to fetch data');
-      }
-
-      const data = await response.json();
+      const data = await fetchScan(url);
 
       if (mode === 'swing') {
         setResults(data);
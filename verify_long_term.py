@@ -2,11 +2,11 @@ import sys
 import os
 import json
 
-# Add project root to path
-sys.path.append(os.getcwd())
+# Add backend/ (the bist_scanner package root) to path
+sys.path.append(os.path.join(os.getcwd(), "backend"))
 
 try:
-    from backend.scanner import StockScanner
+    from bist_scanner import StockScanner
     
     print("Initializing Scanner...")
     scanner = StockScanner()